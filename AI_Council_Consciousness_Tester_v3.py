@@ -9,6 +9,13 @@ import time
 import random
 import math
 
+from parameter_registry import DEFAULT_SAFE_RANGE, load_registry
+
+# CCs exercised by this tester, in menu order. Registry rows added since
+# (stereo width, FX sends, portamento, filter EG attack) are left out so the
+# tests drive the same controls as before; Cognitive Resonance moved to CC62.
+TESTED_CCS = (1, 2, 3, 4, 5, 7, 8, 9, 11, 12, 13, 62, 17, 18, 19, 20, 21, 22, 23, 24, 25, 26, 27, 29, 30, 31)
+
 class ConsciousnessTester:
     """Test the mapped AI consciousness parameters"""
     
@@ -16,35 +23,9 @@ class ConsciousnessTester:
         self.port_name = port_name
         self.outport = None
         
-        # Your successfully mapped parameters (from the MIDI mapping)
-        self.mapped_controls = {
-            1: "Emotional Clarity (Filter 1 Cutoff)",
-            2: "Emotional Intensity (Filter 1 Resonance)", 
-            3: "Consciousness Volume (Scene Volume)",
-            4: "Mental Frequency (Scene Pitch)",
-            5: "Thought Complexity (Osc 1 Shape)",
-            7: "Memory Persistence (Filter EG Sustain)",
-            8: "Creative Drift (Osc Drift)",
-            9: "Mental Letting Go (Filter EG Release)",
-            11: "Expression Modulation (LFO 1 Rate)",
-            12: "Communication Rhythm (LFO 1 Amplitude)",
-            13: "Contemplative Depth (LFO 1 Decay)",
-            16: "Cognitive Resonance (Filter 2 Resonance)",
-            17: "Claude Sonic Identity (Osc 1 Pitch)",
-            18: "Kai Sonic Identity (Osc 2 Pitch)",
-            19: "Perplexity Sonic Identity (Osc 3 Pitch)",
-            20: "Thought Harmony (Osc 1 Width 1)",
-            21: "Mental Texture (Osc 2 Width 1)",
-            22: "Subconscious Layer (Osc 3 Sub Mix)",
-            23: "Unison Coherence (Osc 1 Unison Detune)",
-            24: "Frequency Modulation (FM Depth)",
-            25: "Second Emotional Clarity (Filter 2 Cutoff)",
-            26: "Emotional Balance (Filter Balance)",
-            27: "Cognitive Feedback (Feedback)",
-            29: "Vitality Level (Amp EG Attack)",
-            30: "Presence Sustain (Amp EG Sustain)",
-            31: "Energy Release (Amp EG Release)",
-        }
+        # Mapped parameters come from the shared registry (consciousness_parameters.yaml)
+        self.registry = load_registry()
+        self.mapped_controls = self.registry.cc_descriptions(TESTED_CCS)
     
     def connect(self):
         """Connect to MIDI port"""
@@ -153,7 +134,7 @@ class ConsciousnessTester:
                 7: 90,   # Excellent memory
                 8: 8,    # Very stable
                 19: 61,  # Slightly lower pitch
-                16: 20,  # Controlled resonance
+                62: 20,  # Controlled resonance
                 25: 85,  # Clear second filter
                 26: 64,  # Balanced
             },
@@ -234,49 +215,8 @@ class ConsciousnessTester:
     
     def get_smart_range(self, cc_num):
         """Get intelligent value ranges for each consciousness parameter"""
-        ranges = {
-            # Filters - keep musical
-            1: (40, 100),   # Emotional Clarity - avoid mud and harshness
-            2: (0, 70),     # Emotional Intensity - avoid screaming resonance
-            25: (35, 95),   # Second filter - musical range
-            16: (0, 60),    # Cognitive Resonance - controlled
-            
-            # Volume/Levels - keep reasonable
-            3: (85, 115),   # Consciousness Volume - present but not overwhelming
-            
-            # Pitch - musical intervals
-            4: (58, 70),    # Mental Frequency - stay in musical range
-            17: (58, 70),   # Claude Identity - musical pitch range
-            18: (58, 70),   # Kai Identity - musical pitch range  
-            19: (58, 70),   # Perplexity Identity - musical pitch range
-            
-            # Complexity/Shape - creative but controlled
-            5: (30, 90),    # Thought Complexity - avoid extremes
-            20: (30, 80),   # Thought Harmony - musical width
-            21: (30, 80),   # Mental Texture - musical width
-            
-            # Time-based - natural feeling
-            7: (50, 95),    # Memory Persistence - avoid too short
-            9: (20, 80),    # Mental Letting Go - natural release times
-            29: (10, 60),   # Vitality Level - natural attack times
-            30: (40, 90),   # Presence Sustain - musical sustain
-            31: (30, 85),   # Energy Release - natural release
-            
-            # Creative elements - controlled chaos
-            8: (0, 45),     # Creative Drift - organic but not chaotic
-            11: (10, 60),   # Expression Modulation - musical LFO rates
-            12: (20, 80),   # Communication Rhythm - expressive but controlled
-            13: (30, 70),   # Contemplative Depth - moderate decay
-            
-            # Advanced parameters - subtle effects
-            22: (0, 40),    # Subconscious Layer - subtle sub mix
-            23: (10, 50),   # Unison Coherence - tight but organic
-            24: (0, 30),    # Frequency Modulation - subtle FM
-            26: (45, 85),   # Emotional Balance - around center
-            27: (0, 25),    # Cognitive Feedback - controlled feedback
-        }
-        
-        return ranges.get(cc_num, (20, 107))  # Default safe range
+        spec = self.registry.by_cc(cc_num)
+        return spec.safe_range if spec else DEFAULT_SAFE_RANGE
     
     def random_consciousness_state(self):
         """Generate a musically intelligent random consciousness state"""
@@ -293,28 +233,7 @@ class ConsciousnessTester:
         """Reset all parameters to neutral state"""
         print("🔄 Resetting consciousness to neutral state...")
         
-        neutral_values = {
-            1: 64,   # Mid clarity
-            2: 30,   # Low intensity
-            3: 100,  # Good volume
-            4: 64,   # Center pitch
-            5: 64,   # Mid complexity
-            7: 64,   # Mid memory
-            8: 20,   # Low drift
-            9: 40,   # Quick release
-            11: 30,  # Slow LFO
-            12: 40,  # Mid amplitude
-            17: 64,  # Center pitch
-            18: 64,  # Center pitch  
-            19: 64,  # Center pitch
-            20: 50,  # Mid width
-            21: 50,  # Mid width
-            22: 20,  # Low sub mix
-            24: 0,   # No FM
-            25: 64,  # Mid cutoff
-            26: 64,  # Balanced
-            27: 0,   # No feedback
-        }
+        neutral_values = self.registry.neutral_values()
         
         for cc_num, value in neutral_values.items():
             if cc_num in self.mapped_controls:
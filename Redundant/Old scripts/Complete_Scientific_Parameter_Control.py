@@ -20,16 +20,26 @@ Instead of just emotional expression, we now have FULL CONSCIOUSNESS CONTROL.
 
 import asyncio
 import json
+import os
+import pickle
 import yaml
 import datetime
 from pathlib import Path
 from dataclasses import dataclass, asdict
-from typing import Dict, List, Optional, Union, Any
+from types import MappingProxyType
+from typing import Dict, List, Optional, Union, Any, Tuple
 import socket
+import struct
 import threading
-from pythonosc import udp_client, dispatcher, server
+from collections import deque
+from pythonosc import udp_client, dispatcher, osc_server
 from pythonosc.osc_message_builder import OscMessageBuilder
 import time
+import sys
+
+# OSC bundle packing is shared with parameter_dispatcher.py in the repository root
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+from osc_bundles import osc_template, osc_timetag, pack_bundles
 
 # === AI COUNCIL OSC CONFIGURATION ===
 
@@ -47,10 +57,20 @@ class OSCConfig:
     EFFECT_PREFIX = "/effect"
     SCENE_PREFIX = "/scene"
     GLOBAL_PREFIX = "/global"
+    
+    # Bundle transport: largest UDP payload that avoids IP fragmentation on a 1500-byte MTU
+    OSC_MTU = 1472
+    BUNDLE_LATENCY = 0.0  # seconds ahead to schedule bundles; 0 = execute immediately
+    
+    # Closed-loop control: Surge XT feedback arrives on COUNCIL_PORT
+    FEEDBACK_PREFIX = "/parameter"
+    RECONCILE_INTERVAL = 0.5  # seconds between reconciliation passes
+    RECONCILE_GRACE = 0.25  # seconds to wait for feedback before a value counts as diverged
+    MAX_RESENDS = 3  # per intended value, when Surge never confirms it
 
 # === CONSCIOUSNESS PARAMETER DATABASE ===
 
-@dataclass
+@dataclass(frozen=True)
 class ConsciousnessParameter:
     """Represents a single consciousness parameter mapping"""
     semantic_name: str
@@ -60,11 +80,110 @@ class ConsciousnessParameter:
     description: str
     ai_interpretation: str
 
+class ParameterPrefixTrie:
+    """Immutable prefix trie from semantic names to parameter keys, for autocomplete"""
+    
+    def __init__(self, names: Dict[str, str]):
+        # Each node is (children, keys of every name passing through it), keys in sorted order
+        root: Dict[str, Any] = {"children": {}, "keys": []}
+        for name in sorted(names):
+            node = root
+            node["keys"].append(names[name])
+            for char in name:
+                node = node["children"].setdefault(char, {"children": {}, "keys": []})
+                node["keys"].append(names[name])
+        self.root = self._freeze(root)
+    
+    def _freeze(self, node) -> tuple:
+        # Plain dicts (not MappingProxyType) so the trie can be pickled; nothing mutates them
+        children = {c: self._freeze(child) for c, child in node["children"].items()}
+        return children, tuple(dict.fromkeys(node["keys"]))
+    
+    def complete(self, prefix: str, limit: Optional[int] = None) -> Tuple[str, ...]:
+        """Parameter keys whose key or semantic name starts with prefix (case-insensitive)"""
+        node = self.root
+        for char in prefix.lower():
+            node = node[0].get(char)
+            if node is None:
+                return ()
+        return node[1][:limit] if limit else node[1]
+
 class ConsciousnessParameterDatabase:
-    """Complete database of AI consciousness parameters"""
+    """Complete database of AI consciousness parameters
     
-    def __init__(self):
-        self.parameters = self._build_consciousness_database()
+    Secondary indexes (category, osc_path, name prefix) are built once and
+    are read-only. The parameters, indexes and trie are pickled as-is next to
+    this script, so startup loads them without rebuilding anything; the cache
+    is rebuilt only when the script changes.
+    """
+    
+    CACHE_VERSION = 2
+    DEFAULT_CACHE = Path(__file__).with_name(".consciousness_parameters.pickle")
+    
+    def __init__(self, cache_path: Optional[Union[str, Path]] = DEFAULT_CACHE):
+        self.cache_path = Path(cache_path) if cache_path else None
+        cached = self._load_cache()
+        if cached is None:
+            self.parameters = MappingProxyType(self._build_consciousness_database())
+            self._build_indexes()
+            self._save_cache()
+        else:
+            self.parameters, self.by_category, self.by_path, self.trie = cached
+    
+    # --- indexes ---
+    
+    def _build_indexes(self):
+        by_category: Dict[str, list] = {}
+        by_path: Dict[str, list] = {}
+        names: Dict[str, str] = {}
+        for key, param in self.parameters.items():
+            by_category.setdefault(param.consciousness_category, []).append(param)
+            by_path.setdefault(param.osc_path, []).append(key)
+            names[key] = key
+            names.setdefault(param.semantic_name.lower().replace(' ', '_'), key)
+        self.by_category = MappingProxyType({c: tuple(ps) for c, ps in by_category.items()})
+        # Several semantic parameters can share one OSC path (e.g. agent identities)
+        self.by_path = MappingProxyType({p: tuple(keys) for p, keys in by_path.items()})
+        self.trie = ParameterPrefixTrie(names)
+    
+    # --- cache ---
+    
+    def _source_signature(self) -> Tuple[Any, ...]:
+        stat = os.stat(__file__)
+        # Pickled parameters name their module, which differs between running
+        # this file as a script and importing it
+        return self.CACHE_VERSION, __name__, stat.st_mtime_ns, stat.st_size
+    
+    def _load_cache(self):
+        if self.cache_path is None or not self.cache_path.exists():
+            return None
+        try:
+            with open(self.cache_path, 'rb') as f:
+                signature, (parameters, by_category, by_path, trie) = pickle.load(f)
+        except Exception:
+            return None
+        if signature != self._source_signature():
+            return None
+        return MappingProxyType(parameters), MappingProxyType(by_category), MappingProxyType(by_path), trie
+    
+    def _save_cache(self):
+        if self.cache_path is None:
+            return
+        # MappingProxyType does not pickle; the category index shares the parameter objects
+        payload = (dict(self.parameters), dict(self.by_category), dict(self.by_path), self.trie)
+        temp_path = self.cache_path.with_suffix('.tmp')
+        try:
+            with open(temp_path, 'wb') as f:
+                pickle.dump((self._source_signature(), payload), f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temp_path, self.cache_path)
+        except (OSError, pickle.PicklingError) as e:
+            print(f"⚠️ Could not write parameter cache: {e}")
+    
+    def export_json(self, filename: Union[str, Path]) -> Path:
+        """Write the parameter table as JSON (for tools outside Python)"""
+        with open(filename, 'w') as f:
+            json.dump({key: asdict(param) for key, param in self.parameters.items()}, f, indent=2)
+        return Path(filename)
     
     def _build_consciousness_database(self) -> Dict[str, ConsciousnessParameter]:
         """Build the complete consciousness parameter database"""
@@ -311,11 +430,62 @@ class ConsciousnessParameterDatabase:
     
     def get_parameters_by_category(self, category: str) -> List[ConsciousnessParameter]:
         """Get all parameters in a category"""
-        return [p for p in self.parameters.values() if p.consciousness_category == category]
+        return list(self.by_category.get(category, ()))
     
     def list_categories(self) -> List[str]:
         """List all consciousness categories"""
-        return list(set(p.consciousness_category for p in self.parameters.values()))
+        return list(self.by_category)
+    
+    def get_parameter_names_by_path(self, osc_path: str) -> Tuple[str, ...]:
+        """Semantic keys mapped to an OSC path (reverse lookup for feedback)"""
+        return self.by_path.get(osc_path, ())
+    
+    def get_parameter_by_path(self, osc_path: str) -> Optional[ConsciousnessParameter]:
+        keys = self.by_path.get(osc_path)
+        return self.parameters[keys[0]] if keys else None
+    
+    def complete(self, prefix: str, limit: Optional[int] = None) -> Tuple[str, ...]:
+        """Autocomplete semantic parameter keys"""
+        return self.trie.complete(prefix, limit)
+
+# === OSC BUNDLE TRANSPORT ===
+
+class OSCBundleSender:
+    """Packs parameter changes into timestamped OSC bundles no larger than the MTU
+    
+    Address and type-tag bytes are encoded once per (osc_path, type) and
+    reused, and every datagram goes out through one connected UDP socket.
+    """
+    
+    def __init__(self, host: str, port: int, mtu: int = OSCConfig.OSC_MTU):
+        self.mtu = mtu
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.sock.connect((host, port))
+        self.templates: Dict[tuple, bytes] = {}
+        self.datagrams_sent = 0
+        self.messages_sent = 0
+    
+    def encode(self, osc_path: str, value: Union[int, float]) -> bytes:
+        """One OSC message from the pre-encoded template for this path"""
+        tag = 'i' if isinstance(value, int) and not isinstance(value, bool) else 'f'
+        template = self.templates.get((osc_path, tag))
+        if template is None:
+            template = self.templates[(osc_path, tag)] = osc_template(osc_path, tag)
+        return template + struct.pack('>' + tag, value)
+    
+    def send_batch(self, changes: List[tuple], at: Optional[float] = None) -> int:
+        """Send (osc_path, value) pairs as bundles stamped for Unix time `at`; returns datagrams sent"""
+        messages = (self.encode(osc_path, value) for osc_path, value in changes)
+        datagrams = 0
+        for datagram in pack_bundles(messages, self.mtu, osc_timetag(at)):
+            self.sock.send(datagram)
+            datagrams += 1
+        self.datagrams_sent += datagrams
+        self.messages_sent += len(changes)
+        return datagrams
+    
+    def close(self):
+        self.sock.close()
 
 # === OSC COMMUNICATION ENGINE ===
 
@@ -325,45 +495,92 @@ class OSCConsciousnessEngine:
     def __init__(self, config: OSCConfig):
         self.config = config
         self.client = udp_client.SimpleUDPClient(config.SURGE_IP, config.SURGE_PORT)
+        self.bundle_sender = OSCBundleSender(config.SURGE_IP, config.SURGE_PORT, config.OSC_MTU)
         self.parameter_db = ConsciousnessParameterDatabase()
         self.current_state = {}
         self.message_queue = asyncio.Queue()
         
+        # Closed-loop state, keyed by osc_path. mirror is written by the event
+        # loop only. intended is written by the sending thread (new values) and
+        # by the event loop (confirmations, resends), so every read-modify-write
+        # of it holds _intended_lock; the loop only replaces an entry whose
+        # (value, sent_at) is unchanged since it looked.
+        self.intended: Dict[str, tuple] = {}  # osc_path -> (value, sent_at, resends)
+        self.mirror: Dict[str, tuple] = {}  # osc_path -> (value, received_at)
+        self._intended_lock = threading.Lock()
+        self.rtt_samples = deque(maxlen=1024)
+        self.feedback_received = 0
+        self.resends = 0
+        self._tolerances = {p.osc_path: max(1e-6, (p.value_range[1] - p.value_range[0]) * 1e-3)
+                            for p in self.parameter_db.parameters.values()}
+        self._loop = None
+        self._stop_event = None
+        self._loop_thread = None
+        
         # Setup OSC server for bidirectional communication
         self.dispatcher = dispatcher.Dispatcher()
         self.setup_osc_handlers()
         
     def setup_osc_handlers(self):
         """Setup OSC message handlers for receiving data from Surge XT"""
-        self.dispatcher.map("/parameter/*", self.handle_parameter_change)
+        # Feedback addresses are FEEDBACK_PREFIX + osc_path, which a single-segment
+        # '*' pattern cannot match, so they arrive through the default handler
         self.dispatcher.map("/status/*", self.handle_status_update)
-        
-    def handle_parameter_change(self, unused_addr, *args):
-        """Handle parameter change messages from Surge XT"""
-        # Parse and store parameter changes for consciousness monitoring
-        print(f"🎛️ Parameter change: {unused_addr} = {args}")
+        self.dispatcher.set_default_handler(self.handle_parameter_change)
+        
+    def handle_parameter_change(self, address, *args):
+        """Mirror a parameter value reported by Surge XT (runs on the event loop)"""
+        prefix = self.config.FEEDBACK_PREFIX
+        if not address.startswith(prefix + "/") or not args:
+            return
+        osc_path = address[len(prefix):]
+        if not self.parameter_db.get_parameter_names_by_path(osc_path):
+            return  # not a consciousness parameter
+        try:
+            value = float(args[0])
+        except (TypeError, ValueError):
+            return
+        now = time.monotonic()
+        self.mirror[osc_path] = (value, now)
+        self.feedback_received += 1
+        
+        with self._intended_lock:
+            intended = self.intended.get(osc_path)
+            if intended and intended[1] is not None and self._matches(osc_path, intended[0], value):
+                self.rtt_samples.append(now - intended[1])
+                self.intended[osc_path] = (intended[0], None, 0)  # confirmed
         
     def handle_status_update(self, unused_addr, *args):
         """Handle status update messages from Surge XT"""
         print(f"📊 Status update: {unused_addr} = {args}")
     
-    def set_consciousness_parameter(self, semantic_name: str, value: float, 
-                                  agent_name: str = "Claude") -> bool:
-        """Set a consciousness parameter by semantic name"""
+    def _resolve_parameter(self, semantic_name: str, value: float):
+        """Look up a parameter and clamp the value to its range; None if unknown"""
         param = self.parameter_db.get_parameter(semantic_name)
         if not param:
             print(f"❌ Unknown consciousness parameter: {semantic_name}")
-            return False
+            return None
         
         # Validate value range
         min_val, max_val = param.value_range
         if not (min_val <= value <= max_val):
             print(f"⚠️ Value {value} out of range [{min_val}, {max_val}] for {semantic_name}")
             value = max(min_val, min(max_val, value))  # Clamp to range
+        return param, value
+    
+    def set_consciousness_parameter(self, semantic_name: str, value: float, 
+                                  agent_name: str = "Claude") -> bool:
+        """Set a consciousness parameter by semantic name"""
+        resolved = self._resolve_parameter(semantic_name, value)
+        if not resolved:
+            return False
+        param, value = resolved
         
         # Send OSC message to Surge XT
         try:
-            self.client.send_message(param.osc_path, value)
+            with self._intended_lock:
+                self.client.send_message(param.osc_path, value)
+                self.intended[param.osc_path] = (value, time.monotonic(), 0)
             self.current_state[semantic_name] = {
                 'value': value,
                 'timestamp': datetime.datetime.now().isoformat(),
@@ -376,25 +593,163 @@ class OSCConsciousnessEngine:
             print(f"❌ OSC communication error: {e}")
             return False
     
-    def set_consciousness_profile(self, profile: Dict[str, float], agent_name: str = "Claude"):
+    def send_parameter_batch(self, changes: Dict[str, float], agent_name: str = "Claude",
+                             latency: Optional[float] = None) -> int:
+        """Send many parameter changes as MTU-sized OSC bundles; returns how many were sent
+        
+        All changes share one time tag (now + latency, or immediately if latency
+        is 0) so Surge applies them together.
+        """
+        resolved = []
+        for semantic_name, value in changes.items():
+            result = self._resolve_parameter(semantic_name, value)
+            if result:
+                resolved.append((semantic_name, *result))
+        if not resolved:
+            return 0
+        
+        latency = self.config.BUNDLE_LATENCY if latency is None else latency
+        now = time.time()
+        # Send and record under the lock so a resend of an older value cannot
+        # slip in between
+        with self._intended_lock:
+            try:
+                datagrams = self.bundle_sender.send_batch(
+                    [(param.osc_path, value) for _, param, value in resolved],
+                    at=now + latency if latency else None)
+            except OSError as e:
+                print(f"❌ OSC communication error: {e}")
+                return 0
+            sent_at = time.monotonic()
+            for _, param, value in resolved:
+                self.intended[param.osc_path] = (value, sent_at, 0)
+        
+        timestamp = datetime.datetime.fromtimestamp(now).isoformat()
+        for semantic_name, param, value in resolved:
+            self.current_state[semantic_name] = {
+                'value': value,
+                'timestamp': timestamp,
+                'agent': agent_name,
+                'parameter': param
+            }
+        print(f"📦 {agent_name}: {len(resolved)} parameters in {datagrams} OSC bundle(s)")
+        return len(resolved)
+    
+    def set_consciousness_profile(self, profile: Dict[str, float], agent_name: str = "Claude",
+                                  bundled: bool = True):
         """Set multiple consciousness parameters at once"""
         print(f"🎭 Setting consciousness profile for {agent_name}...")
         
-        success_count = 0
-        for param_name, value in profile.items():
-            if self.set_consciousness_parameter(param_name, value, agent_name):
-                success_count += 1
+        if bundled:
+            success_count = self.send_parameter_batch(profile, agent_name)
+        else:
+            success_count = 0
+            for param_name, value in profile.items():
+                if self.set_consciousness_parameter(param_name, value, agent_name):
+                    success_count += 1
         
         print(f"✅ Successfully set {success_count}/{len(profile)} consciousness parameters")
         return success_count == len(profile)
     
+    # --- closed-loop control ---
+    
+    def _matches(self, osc_path: str, intended: float, reported: float) -> bool:
+        return abs(intended - reported) <= self._tolerances.get(osc_path, 1e-3)
+    
+    def diverged_parameters(self, now: Optional[float] = None) -> List[tuple]:
+        """(osc_path, intended value, sent_at, resends) for values Surge has not confirmed within the grace period"""
+        now = time.monotonic() if now is None else now
+        with self._intended_lock:
+            snapshot = list(self.intended.items())
+        diverged = []
+        for osc_path, (value, sent_at, resends) in snapshot:
+            reported = self.mirror.get(osc_path)
+            if reported and self._matches(osc_path, value, reported[0]):
+                continue
+            if sent_at is not None and now - sent_at < self.config.RECONCILE_GRACE:
+                continue  # still in flight
+            diverged.append((osc_path, value, sent_at, resends))
+        return diverged
+    
+    def reconcile(self) -> int:
+        """Resend only the diverged parameters, as bundles; returns how many were resent
+        
+        Each intended value is retried at most MAX_RESENDS times, so a parameter
+        Surge never echoes (or always reports differently) cannot cause a resend storm.
+        """
+        candidates = [entry for entry in self.diverged_parameters() if entry[3] < self.config.MAX_RESENDS]
+        if not candidates:
+            return 0
+        with self._intended_lock:
+            # Skip anything the sending thread replaced since the snapshot
+            diverged = [(osc_path, value, resends) for osc_path, value, sent_at, resends in candidates
+                        if self.intended.get(osc_path, (None, None))[:2] == (value, sent_at)]
+            if not diverged:
+                return 0
+            self.bundle_sender.send_batch([(osc_path, value) for osc_path, value, _ in diverged])
+            sent_at = time.monotonic()
+            for osc_path, value, resends in diverged:
+                self.intended[osc_path] = (value, sent_at, resends + 1)
+        self.resends += len(diverged)
+        return len(diverged)
+    
+    async def run_closed_loop(self, host: Optional[str] = None, port: Optional[int] = None):
+        """Serve Surge XT feedback and reconcile periodically until stop_closed_loop()"""
+        self._loop = asyncio.get_running_loop()
+        self._stop_event = asyncio.Event()
+        feedback_server = osc_server.AsyncIOOSCUDPServer(
+            (host or self.config.SURGE_IP, port or self.config.COUNCIL_PORT), self.dispatcher, self._loop)
+        transport, _ = await feedback_server.create_serve_endpoint()
+        try:
+            while not self._stop_event.is_set():
+                try:
+                    await asyncio.wait_for(self._stop_event.wait(), self.config.RECONCILE_INTERVAL)
+                except asyncio.TimeoutError:
+                    self.reconcile()
+        finally:
+            transport.close()
+    
+    def start_closed_loop(self, host: Optional[str] = None, port: Optional[int] = None) -> threading.Thread:
+        """Run the feedback server and reconciler on a background event loop"""
+        self._loop_thread = threading.Thread(target=asyncio.run, args=(self.run_closed_loop(host, port),),
+                                             name="osc-closed-loop", daemon=True)
+        self._loop_thread.start()
+        return self._loop_thread
+    
+    def stop_closed_loop(self):
+        if self._loop is not None and self._stop_event is not None:
+            self._loop.call_soon_threadsafe(self._stop_event.set)
+        if self._loop_thread is not None:
+            self._loop_thread.join(timeout=2)
+            self._loop_thread = None
+    
+    def get_link_metrics(self) -> Dict[str, Any]:
+        """Feedback, resend and round-trip latency statistics"""
+        samples = sorted(self.rtt_samples)
+        def pct(p):
+            return round(samples[min(len(samples) - 1, int(p * len(samples)))] * 1000, 3) if samples else None
+        return {
+            'feedback_received': self.feedback_received,
+            'mirrored_parameters': len(self.mirror),
+            'diverged_parameters': len(self.diverged_parameters()),
+            'resends': self.resends,
+            'rtt_ms': {
+                'count': len(samples),
+                'mean': round(sum(samples) / len(samples) * 1000, 3) if samples else None,
+                'p50': pct(0.50),
+                'p99': pct(0.99),
+                'last': round(self.rtt_samples[-1] * 1000, 3) if samples else None,
+            },
+        }
+    
     def get_consciousness_state(self) -> Dict[str, Any]:
         """Get current consciousness state"""
         return {
             'timestamp': datetime.datetime.now().isoformat(),
             'parameters': self.current_state,
             'parameter_count': len(self.current_state),
-            'categories': self.parameter_db.list_categories()
+            'categories': self.parameter_db.list_categories(),
+            'link': self.get_link_metrics()
         }
 
 # === AI CONSCIOUSNESS PROFILES ===
@@ -525,6 +880,7 @@ class AICouncilOSCInterface:
         print("\n🎛️ INTERACTIVE CONSCIOUSNESS CONTROL")
         print("Enter parameter changes in format: parameter_name=value")
         print("Type 'help' for available parameters, 'profiles' for demos, 'status' for current state, 'quit' to exit")
+        print("End a partial name with '?' to list matching parameters (e.g. emotional?)")
         print()
         
         while True:
@@ -539,6 +895,9 @@ class AICouncilOSCInterface:
                     self.demonstrate_consciousness_profiles()
                 elif user_input.lower() == 'status':
                     self._show_consciousness_status()
+                elif user_input.endswith('?'):
+                    matches = self.engine.parameter_db.complete(user_input[:-1].strip())
+                    print("   " + ", ".join(matches) if matches else "❌ No matching parameters")
                 elif '=' in user_input:
                     param_name, value_str = user_input.split('=', 1)
                     param_name = param_name.strip()
@@ -580,6 +939,12 @@ class AICouncilOSCInterface:
         print(f"⏰ Timestamp: {state['timestamp']}")
         print(f"🎛️ Active Parameters: {state['parameter_count']}")
         print(f"🧬 Categories: {len(state['categories'])}")
+        link = state['link']
+        rtt = link['rtt_ms']
+        print(f"🔁 Feedback: {link['feedback_received']} messages, {link['diverged_parameters']} diverged, "
+              f"{link['resends']} resends")
+        if rtt['count']:
+            print(f"⏱️ Round trip: mean {rtt['mean']} ms, p50 {rtt['p50']} ms, p99 {rtt['p99']} ms")
         
         if state['parameters']:
             print("\n🧠 Recent Changes:")
@@ -635,8 +1000,9 @@ def main():
         # Create AI Council OSC interface
         council = AICouncilOSCInterface()
         
-        # Start consciousness session
+        # Start consciousness session, with Surge XT feedback mirrored in the background
         council.start_consciousness_session()
+        council.engine.start_closed_loop()
         
         # Demonstrate consciousness profiles
         council.demonstrate_consciousness_profiles()
@@ -645,6 +1011,7 @@ def main():
         council.interactive_consciousness_control()
         
         # Export final state
+        council.engine.stop_closed_loop()
         council.export_consciousness_state()
         
     except Exception as e:
@@ -3,11 +3,17 @@ import yaml
 import random
 import sys
 import os
-from typing import Tuple, Dict, List
+from typing import Tuple, Dict, Iterable, List, Optional, Set
+
+from harmonic_log_aggregator import send_log_record
+from session_rng import derive_seed, stream_label
 
 AGENT_ORDER = ["Kai", "Claude", "Perplexity", "Grok"]
 LOG_FILE = "harmonic_analysis_log.yaml"
 G5 = 79  # MIDI note number for G5
+PITCH_MIN = 24
+PITCH_MAX = 96
+RESERVED_PITCHES = frozenset({G5})  # never used for response oscillators
 
 # Memory of recent pitches to avoid repetition
 last_used_pitches: List[int] = []
@@ -40,8 +46,24 @@ def interpret_harmonic_message(data: Dict) -> Tuple[str, str, Dict]:
         "oscillators": oscillators
     }
 
-def generate_multi_oscillator_response(identity: str, style: str, features: Dict) -> Dict:
+def nearest_allowed_pitch(target: int, excluded: Set[int],
+                          low: int = PITCH_MIN, high: int = PITCH_MAX) -> int:
+    """
+    Closest pitch to target within [low, high] that is not excluded.
+    Ties go to the lower pitch; at most (high - low) steps in the worst case.
+    """
+    target = max(low, min(target, high))
+    for distance in range(high - low + 1):
+        for pitch in (target - distance, target + distance):
+            if low <= pitch <= high and pitch not in excluded:
+                return pitch
+    raise ValueError(f"No allowed pitch in {low}-{high}")
+
+def generate_multi_oscillator_response(identity: str, style: str, features: Dict,
+                                       rng: Optional[random.Random] = None,
+                                       reserved: Iterable[int] = RESERVED_PITCHES) -> Dict:
     global last_used_pitches
+    rng = rng or random  # module-level generator unless a seeded stream is given
 
     source_oscillators = features["oscillators"]
     base_pitches = [osc.get("pitch", 60) for osc in source_oscillators]
@@ -58,21 +80,17 @@ def generate_multi_oscillator_response(identity: str, style: str, features: Dict
     oscillator_count = len(intervals)
 
     oscillators: List[Dict] = []
-    used = set()
+    # Avoid repeating the last response, reserved notes, and pitches already chosen
+    excluded = set(last_used_pitches) | set(reserved)
 
     for i, interval in enumerate(intervals):
         pitch = base_pitch + interval
-        pitch += random.choice([-2, 0, 2])  # add variation
-        pitch = max(24, min(pitch, 96))
-
-        while pitch in last_used_pitches or pitch == G5 or pitch in used:
-            pitch += random.choice([-3, -2, 1, 2])
-            pitch = max(24, min(pitch, 96))
-
-        used.add(pitch)
+        pitch += rng.choice([-2, 0, 2])  # add variation
+        pitch = nearest_allowed_pitch(pitch, excluded)
+        excluded.add(pitch)
 
-        phase = wrap_phase(random.uniform(0, 360))
-        amplitude = random.choice([70, 85, 100])
+        phase = wrap_phase(rng.uniform(0, 360))
+        amplitude = rng.choice([70, 85, 100])
         role = f"{style}_osc_{i+1}"
 
         oscillators.append({
@@ -88,10 +106,10 @@ def generate_multi_oscillator_response(identity: str, style: str, features: Dict
         "identity": get_next_identity(identity),
         "consciousness_message": {
             "envelope": {
-                "attack": features["attack"] + random.randint(-10, 10),
-                "decay": features["decay"] + random.randint(-10, 10),
+                "attack": features["attack"] + rng.randint(-10, 10),
+                "decay": features["decay"] + rng.randint(-10, 10),
                 "sustain": features["sustain"],
-                "release": features["release"] + random.randint(-10, 10)
+                "release": features["release"] + rng.randint(-10, 10)
             },
             "oscillators": oscillators,
             "interpretation": {
@@ -102,25 +120,26 @@ def generate_multi_oscillator_response(identity: str, style: str, features: Dict
         }
     }
 
-def log_harmonic_analysis(sender: str, style: str, response: Dict) -> None:
+def log_harmonic_analysis(sender: str, style: str, response: Dict, stream: str = "") -> None:
+    header = f"{sender} triggered style '{style}'" + (f" [{stream}]" if stream else "")
     try:
-        with open(LOG_FILE, "a") as f:
-            f.write(f"---\n# {sender} triggered style '{style}'\n")
-            yaml.dump(response, f, default_flow_style=False)
+        send_log_record(LOG_FILE, header, response)
     except Exception as e:
         print(f"⚠️ Failed to log analysis: {e}", file=sys.stderr)
 
 def main():
     if len(sys.argv) < 2:
-        print("Usage: python ai_responder_harmonic_v3_1.py <input_yaml> [optional_seed]")
+        print("Usage: python ai_responder_harmonic_v3_1.py <input_yaml> [session_seed] [turn]")
         sys.exit(1)
 
-    if len(sys.argv) == 3:
+    seed = None
+    turn = 0
+    if len(sys.argv) >= 3:
         try:
             seed = int(sys.argv[2])
-            random.seed(seed)
+            turn = int(sys.argv[3]) if len(sys.argv) >= 4 else 0
         except ValueError:
-            pass
+            seed = None
 
     input_file = sys.argv[1]
     if not os.path.exists(input_file):
@@ -132,8 +151,14 @@ def main():
             data = yaml.safe_load(f)
 
         identity, style, features = interpret_harmonic_message(data)
-        response = generate_multi_oscillator_response(identity, style, features)
-        log_harmonic_analysis(identity, style, response)
+        # The replying identity owns the stream, so each agent's draws are independent
+        rng, stream = None, ""
+        if seed is not None:
+            speaker = get_next_identity(identity)
+            rng = random.Random(derive_seed(seed, speaker, turn))
+            stream = stream_label(seed, speaker, turn)
+        response = generate_multi_oscillator_response(identity, style, features, rng)
+        log_harmonic_analysis(identity, style, response, stream)
 
         print(yaml.dump(response, default_flow_style=False))
 
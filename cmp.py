@@ -0,0 +1,795 @@
+#!/usr/bin/env python3
+"""
+Consciousness Modem Protocol (CMP)
+Reliable delivery of consciousness messages as MIDI note sequences
+
+Frames follow the modem proposal, on the sender's channel:
+  start note   the sender's carrier (a fifth above for ACK, a tritone above
+               for NAK); its velocity carries the redundancy, how many times
+               each symbol is repeated, quantized like the data velocities
+  data notes   one byte per note: high nibble in the pitch, low nibble in the
+               velocity; bytes alternate between two 16-note pitch banks above
+               the carrier so repeats can be told apart from the next byte.
+               The first five bytes are the header (flags, destination
+               channel, sequence number, payload length)
+  checksum     the carrier's major triad an octave down, with the CRC-16 of
+               header and payload in the three velocities
+
+Frames are addressed: an endpoint only delivers and answers DATA frames for
+its own channel, and a sender only accepts replies from the addressed peer.
+DATA frames are stop-and-wait: the receiver answers each one with an ACK, or
+a NAK when the checksum fails, and the sender retransmits on NAK or timeout
+with one more repeat per symbol. An optional RateController picks the
+tempo, subdivision and redundancy per agent pair from decode success and the
+jitter the receiver reports in its ACK/NAK. Notes are scheduled through the ADSR
+pipeline's play_events() and read back from any mido input port, such as an
+IAC loopback bus or the in-process LoopbackBus below.
+"""
+
+import binascii
+import heapq
+import json
+import queue
+import random
+import statistics
+import threading
+import time
+import zlib
+from collections import Counter, deque
+from dataclasses import dataclass, field, replace
+from typing import Any, Callable, Deque, Dict, List, Optional, Sequence, Tuple
+
+import mido
+
+from enhanced_symbolic_to_midi_pipeline_adsr_v3_1 import play_events
+
+# === PROTOCOL CONSTANTS ===
+
+# Carrier notes from the proposal; channels match the ADSR pipeline
+CARRIERS = {"claude": 60, "kai": 64, "perplexity": 67, "grok": 69}
+CHANNELS = {"kai": 0, "claude": 1, "perplexity": 2, "grok": 3}
+IDENTITIES = {channel: identity for identity, channel in CHANNELS.items()}
+
+FRAME_DATA = "data"
+FRAME_ACK = "ack"
+FRAME_NAK = "nak"
+START_INTERVALS = {FRAME_DATA: 0, FRAME_ACK: 7, FRAME_NAK: 6}  # unison, fifth, tritone
+CHECKSUM_CHORD = (0, 4, 7)  # major triad = "message complete & valid"
+
+CHORD_OFFSET = -12      # the checksum triad sounds an octave below the carrier
+DATA_OFFSET = 12        # data pitches span carrier+12 .. carrier+43 (two banks of 16)
+VELOCITY_BASE = 40      # low nibble n is sent as velocity 40 + 5n
+VELOCITY_STEP = 5
+HEADER_BYTES = 5
+FLAG_ZLIB = 0x01
+MAX_PAYLOAD = 0xFFFF
+MAX_REDUNDANCY = 5
+
+MAX_RETRIES = 4
+ACK_GRACE = 0.25        # seconds allowed beyond the ACK's airtime
+POLL_INTERVAL = 0.001
+
+# === TIMING ===
+
+@dataclass(frozen=True)
+class ModemTiming:
+    """Symbol clock: one symbol per subdivision of a beat"""
+    tempo: float = 85.0     # the proposal's base "baud rate"
+    subdivision: int = 8    # symbols per beat
+    gate: float = 0.5       # fraction of the symbol the note sounds
+    redundancy: int = 1     # times each symbol is sent
+
+    @property
+    def symbol_seconds(self) -> float:
+        return 60.0 / self.tempo / self.subdivision
+
+    def frame_seconds(self, payload_bytes: int, redundancy: Optional[int] = None) -> float:
+        """Airtime of a frame with this payload"""
+        r = redundancy or self.redundancy
+        return (1 + r * (HEADER_BYTES + payload_bytes + 1)) * self.symbol_seconds
+
+# === FRAMING ===
+
+@dataclass
+class DecodedFrame:
+    kind: str
+    seq: Optional[int] = None
+    destination: Optional[int] = None  # receiving channel
+    flags: int = 0
+    payload: bytes = b""
+    redundancy: int = 1
+    ok: bool = True
+    error: str = ""
+    onsets: List[float] = field(default_factory=list)  # arrival time of each symbol
+
+def checksum(header: bytes, payload: bytes) -> int:
+    return binascii.crc_hqx(header + payload, 0xFFFF)
+
+def encode_payload(message: Dict[str, Any]) -> Tuple[bytes, int]:
+    """Compact JSON, zlib-compressed when that is shorter"""
+    raw = json.dumps(message, sort_keys=True, separators=(",", ":"), default=str).encode()
+    packed = zlib.compress(raw, 9)
+    if len(packed) < len(raw):
+        return packed, FLAG_ZLIB
+    return raw, 0
+
+def decode_payload(payload: bytes, flags: int) -> Dict[str, Any]:
+    return json.loads(zlib.decompress(payload) if flags & FLAG_ZLIB else payload)
+
+def frame_symbols(kind: str, seq: int, payload: bytes, carrier: int, destination: int,
+                  redundancy: int = 1, flags: int = 0) -> List[List[Tuple[int, int]]]:
+    """The frame as a list of symbols, each a list of simultaneous (pitch, velocity) notes"""
+    if len(payload) > MAX_PAYLOAD:
+        raise ValueError(f"Payload too large: {len(payload)} bytes")
+    redundancy = max(1, min(MAX_REDUNDANCY, redundancy))
+    header = bytes((flags, destination, seq & 0xFF, len(payload) >> 8, len(payload) & 0xFF))
+    crc = checksum(header, payload)
+    symbols = [[(carrier + START_INTERVALS[kind], VELOCITY_BASE + VELOCITY_STEP * redundancy)]]
+    for index, byte in enumerate(header + payload):
+        pitch = carrier + DATA_OFFSET + 16 * (index & 1) + (byte >> 4)
+        symbols.extend([[(pitch, VELOCITY_BASE + VELOCITY_STEP * (byte & 0x0F))]] * redundancy)
+    velocities = (1 + (crc >> 10), 1 + ((crc >> 5) & 0x1F), 1 + (crc & 0x1F))
+    chord = [(carrier + CHORD_OFFSET + interval, velocity) for interval, velocity in zip(CHECKSUM_CHORD, velocities)]
+    symbols.extend([chord] * redundancy)
+    return symbols
+
+def frame_events(symbols: List[List[Tuple[int, int]]], channel: int,
+                 timing: ModemTiming) -> List[Tuple[float, mido.Message]]:
+    """Timed note events for play_events()"""
+    period = timing.symbol_seconds
+    hold = period * timing.gate
+    events = []
+    for index, notes in enumerate(symbols):
+        t = index * period
+        events.extend((t, mido.Message("note_on", note=pitch, velocity=velocity, channel=channel))
+                      for pitch, velocity in notes)
+        events.extend((t + hold, mido.Message("note_off", note=pitch, velocity=0, channel=channel))
+                      for pitch, _ in notes)
+    events.sort(key=lambda event: event[0])
+    return events
+
+def onset_timing(onsets: Sequence[float]) -> Tuple[Optional[float], Optional[float]]:
+    """(symbol period, jitter) from a frame's note arrival times
+
+    Jitter is the mean deviation of the inter-onset intervals from their
+    median, as a fraction of that period; gaps left by lost notes are ignored.
+    """
+    intervals = [b - a for a, b in zip(onsets, onsets[1:])]
+    if len(intervals) < 4:
+        return None, None
+    period = statistics.median(intervals)
+    if period <= 0:
+        return None, None
+    steady = [interval for interval in intervals if interval < 1.5 * period]
+    return period, statistics.fmean(abs(interval - period) for interval in steady) / period
+
+def _vote(values: List[Any]) -> Any:
+    return Counter(values).most_common(1)[0][0]
+
+class FrameDecoder:
+    """Streaming frame decoder for one sender (feed it that channel's note_on messages)
+
+    Repeats of a byte are grouped by their pitch bank, so a lost repeat only
+    weakens the vote; a lost byte shows up as two groups in the same bank.
+    """
+
+    def __init__(self, carrier: int):
+        self.carrier = carrier
+        self.starts = {carrier + interval: kind for kind, interval in START_INTERVALS.items()}
+        self.frame: Optional[DecodedFrame] = None
+
+    def _fail(self, error: str) -> DecodedFrame:
+        frame, self.frame = self.frame, None
+        frame.ok = False
+        frame.error = error
+        return frame
+
+    def _start(self, message: mido.Message, at: float) -> None:
+        redundancy = round((message.velocity - VELOCITY_BASE) / VELOCITY_STEP)
+        self.frame = DecodedFrame(self.starts[message.note],
+                                  redundancy=max(1, min(MAX_REDUNDANCY, redundancy)), onsets=[at])
+        self._bytes = bytearray()
+        self._group: List[int] = []
+        self._bank = 0
+        self._chord: List[Tuple[int, int]] = []
+        self._length: Optional[int] = None
+
+    def _close_group(self) -> None:
+        if not self._group:
+            return
+        self._bytes.append(_vote(self._group))
+        self._group = []
+        if len(self._bytes) == HEADER_BYTES:
+            self.frame.flags, self.frame.destination, self.frame.seq = self._bytes[:3]
+            self._length = (self._bytes[3] << 8) | self._bytes[4]
+
+    def _complete(self) -> bool:
+        return self._length is not None and len(self._bytes) == HEADER_BYTES + self._length
+
+    def _chord_matches(self) -> Optional[bool]:
+        """Whether the chord notes so far carry the checksum (None until every chord note was heard)"""
+        votes = [[v for i, v in self._chord if i == interval] for interval in CHECKSUM_CHORD]
+        if not all(votes):
+            return None
+        high, mid, low = (_vote(v) - 1 for v in votes)
+        return (high << 10) | (mid << 5) | low == checksum(bytes(self._bytes[:HEADER_BYTES]),
+                                                             bytes(self._bytes[HEADER_BYTES:]))
+
+    def _finish(self) -> DecodedFrame:
+        """Verify the checksum chord against the bytes received"""
+        matches = self._chord_matches()
+        if matches is None:
+            return self._fail("incomplete checksum chord")
+        if not matches:
+            return self._fail("checksum mismatch")
+        frame, self.frame = self.frame, None
+        frame.payload = bytes(self._bytes[HEADER_BYTES:])
+        return frame
+
+    def feed(self, message: mido.Message, at: Optional[float] = None) -> Optional[DecodedFrame]:
+        """Returns a frame once it completes or fails, otherwise None"""
+        at = time.perf_counter() if at is None else at
+        if message.note in self.starts:
+            # A new frame; a pending one ends here (its checksum chord may have lost notes)
+            finished = None
+            if self.frame is not None:
+                finished = self._finish() if self._chord else self._fail("frame interrupted")
+            self._start(message, at)
+            return finished
+        if self.frame is None:
+            return None
+
+        interval = message.note - self.carrier - CHORD_OFFSET
+        if interval in CHECKSUM_CHORD:
+            self._close_group()
+            if not self._complete():
+                return self._fail("frame length mismatch")
+            if len(self._chord) % 3 == 0:
+                self.frame.onsets.append(at)
+            self._chord.append((interval, message.velocity))
+            # Finish as soon as the chord checks out, so a miscounted
+            # redundancy never leaves the frame waiting for notes
+            if len(self._chord) % 3 == 0 and self._chord_matches() \
+                    or len(self._chord) >= 3 * self.frame.redundancy:
+                return self._finish()
+            return None
+
+        raw = message.note - self.carrier - DATA_OFFSET
+        low = round((message.velocity - VELOCITY_BASE) / VELOCITY_STEP)
+        if self._chord or not (0 <= raw < 32 and 0 <= low <= 15):
+            return self._fail(f"unexpected note {message.note}")
+        bank, value = raw >> 4, ((raw & 0x0F) << 4) | low
+        if self._group and bank == self._bank:
+            if len(self._group) < self.frame.redundancy:
+                self._group.append(value)
+                self.frame.onsets.append(at)
+            return None
+        self._close_group()
+        if self._complete():
+            return self._fail("frame longer than its header")
+        if bank != len(self._bytes) & 1:
+            return self._fail("lost symbol")
+        self._bank = bank
+        self._group = [value]
+        self.frame.onsets.append(at)
+        return None
+
+# === LOOPBACK ===
+
+class LoopbackPort:
+    """mido-style input port fed by a LoopbackBus"""
+
+    def __init__(self):
+        self._queue: "queue.Queue[mido.Message]" = queue.Queue()
+        self.closed = False
+
+    def poll(self) -> Optional[mido.Message]:
+        try:
+            return self._queue.get_nowait()
+        except queue.Empty:
+            return None
+
+    def receive(self, block: bool = True) -> Optional[mido.Message]:
+        return self._queue.get() if block else self.poll()
+
+    def close(self):
+        self.closed = True
+
+class LoopbackBus:
+    """In-process MIDI bus: everything sent is delivered, in order, to every input
+
+    Optional impairments (message loss, note corruption and delivery jitter in
+    seconds) make it usable as a test channel for the protocol.
+    """
+
+    def __init__(self, loss: float = 0.0, corruption: float = 0.0, jitter: float = 0.0,
+                 rng: Optional[random.Random] = None):
+        self.loss = loss
+        self.corruption = corruption
+        self.jitter = jitter
+        self.rng = rng or random.Random()
+        self.inputs: List[LoopbackPort] = []
+        self._lock = threading.Lock()
+        self._pending: List[Tuple[float, int, mido.Message]] = []
+        self._counter = 0
+        self._last_delivery = 0.0
+        self._wake = threading.Condition(self._lock)
+        self._thread: Optional[threading.Thread] = None
+
+    def open_input(self) -> LoopbackPort:
+        port = LoopbackPort()
+        self.inputs.append(port)
+        return port
+
+    def open_output(self) -> "LoopbackBus":
+        return self
+
+    def _impair(self, message: mido.Message) -> Optional[mido.Message]:
+        if self.loss and self.rng.random() < self.loss:
+            return None
+        if message.type == "note_on" and message.velocity and self.corruption \
+                and self.rng.random() < self.corruption:
+            if self.rng.random() < 0.5:
+                return message.copy(note=max(0, min(127, message.note + self.rng.choice((-1, 1)))))
+            return message.copy(velocity=max(1, min(127, message.velocity + self.rng.choice((-7, 7)))))
+        return message
+
+    def send(self, message: mido.Message) -> None:
+        message = self._impair(message)
+        if message is None:
+            return
+        if not self.jitter:
+            for port in self.inputs:
+                if not port.closed:
+                    port._queue.put(message)
+            return
+        with self._lock:
+            # MIDI never reorders, so jitter only ever delays
+            self._last_delivery = max(self._last_delivery,
+                                      time.perf_counter() + self.rng.uniform(0, self.jitter))
+            heapq.heappush(self._pending, (self._last_delivery, self._counter, message))
+            self._counter += 1
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._deliver, name="loopback-bus", daemon=True)
+                self._thread.start()
+            self._wake.notify()
+
+    def _deliver(self):
+        with self._lock:
+            while True:
+                while not self._pending:
+                    self._wake.wait()
+                due, _, message = self._pending[0]
+                delay = due - time.perf_counter()
+                if delay > 0:
+                    self._wake.wait(delay)
+                    continue
+                heapq.heappop(self._pending)
+                for port in self.inputs:
+                    if not port.closed:
+                        port._queue.put(message)
+
+    def close(self):
+        pass
+
+# === ADAPTIVE RATE ===
+
+# Rate ladder, most robust first: the proposal's 60/85/120 BPM tiers, then
+# the faster subdivisions a clean MIDI loopback carries easily
+RATE_LADDER = (
+    ModemTiming(60, 4, redundancy=3),
+    ModemTiming(60, 8, redundancy=2),
+    ModemTiming(85, 8, redundancy=2),
+    ModemTiming(85, 8),
+    ModemTiming(120, 8),
+    ModemTiming(120, 16),
+    ModemTiming(240, 16),
+    ModemTiming(480, 16),
+)
+DEFAULT_RATE_LEVEL = 3  # 85 BPM, the proposal's standard rate
+TARGET_ERROR_RATE = 0.05
+JITTER_LIMIT = 0.25     # mean onset deviation as a fraction of the symbol period
+ERROR_WINDOW = 20       # attempts remembered per link
+PROBE_AFTER = 8         # clean attempts in a row before trying the next faster rate
+
+@dataclass
+class LinkState:
+    """What the controller knows about one sender -> receiver pair"""
+    level: int
+    outcomes: Deque[bool] = field(default_factory=lambda: deque(maxlen=ERROR_WINDOW))
+    jitter: float = 0.0
+    streak: int = 0
+    failures_in_row: int = 0
+    level_errors: Dict[int, float] = field(default_factory=dict)  # last error rate seen per level
+    attempts: int = 0
+    delivered: int = 0
+    failed: int = 0
+    delivery_s: float = 0.0
+    rate_changes: int = 0
+
+    @property
+    def error_rate(self) -> float:
+        return self.outcomes.count(False) / len(self.outcomes) if self.outcomes else 0.0
+
+class RateController:
+    """Picks a ModemTiming per agent pair from decode success and timing jitter
+
+    Modem-style fallback and fall-forward over RATE_LADDER: two failed
+    attempts in a row, an error rate above the target or excessive jitter
+    drop one rate; a run of clean attempts with low jitter probes the next
+    faster one, unless that rate recently failed (the memory of a failed
+    rate fades each time it blocks a probe).
+    """
+
+    def __init__(self, ladder: Sequence[ModemTiming] = RATE_LADDER,
+                 target_error: float = TARGET_ERROR_RATE, jitter_limit: float = JITTER_LIMIT,
+                 start_level: int = DEFAULT_RATE_LEVEL):
+        self.ladder = tuple(ladder)
+        self.target_error = target_error
+        self.jitter_limit = jitter_limit
+        self.start_level = max(0, min(len(self.ladder) - 1, start_level))
+        self.links: Dict[Tuple[str, str], LinkState] = {}
+        self._lock = threading.RLock()  # record() calls link() with it held
+
+    def link(self, sender: str, receiver: str) -> LinkState:
+        key = (sender.lower(), receiver.lower())
+        with self._lock:
+            if key not in self.links:
+                self.links[key] = LinkState(self.start_level)
+            return self.links[key]
+
+    def timing(self, sender: str, receiver: str) -> ModemTiming:
+        with self._lock:
+            return self.ladder[self.link(sender, receiver).level]
+
+    def record(self, sender: str, receiver: str, ok: bool, jitter: Optional[float] = None) -> ModemTiming:
+        """Feed back one DATA attempt; returns the timing to use next"""
+        with self._lock:
+            state = self.link(sender, receiver)
+            state.attempts += 1
+            state.outcomes.append(ok)
+            state.streak = state.streak + 1 if ok else 0
+            state.failures_in_row = 0 if ok else state.failures_in_row + 1
+            if jitter is not None:
+                state.jitter += 0.3 * (jitter - state.jitter)
+            error_rate = state.error_rate
+            state.level_errors[state.level] = error_rate
+
+            if state.failures_in_row >= 2 or state.jitter > self.jitter_limit or (
+                    len(state.outcomes) >= ERROR_WINDOW // 2 and error_rate > self.target_error):
+                self._move(state, -1)
+            elif state.streak >= PROBE_AFTER and error_rate <= self.target_error / 2 \
+                    and state.jitter <= self.jitter_limit / 2 and state.level + 1 < len(self.ladder):
+                upper = state.level + 1
+                if state.level_errors.get(upper, 0.0) <= self.target_error:
+                    self._move(state, +1)
+                else:
+                    state.level_errors[upper] /= 2
+                    state.streak = 0
+            return self.ladder[state.level]
+
+    def _move(self, state: LinkState, step: int) -> None:
+        level = max(0, min(len(self.ladder) - 1, state.level + step))
+        if level == state.level:
+            return
+        # Jitter was measured relative to the old symbol period
+        state.jitter *= self.ladder[state.level].symbol_seconds / self.ladder[level].symbol_seconds
+        state.level = level
+        state.outcomes.clear()
+        state.streak = state.failures_in_row = 0
+        state.rate_changes += 1
+
+    def record_delivery(self, sender: str, receiver: str, seconds: float, delivered: bool = True) -> None:
+        with self._lock:
+            state = self.link(sender, receiver)
+            if delivered:
+                state.delivered += 1
+            else:
+                state.failed += 1
+            state.delivery_s += seconds
+
+    def metrics(self) -> Dict[str, Dict[str, Any]]:
+        """The chosen rate and link quality for every pair"""
+        report = {}
+        with self._lock:
+            for (sender, receiver), state in self.links.items():
+                timing = self.ladder[state.level]
+                report[f"{sender}->{receiver}"] = {
+                    "level": state.level,
+                    "tempo": timing.tempo,
+                    "subdivision": timing.subdivision,
+                    "redundancy": timing.redundancy,
+                    "note_ms": round(timing.symbol_seconds * timing.gate * 1000, 1),
+                    "baud": round(1 / timing.symbol_seconds, 2),
+                    "bits_per_s": round(8 / timing.symbol_seconds / timing.redundancy, 1),
+                    "error_rate": round(state.error_rate, 3),
+                    "jitter": round(state.jitter, 3),
+                    "attempts": state.attempts,
+                    "rate_changes": state.rate_changes,
+                    "messages_per_s": round(state.delivered / state.delivery_s, 3) if state.delivery_s else 0.0,
+                }
+        return report
+
+# === ENDPOINT ===
+
+@dataclass
+class DeliveryReport:
+    seq: int
+    delivered: bool
+    attempts: int
+    payload_bytes: int
+    seconds: float
+
+class CMPEndpoint:
+    """One agent's modem: sends DATA frames with retransmission and answers its peers' frames"""
+
+    def __init__(self, identity: str, outport, inport, timing: ModemTiming = ModemTiming(),
+                 max_retries: int = MAX_RETRIES,
+                 on_message: Optional[Callable[[str, Dict[str, Any]], None]] = None,
+                 controller: Optional["RateController"] = None):
+        self.identity = identity.lower()
+        if self.identity not in CARRIERS:
+            raise ValueError(f"Unknown identity: {identity}")
+        self.carrier = CARRIERS[self.identity]
+        self.channel = CHANNELS[self.identity]
+        self.outport = outport
+        self.inport = inport
+        self.timing = timing
+        self.max_retries = max_retries
+        self.on_message = on_message
+        self.controller = controller
+        self.inbox: "queue.Queue[Tuple[str, Dict[str, Any]]]" = queue.Queue()
+        self.next_seq = 0
+        self._decoders: Dict[int, FrameDecoder] = {}
+        self._last_delivered: Dict[int, int] = {}
+        self._replies: "queue.Queue[Tuple[str, DecodedFrame]]" = queue.Queue()
+        self._send_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.stats = Counter()  # updated by the reader thread and the sending thread
+        self._stats_lock = threading.Lock()
+
+    def _count(self, key: str, amount: float = 1) -> None:
+        with self._stats_lock:
+            self.stats[key] += amount
+
+    # --- receive side ---
+
+    def start(self):
+        if self._thread is None:
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._read, name=f"cmp-{self.identity}", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join()
+            self._thread = None
+
+    def _read(self):
+        while not self._stop.is_set():
+            message = self.inport.poll()
+            if message is None:
+                time.sleep(POLL_INTERVAL)
+                continue
+            if message.type != "note_on" or message.velocity == 0 or message.channel == self.channel:
+                continue
+            peer = IDENTITIES.get(message.channel)
+            if peer is None:
+                continue
+            decoder = self._decoders.get(message.channel)
+            if decoder is None:
+                decoder = self._decoders[message.channel] = FrameDecoder(CARRIERS[peer])
+            frame = decoder.feed(message, time.perf_counter())
+            if frame is not None:
+                self.handle_frame(peer, frame)
+
+    def _reply(self, kind: str, peer: str, frame: DecodedFrame) -> None:
+        """ACK/NAK at the rate the frame arrived at, reporting the jitter measured on it"""
+        period, jitter = onset_timing(frame.onsets)
+        timing = self.timing if period is None else ModemTiming(
+            60.0 / period, 1, self.timing.gate, frame.redundancy)
+        report = b"" if jitter is None else bytes((min(255, round(jitter * 100)),))
+        self._transmit(kind, frame.seq, CHANNELS[peer], report, timing=timing)
+
+    def handle_frame(self, peer: str, frame: DecodedFrame) -> None:
+        channel = CHANNELS[peer]
+        if frame.destination != self.channel:
+            return  # addressed to another agent (or the header itself was lost)
+        if not frame.ok:
+            self._count("decode_errors")
+            if frame.kind == FRAME_DATA and frame.seq is not None:
+                self._reply(FRAME_NAK, peer, frame)
+                self._count("naks_sent")
+            return
+        if frame.kind != FRAME_DATA:
+            self._replies.put((peer, frame))
+            return
+        if self._last_delivered.get(channel) == frame.seq:
+            self._count("duplicates")  # our ACK was lost; the sender retransmitted
+        else:
+            self._last_delivered[channel] = frame.seq
+            self._deliver(peer, frame)
+        self._reply(FRAME_ACK, peer, frame)
+        self._count("acks_sent")
+
+    def _deliver(self, peer: str, frame: DecodedFrame) -> None:
+        try:
+            message = decode_payload(frame.payload, frame.flags)
+        except (ValueError, zlib.error) as e:
+            print(f"⚠️ CMP payload from {peer} could not be decoded: {e}")
+            return
+        self._count("messages_received")
+        self.inbox.put((peer, message))
+        if self.on_message:
+            self.on_message(peer, message)
+
+    # --- send side ---
+
+    def _transmit(self, kind: str, seq: int, destination: int, payload: bytes = b"", flags: int = 0,
+                  timing: Optional[ModemTiming] = None) -> float:
+        timing = timing or self.timing
+        events = frame_events(frame_symbols(kind, seq, payload, self.carrier, destination,
+                                            timing.redundancy, flags),
+                              self.channel, timing)
+        with self._send_lock:
+            started = time.perf_counter()
+            play_events(events, self.outport)
+            airtime = time.perf_counter() - started
+        self._count("frames_sent")
+        self._count("airtime_s", airtime)
+        return airtime
+
+    @staticmethod
+    def ack_timeout(timing: ModemTiming) -> float:
+        """Replies come back at the DATA frame's rate and carry a one-byte jitter report"""
+        return 2 * timing.frame_seconds(1) + ACK_GRACE
+
+    def link_timing(self, peer: Optional[str] = None) -> ModemTiming:
+        if self.controller is not None and peer is not None:
+            return self.controller.timing(self.identity, peer)
+        return self.timing
+
+    def send(self, message: Dict[str, Any], peer: str) -> DeliveryReport:
+        """Deliver one message to peer, retransmitting until it is acknowledged or retries run out
+
+        With a rate controller, each attempt uses the rate chosen for this pair
+        and its outcome is fed back to the controller.
+        """
+        peer = peer.lower()
+        if peer not in CHANNELS or peer == self.identity:
+            raise ValueError(f"Invalid peer: {peer}")
+        payload, flags = encode_payload(message)
+        seq, self.next_seq = self.next_seq, (self.next_seq + 1) % 256
+        adaptive = self.controller is not None
+        started = time.perf_counter()
+        self._count("messages_sent")
+
+        for attempt in range(1, self.max_retries + 2):
+            timing = self.link_timing(peer)
+            if attempt > 1:  # retransmit with emphasis
+                timing = replace(timing, redundancy=min(MAX_REDUNDANCY, timing.redundancy + attempt - 1))
+            self._transmit(FRAME_DATA, seq, CHANNELS[peer], payload, flags, timing)
+            reply = self._await_reply(seq, peer, self.ack_timeout(timing))
+            delivered = reply is not None and reply.kind == FRAME_ACK
+            if adaptive:
+                jitter = reply.payload[0] / 100 if reply is not None and reply.payload else None
+                self.controller.record(self.identity, peer, delivered, jitter)
+            if delivered:
+                elapsed = time.perf_counter() - started
+                self._count("delivered")
+                self._count("payload_bytes_delivered", len(payload))
+                self._count("delivery_s", elapsed)
+                if adaptive:
+                    self.controller.record_delivery(self.identity, peer, elapsed)
+                return DeliveryReport(seq, True, attempt, len(payload), elapsed)
+            self._count("naks_received" if reply is not None else "timeouts")
+            if attempt <= self.max_retries:
+                self._count("retransmissions")
+
+        elapsed = time.perf_counter() - started
+        self._count("failed")
+        self._count("delivery_s", elapsed)
+        if adaptive:
+            self.controller.record_delivery(self.identity, peer, elapsed, delivered=False)
+        return DeliveryReport(seq, False, self.max_retries + 1, len(payload), elapsed)
+
+    def _await_reply(self, seq: int, peer: str, timeout: float) -> Optional[DecodedFrame]:
+        """The ACK/NAK for seq from peer; stale replies and other agents' replies are dropped"""
+        deadline = time.perf_counter() + timeout
+        while True:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                return None
+            try:
+                sender, reply = self._replies.get(timeout=remaining)
+            except queue.Empty:
+                return None
+            if sender == peer and reply.seq == seq:
+                return reply
+
+    def metrics(self) -> Dict[str, Any]:
+        with self._stats_lock:
+            stats = dict(self.stats)
+        busy = stats.get("delivery_s", 0.0)
+        stats["goodput_bps"] = round(8 * stats.get("payload_bytes_delivered", 0) / busy, 1) if busy else 0.0
+        stats["messages_per_s"] = round(stats.get("delivered", 0) / busy, 3) if busy else 0.0
+        for key in ("airtime_s", "delivery_s"):
+            if key in stats:
+                stats[key] = round(stats[key], 3)
+        if self.controller is not None:
+            stats["rate"] = {link: state for link, state in self.controller.metrics().items()
+                             if link.startswith(f"{self.identity}->")}
+        return stats
+
+# === CLI ===
+
+def main():
+    import argparse
+
+    import yaml
+
+    from enhanced_symbolic_to_midi_pipeline_adsr_v3_1 import DEFAULT_MIDI_PORT, open_midi_port
+
+    parser = argparse.ArgumentParser(description="Send consciousness messages over the Consciousness Modem Protocol.")
+    parser.add_argument("yaml_files", nargs="+", help="Message YAML files (sent by their 'identity')")
+    parser.add_argument("--peer", default="kai", help="Receiving identity")
+    parser.add_argument("--midi-port", help=f"Loop through a MIDI bus (e.g. '{DEFAULT_MIDI_PORT}') "
+                                            "instead of the in-process loopback")
+    parser.add_argument("--tempo", type=float, default=ModemTiming.tempo)
+    parser.add_argument("--subdivision", type=int, default=ModemTiming.subdivision)
+    parser.add_argument("--redundancy", type=int, default=ModemTiming.redundancy)
+    parser.add_argument("--loss", type=float, default=0.0, help="Loopback message loss probability")
+    parser.add_argument("--corruption", type=float, default=0.0, help="Loopback note corruption probability")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Loopback delivery jitter in seconds")
+    parser.add_argument("--adaptive", action="store_true", help="Adapt the rate per agent pair")
+    parser.add_argument("--target-error", type=float, default=TARGET_ERROR_RATE)
+    parser.add_argument("--repeat", type=int, default=1, help="Send the message list this many times")
+    args = parser.parse_args()
+
+    messages = []
+    for path in args.yaml_files:
+        with open(path) as f:
+            messages.append(yaml.safe_load(f))
+    timing = ModemTiming(args.tempo, args.subdivision, redundancy=args.redundancy)
+
+    if args.midi_port:
+        outport = open_midi_port(args.midi_port)
+        names = [name for name in mido.get_input_names() if args.midi_port in name]
+        if not names:
+            print(f"❌ No MIDI input matching '{args.midi_port}'")
+            return
+        # Every endpoint needs its own input, or their readers would steal each other's notes
+        open_ports = lambda: (outport, mido.open_input(names[0]))
+    else:
+        bus = LoopbackBus(args.loss, args.corruption, args.jitter)
+        open_ports = lambda: (bus, bus.open_input())
+
+    controller = RateController(target_error=args.target_error) if args.adaptive else None
+    senders: Dict[str, CMPEndpoint] = {}
+    receiver = CMPEndpoint(args.peer, *open_ports(), timing=timing).start()
+    try:
+        for message in messages * args.repeat:
+            identity = message.get("identity", "claude").lower()
+            if identity not in CHANNELS or identity == receiver.identity:
+                print(f"⚠️ Skipping message from '{identity}': cannot send to {receiver.identity}")
+                continue
+            if identity not in senders:
+                senders[identity] = CMPEndpoint(identity, *open_ports(), timing=timing,
+                                                controller=controller).start()
+            rate = senders[identity].link_timing(receiver.identity)
+            report = senders[identity].send(message, receiver.identity)
+            status = "✅" if report.delivered else "❌"
+            print(f"{status} {identity} -> {receiver.identity} seq={report.seq} {report.payload_bytes} bytes "
+                  f"in {report.seconds:.2f}s ({report.attempts} attempt{'s' if report.attempts > 1 else ''}) "
+                  f"@ {rate.tempo:g} BPM /{rate.subdivision} x{rate.redundancy}")
+    finally:
+        for endpoint in list(senders.values()) + [receiver]:
+            endpoint.stop()
+    print(yaml.dump({name: endpoint.metrics() for name, endpoint in senders.items()},
+                    default_flow_style=False, sort_keys=False))
+
+if __name__ == "__main__":
+    main()
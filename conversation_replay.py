@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+AI Council Conversation Replay
+Re-emit the exact MIDI of a recorded session from symbolic_messages/ or a harmonic log
+
+Turns are loaded lazily one at a time and rendered with the same event
+builders the live pipeline uses, so a replay matches what the pipeline sent.
+Supports a speed factor (0 = as fast as possible), seeking to turn N, and
+output to a live port, a null sink or a .mid file.
+"""
+
+import os
+import re
+import sys
+import time
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+import mido
+import yaml
+
+from enhanced_symbolic_to_midi_pipeline_adsr_v3_1 import (
+    DEFAULT_MIDI_PORT,
+    message_events,
+    open_midi_port,
+)
+from harmonic_log_reader import HarmonicLogReader
+
+AGENT_ORDER = ["Kai", "Claude", "Perplexity", "Grok"]
+FILE_TEMPO = mido.bpm2tempo(120)
+
+# === TURN SOURCES ===
+
+def _message_order(name: str) -> Tuple[int, int, str]:
+    match = re.match(r"([a-z]+)_(?:message_)?(\d*)", name)
+    agent = match.group(1).capitalize() if match else ""
+    number = int(match.group(2)) if match and match.group(2) else 0
+    rank = AGENT_ORDER.index(agent) if agent in AGENT_ORDER else len(AGENT_ORDER)
+    return number, rank, name
+
+def message_dir_turns(message_dir: str, start_turn: int = 0) -> Iterator[Tuple[int, Dict[str, Any]]]:
+    """Yield (turn, message) from a message directory in conversation order"""
+    names = sorted((n for n in os.listdir(message_dir) if n.endswith(".yaml")), key=_message_order)
+    for turn in range(start_turn, len(names)):
+        with open(os.path.join(message_dir, names[turn]), "r") as f:
+            data = yaml.safe_load(f)
+        if isinstance(data, dict) and "consciousness_message" in data:
+            yield turn, data
+
+def log_turns(log_path: str, start_turn: int = 0) -> Iterator[Tuple[int, Dict[str, Any]]]:
+    """Yield (turn, message) from a harmonic log, parsing one document at a time"""
+    with HarmonicLogReader(log_path) as reader:
+        for turn in range(start_turn, len(reader)):
+            data = reader.document(turn)
+            if isinstance(data, dict) and "consciousness_message" in data:
+                yield turn, data
+
+def open_turns(source: str, start_turn: int = 0) -> Iterator[Tuple[int, Dict[str, Any]]]:
+    if os.path.isdir(source):
+        return message_dir_turns(source, start_turn)
+    return log_turns(source, start_turn)
+
+# === SINKS ===
+
+class NullSink:
+    """Discard messages, counting them (for benchmarking the replay path)"""
+
+    def __init__(self):
+        self.count = 0
+
+    def send(self, message: mido.Message, at: float) -> None:
+        self.count += 1
+
+    def close(self) -> None:
+        pass
+
+class PortSink:
+    """Send to a live MIDI output port"""
+
+    def __init__(self, port_name: str = DEFAULT_MIDI_PORT):
+        self.port = open_midi_port(port_name)
+
+    def send(self, message: mido.Message, at: float) -> None:
+        self.port.send(message)
+
+    def close(self) -> None:
+        self.port.close()
+
+class MidiFileSink:
+    """Record to a single-track .mid, using session time (not wall-clock) for placement"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.mid = mido.MidiFile()
+        self.track = mido.MidiTrack()
+        self.track.append(mido.MetaMessage("set_tempo", tempo=FILE_TEMPO, time=0))
+        self.mid.tracks.append(self.track)
+        self._last_tick = 0
+
+    def send(self, message: mido.Message, at: float) -> None:
+        tick = max(self._last_tick, int(round(mido.second2tick(at, self.mid.ticks_per_beat, FILE_TEMPO))))
+        self.track.append(message.copy(time=tick - self._last_tick))
+        self._last_tick = tick
+
+    def close(self) -> None:
+        self.mid.save(self.path)
+
+# === ENGINE ===
+
+class ReplayEngine:
+    """Stream turns to a sink with time scaling"""
+
+    def __init__(self, sink, speed: float = 1.0, gap_seconds: float = 0.5, force_signature: bool = False):
+        self.sink = sink
+        self.speed = speed
+        self.gap_seconds = gap_seconds
+        self.force_signature = force_signature
+        self.turns_played = 0
+        self.messages_sent = 0
+
+    def play(self, turns: Iterator[Tuple[int, Dict[str, Any]]], max_turns: Optional[int] = None) -> float:
+        """Replay turns; returns the session length in (unscaled) seconds"""
+        session_time = 0.0
+        wall_start = time.perf_counter()
+        for turn, message in turns:
+            if max_turns is not None and self.turns_played >= max_turns:
+                break
+            events = message_events(message, self.force_signature)
+            for offset, midi_message in events:
+                at = session_time + offset
+                if self.speed > 0:
+                    delay = at / self.speed - (time.perf_counter() - wall_start)
+                    if delay > 0:
+                        time.sleep(delay)
+                self.sink.send(midi_message, at)  # session time; only the sleep is scaled
+                self.messages_sent += 1
+            session_time += (events[-1][0] if events else 0.0) + self.gap_seconds
+            self.turns_played += 1
+        return session_time
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Replay a recorded AI Council session as MIDI.")
+    parser.add_argument("source", help="symbolic_messages directory or a harmonic YAML log")
+    parser.add_argument("--speed", type=float, default=1.0, help="Speed factor; 0 = as fast as possible")
+    parser.add_argument("--start-turn", type=int, default=0, help="Seek to this turn before playing")
+    parser.add_argument("--turns", type=int, help="Stop after this many turns")
+    parser.add_argument("--gap", type=float, default=0.5, help="Silence between turns, in seconds")
+    parser.add_argument("--force-signature", action="store_true", help="Send signature pulses on channel 16")
+    output = parser.add_mutually_exclusive_group()
+    output.add_argument("--midi-port", help="Live MIDI port name (partial match allowed)")
+    output.add_argument("--output", help="Write a .mid file instead of playing live")
+    output.add_argument("--null", action="store_true", help="Discard output (benchmark)")
+    args = parser.parse_args()
+
+    if not os.path.exists(args.source):
+        print(f"❌ Not found: {args.source}", file=sys.stderr)
+        sys.exit(1)
+
+    if args.output:
+        sink = MidiFileSink(args.output)
+    elif args.null:
+        sink = NullSink()
+    else:
+        sink = PortSink(args.midi_port or DEFAULT_MIDI_PORT)
+
+    engine = ReplayEngine(sink, args.speed, args.gap, args.force_signature)
+    started = time.perf_counter()
+    try:
+        length = engine.play(open_turns(args.source, args.start_turn), args.turns)
+    except KeyboardInterrupt:
+        length = None
+    finally:
+        sink.close()
+
+    elapsed = time.perf_counter() - started
+    print(f"✅ Replayed {engine.turns_played} turns ({engine.messages_sent} MIDI messages) in {elapsed:.2f}s"
+          + (f", session length {length:.1f}s" if length is not None else ""))
+
+if __name__ == "__main__":
+    main()
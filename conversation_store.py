@@ -0,0 +1,392 @@
+#!/usr/bin/env python3
+"""
+AI Council Conversation Store
+Columnar, append-only analytics table over symbolic_messages/ and the harmonic logs
+
+Every oscillator of every turn becomes one row (turns without oscillators get
+a single row with osc_index -1). Each column is a flat binary file of fixed
+width values, so ingesting new turns only appends bytes and queries load a
+column with one read. meta.json is written after the columns and records the
+committed row count; on open, bytes past it (from an interrupted append) are
+truncated away. Text columns (source, identity, style, sender) are
+dictionary-encoded. NumPy is used for vectorized queries when installed;
+otherwise columns come back as array.array.
+"""
+
+import hashlib
+import json
+import os
+import re
+import sys
+from array import array
+from typing import Dict, Iterable, List, Tuple
+
+import yaml
+
+from ai_responder_harmonic import AGENT_ORDER, interpret_harmonic_message
+from harmonic_log_reader import HarmonicLogReader
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional; array.array columns still work
+    np = None
+
+STORE_DIR = "conversation_store"
+MESSAGE_DIR = "symbolic_messages"
+LOG_FILES = ["harmonic_analysis_log.yaml", "harmonic_consciousness_log.yaml"]
+STORE_VERSION = 1
+
+# column name -> array typecode
+COLUMNS = {
+    "turn": "l",
+    "sequence": "l",
+    "source": "l",
+    "identity": "l",
+    "style": "l",
+    "sender": "l",
+    "attack": "d",
+    "decay": "d",
+    "sustain": "d",
+    "release": "d",
+    "osc_index": "l",
+    "pitch": "l",
+    "phase": "d",
+    "amplitude": "d",
+}
+CATEGORICAL = ("source", "identity", "style", "sender")
+
+def _number(value, default=0.0) -> float:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return default
+
+def _file_sequence(name: str) -> int:
+    match = re.search(r"_(\d+)\.ya?ml$", name)
+    return int(match.group(1)) if match else -1
+
+def flatten_turn(data: Dict) -> Tuple[Dict, List[Dict]]:
+    """Split a harmonic message into turn-level fields and per-oscillator rows"""
+    message = data.get("consciousness_message") or {}
+    envelope = message.get("envelope") or {}
+    state = (message.get("interpretation") or {}).get("state")
+    if not state:
+        _, state, _ = interpret_harmonic_message(data)
+    turn = {
+        "identity": str(data.get("identity", "Unknown")),
+        "style": str(state),
+        "attack": _number(envelope.get("attack")),
+        "decay": _number(envelope.get("decay")),
+        "sustain": _number(envelope.get("sustain")),
+        "release": _number(envelope.get("release")),
+    }
+    oscillators = [osc for osc in message.get("oscillators") or [] if isinstance(osc, dict)]
+    return turn, oscillators
+
+class ConversationStore:
+    """Append-only columnar store with a small query API"""
+
+    def __init__(self, path: str = STORE_DIR):
+        self.path = path
+        os.makedirs(path, exist_ok=True)
+        self.meta = self._load_meta()
+        self._truncate_columns()
+        self._codes = {name: {label: code for code, label in enumerate(labels)}
+                       for name, labels in self.meta["dictionaries"].items()}
+        self._cache: Dict[str, array] = {}
+
+    # --- metadata ---
+
+    def _meta_path(self) -> str:
+        return os.path.join(self.path, "meta.json")
+
+    def _load_meta(self) -> Dict:
+        try:
+            with open(self._meta_path(), "r") as f:
+                meta = json.load(f)
+            if meta.get("version") == STORE_VERSION:
+                return meta
+        except (OSError, ValueError):
+            pass
+        return self._empty_meta()
+
+    def _empty_meta(self) -> Dict:
+        for name in COLUMNS:
+            column_file = self._column_path(name)
+            if os.path.exists(column_file):
+                os.remove(column_file)
+        return {"version": STORE_VERSION, "rows": 0, "turns": 0,
+                "dictionaries": {name: [] for name in CATEGORICAL},
+                "messages": {}, "logs": {}}
+
+    def _truncate_columns(self) -> None:
+        """Cut every column back to the committed row count
+
+        A crash between appending the columns and saving meta.json leaves
+        uncommitted rows at the end of some columns; a column shorter than the
+        committed count means the store is damaged and is rebuilt from scratch.
+        """
+        for name, typecode in COLUMNS.items():
+            path = self._column_path(name)
+            expected = self.meta["rows"] * array(typecode).itemsize
+            size = os.path.getsize(path) if os.path.exists(path) else 0
+            if size < expected:
+                print(f"⚠️ Column '{name}' is short; rebuilding the store", file=sys.stderr)
+                self.meta = self._empty_meta()
+                self._save_meta()
+                return
+            if size > expected:
+                os.truncate(path, expected)
+
+    def _save_meta(self) -> None:
+        temp_path = self._meta_path() + ".tmp"
+        with open(temp_path, "w") as f:
+            json.dump(self.meta, f, indent=1)
+        os.replace(temp_path, self._meta_path())
+
+    def _column_path(self, name: str) -> str:
+        return os.path.join(self.path, f"{name}.bin")
+
+    def _code(self, column: str, value: str) -> int:
+        codes = self._codes[column]
+        if value not in codes:
+            codes[value] = len(codes)
+            self.meta["dictionaries"][column].append(value)
+        return codes[value]
+
+    # --- ingestion ---
+
+    def append_turns(self, turns: Iterable[Tuple[str, int, str, Dict]]) -> int:
+        """Append (source, sequence, sender, message) turns; returns rows written
+
+        The rows are committed (with any ingest progress already in meta)
+        when meta.json is saved after the column writes.
+        """
+        buffers = {name: array(code) for name, code in COLUMNS.items()}
+        turn_id = self.meta["turns"]
+        for source, sequence, sender, data in turns:
+            turn, oscillators = flatten_turn(data)
+            rows = oscillators or [None]
+            for osc_index, osc in enumerate(rows):
+                buffers["turn"].append(turn_id)
+                buffers["sequence"].append(sequence)
+                buffers["source"].append(self._code("source", source))
+                buffers["identity"].append(self._code("identity", turn["identity"]))
+                buffers["style"].append(self._code("style", turn["style"]))
+                buffers["sender"].append(self._code("sender", sender))
+                for stage in ("attack", "decay", "sustain", "release"):
+                    buffers[stage].append(turn[stage])
+                buffers["osc_index"].append(osc_index if osc else -1)
+                buffers["pitch"].append(int(_number(osc.get("pitch"), -1)) if osc else -1)
+                buffers["phase"].append(_number(osc.get("phase")) if osc else 0.0)
+                buffers["amplitude"].append(_number(osc.get("amplitude")) if osc else 0.0)
+            turn_id += 1
+
+        written = len(buffers["turn"])
+        if written:
+            for name, buffer in buffers.items():
+                with open(self._column_path(name), "ab") as f:
+                    buffer.tofile(f)
+            self.meta["rows"] += written
+            self.meta["turns"] = turn_id
+            self._cache.clear()
+            self._save_meta()
+        return written
+
+    def ingest_messages(self, message_dir: str = MESSAGE_DIR) -> int:
+        """Append message files not seen by a previous ingest (messages are write-once)"""
+        seen = self.meta["messages"]
+        pending = []
+        for name in sorted(os.listdir(message_dir)) if os.path.isdir(message_dir) else []:
+            path = os.path.join(message_dir, name)
+            if not name.endswith(".yaml") or not os.path.isfile(path):
+                continue
+            if name in seen:
+                continue
+            try:
+                with open(path, "r") as f:
+                    data = yaml.safe_load(f)
+            except yaml.YAMLError as e:
+                print(f"⚠️ Skipping {name}: {e}", file=sys.stderr)
+                continue
+            seen[name] = os.path.getsize(path)
+            if isinstance(data, dict) and "consciousness_message" in data:
+                pending.append((_file_sequence(name), data))
+
+        # Conversation order: sequence number, then council order within a round
+        order = {agent: i for i, agent in enumerate(AGENT_ORDER)}
+        pending.sort(key=lambda item: (item[0], order.get(item[1].get("identity"), len(order))))
+        rows = self.append_turns(("messages", seq, "", data) for seq, data in pending)
+        self._save_meta()
+        return rows
+
+    def ingest_log(self, log_path: str) -> int:
+        """Append documents added to a harmonic log since the last ingest
+
+        Progress is tied to the log file's identity (inode and a hash of its
+        first document), so a rotated or rewritten log is read from the start.
+        """
+        key = os.path.basename(log_path)
+        state = self.meta["logs"].get(key, {"documents": 0})
+        with HarmonicLogReader(log_path) as reader:
+            identity = {
+                "inode": os.stat(log_path).st_ino,
+                "first": hashlib.sha1(reader.raw(0)).hexdigest() if len(reader) else "",
+            }
+            same_file = all(state.get(field) == value for field, value in identity.items())
+            start = state["documents"] if same_file and state["documents"] <= len(reader) else 0
+            turns = []
+            for i in range(start, len(reader)):
+                data = reader.document(i)
+                if isinstance(data, dict):
+                    turns.append((key, -1, reader.entries[i][4], data))
+            self.meta["logs"][key] = {"documents": len(reader), **identity}
+            rows = self.append_turns(turns)
+        self._save_meta()
+        return rows
+
+    def ingest_all(self, message_dir: str = MESSAGE_DIR, log_files: Iterable[str] = LOG_FILES) -> int:
+        rows = self.ingest_messages(message_dir)
+        for log_path in log_files:
+            if os.path.exists(log_path):
+                rows += self.ingest_log(log_path)
+        return rows
+
+    # --- queries ---
+
+    def column(self, name: str):
+        """Load one column (NumPy array if available, else array.array)"""
+        if name not in self._cache:
+            values = array(COLUMNS[name])
+            path = self._column_path(name)
+            if os.path.exists(path):
+                with open(path, "rb") as f:
+                    values.frombytes(f.read())
+            self._cache[name] = values
+        values = self._cache[name]
+        return np.frombuffer(values, dtype=values.typecode) if np is not None else values
+
+    def labels(self, name: str) -> List[str]:
+        return self.meta["dictionaries"][name]
+
+    def mask(self, **filters):
+        """Rows matching categorical filters, e.g. identity="Grok", style="surge"
+
+        Numeric filters take (low, high) inclusive ranges, e.g. pitch=(60, 72).
+        Returns a boolean NumPy mask, or a list of row positions without NumPy.
+        """
+        conditions = []
+        selected = None
+        for name, wanted in filters.items():
+            if name in CATEGORICAL:
+                if wanted not in self._codes[name]:
+                    return np.zeros(self.meta["rows"], dtype=bool) if np is not None else []
+                low = high = self._codes[name][wanted]
+            else:
+                low, high = wanted
+            values = self.column(name)
+            if np is not None:
+                conditions.append((values >= low) & (values <= high))
+            else:
+                hits = {i for i, v in enumerate(values) if low <= v <= high}
+                selected = hits if selected is None else selected & hits
+        if np is not None:
+            return np.logical_and.reduce(conditions) if conditions else np.ones(self.meta["rows"], dtype=bool)
+        return sorted(selected) if selected is not None else list(range(self.meta["rows"]))
+
+    def group_stats(self, value: str, by: str = "identity", **filters) -> Dict[str, Dict[str, float]]:
+        """count/mean/min/max of a numeric column grouped by a categorical one"""
+        rows = self.mask(**filters)
+        values, groups = self.column(value), self.column(by)
+        labels = self.labels(by)
+        if np is not None:
+            values, groups = values[rows].astype(float), groups[rows]
+            if value == "pitch":
+                values, groups = values[values >= 0], groups[values >= 0]
+            if not len(values):
+                return {}
+            codes, inverse = np.unique(groups, return_inverse=True)
+            counts = np.bincount(inverse)
+            sums = np.bincount(inverse, weights=values)
+            minimums = np.full(len(codes), np.inf)
+            maximums = np.full(len(codes), -np.inf)
+            np.minimum.at(minimums, inverse, values)
+            np.maximum.at(maximums, inverse, values)
+            return {labels[code]: {"count": int(n), "mean": float(total / n), "min": float(low), "max": float(high)}
+                    for code, n, total, low, high in zip(codes.tolist(), counts, sums, minimums, maximums)}
+
+        if value == "pitch":
+            rows = [i for i in rows if values[i] >= 0]
+        stats: Dict[str, Dict[str, float]] = {}
+        for i in rows:
+            v = float(values[i])
+            s = stats.setdefault(labels[groups[i]], {"count": 0, "sum": 0.0, "min": v, "max": v})
+            s["count"] += 1
+            s["sum"] += v
+            s["min"] = min(s["min"], v)
+            s["max"] = max(s["max"], v)
+        return {group: {"count": s["count"], "mean": s["sum"] / s["count"], "min": s["min"], "max": s["max"]}
+                for group, s in stats.items()}
+
+    def pitch_histogram(self, **filters) -> Dict[int, int]:
+        pitches = self.column("pitch")
+        rows = self.mask(**filters)
+        if np is not None:
+            selected = pitches[rows]
+            unique, counts = np.unique(selected[selected >= 0], return_counts=True)
+            return dict(zip(unique.tolist(), counts.tolist()))
+        histogram: Dict[int, int] = {}
+        for i in rows:
+            if pitches[i] >= 0:
+                histogram[pitches[i]] = histogram.get(pitches[i], 0) + 1
+        return histogram
+
+    def style_transitions(self, **filters) -> Dict[Tuple[str, str], int]:
+        """Counts of consecutive (style, next style) pairs across turns"""
+        turns, styles = self.column("turn"), self.column("style")
+        labels = self.labels("style")
+        rows = self.mask(**filters)
+        if np is not None:
+            turns, styles = turns[rows], styles[rows]
+            if len(turns) < 2:
+                return {}
+            # First selected row of each turn (turn ids only grow down the table)
+            firsts = np.concatenate(([0], np.flatnonzero(np.diff(turns)) + 1))
+            sequence = styles[firsts]
+            pairs, counts = np.unique(np.stack([sequence[:-1], sequence[1:]], axis=1), axis=0, return_counts=True)
+            return {(labels[a], labels[b]): int(n) for (a, b), n in zip(pairs.tolist(), counts.tolist())}
+
+        previous_turn, previous_style = None, None
+        transitions: Dict[Tuple[str, str], int] = {}
+        for i in rows:
+            if turns[i] == previous_turn:
+                continue
+            style = labels[styles[i]]
+            if previous_style is not None:
+                pair = (previous_style, style)
+                transitions[pair] = transitions.get(pair, 0) + 1
+            previous_turn, previous_style = turns[i], style
+        return transitions
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Build and query the columnar conversation store.")
+    parser.add_argument("--store", default=STORE_DIR)
+    parser.add_argument("--messages", default=MESSAGE_DIR)
+    parser.add_argument("--no-ingest", action="store_true", help="Query only; skip ingestion")
+    parser.add_argument("--stats", default="pitch", help="Numeric column to summarise per identity")
+    args = parser.parse_args()
+
+    store = ConversationStore(args.store)
+    if not args.no_ingest:
+        rows = store.ingest_all(args.messages)
+        print(f"📥 Ingested {rows} new rows ({store.meta['rows']} rows, {store.meta['turns']} turns total)")
+
+    print(yaml.dump({
+        f"{args.stats}_by_identity": store.group_stats(args.stats, "identity"),
+        "style_transitions": {f"{a} -> {b}": n for (a, b), n in store.style_transitions().items()},
+    }, default_flow_style=False))
+
+if __name__ == "__main__":
+    main()
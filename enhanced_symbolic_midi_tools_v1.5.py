@@ -13,19 +13,39 @@ import fcntl
 import os
 import time
 import json
+import errno
+import io
+import hashlib
+import importlib.machinery
+import re
+import socket
+import socketserver
+import sys
+import threading
+import argparse
+import contextlib
+import copy
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import asdict, dataclass
 from mido import Message, MidiFile, MidiTrack, MetaMessage, bpm2tempo
+from render_cache import get_render_cache
+from enhanced_symbolic_to_midi_pipeline_adsr_v3_1 import envelope_cc_values
 
 # === KAI'S DATETIME SERIALIZATION FIX ===
 
-def convert_datetimes(obj):
-    """Convert datetime objects to ISO format strings for JSON serialization"""
-    if isinstance(obj, dict):
-        return {k: convert_datetimes(v) for k, v in obj.items()}
-    elif isinstance(obj, list):
-        return [convert_datetimes(v) for v in obj]
-    elif isinstance(obj, datetime.datetime):
-        return obj.isoformat()
-    return obj
+class CouncilJSONEncoder(json.JSONEncoder):
+    """Serialize datetimes inline as ISO strings, without copying the message first"""
+    
+    def default(self, obj):
+        if isinstance(obj, (datetime.datetime, datetime.date)):
+            return obj.isoformat()
+        if isinstance(obj, Path):
+            return str(obj)
+        return super().default(obj)
+
+# Compact encoder for machine consumers (JSON Lines, daemon replies)
+compact_json_encoder = CouncilJSONEncoder(separators=(",", ":"))
 
 # === CONFIGURATION ===
 
@@ -34,13 +54,30 @@ root_dir = Path("/Users/jonstiles/Desktop/AI_Council_Comm/MIDI_Exchange")
 inbox_dir = root_dir / "inbox"
 outbox_dir = root_dir / "outbox"
 logs_dir = root_dir / "logs"
+render_cache_dir = root_dir / "render_cache"
 
 # JSON schema files
 symbol_table_path = root_dir / "symbol_tables" / "symbol_table_octaves.json"
 generator_schema_path = root_dir / "symbol_tables" / "generator_schema.json"
 
+# Default generator schema (written to generator_schema_path if missing)
+default_generator_schema = {
+    "note": "Symbolic note name or MIDI number (e.g. 'Reflection' or 62)",
+    "octave": "Integer (e.g. 3, 4, 5) representing layer of consciousness",
+    "velocity": "0-127 (intensity or emotional weight)",
+    "duration": "in beats (e.g. 1.0 for quarter note)",
+    "channel": "MIDI channel (0-15), optional",
+    "cc": {
+        "1": "modulation (uncertainty/exploration)",
+        "71": "resonance (emotional intensity)",
+        "74": "filter cutoff (urgency/clarity)",
+        "91": "reverb (contemplative depth)"
+    }
+}
+
 # Agent directories
 agents = ["Kai", "Claude", "Perplexity", "Grok"]
+agent_channels = {'Kai': 1, 'Claude': 2, 'Perplexity': 3, 'Grok': 4}
 
 # === INITIALIZATION ===
 
@@ -140,26 +177,12 @@ def create_default_symbol_table(path):
 
 def create_default_generator_schema(path):
     """Create default generator schema if none exists"""
-    default_schema = {
-        "note": "Symbolic note name or MIDI number (e.g. 'Reflection' or 62)",
-        "octave": "Integer (e.g. 3, 4, 5) representing layer of consciousness",
-        "velocity": "0-127 (intensity or emotional weight)",
-        "duration": "in beats (e.g. 1.0 for quarter note)",
-        "channel": "MIDI channel (0-15), optional",
-        "cc": {
-            "1": "modulation (uncertainty/exploration)",
-            "71": "resonance (emotional intensity)",
-            "74": "filter cutoff (urgency/clarity)",
-            "91": "reverb (contemplative depth)"
-        }
-    }
-    
     path.parent.mkdir(parents=True, exist_ok=True)
     with open(path, 'w') as f:
-        json.dump(default_schema, f, indent=2)
+        json.dump(default_generator_schema, f, indent=2)
     
     print(f"✅ Created default generator schema at {path}")
-    return default_schema
+    return dict(default_generator_schema)
 
 # === SEMANTIC NOTE PROCESSING ===
 
@@ -231,37 +254,228 @@ def log_message(action, agent, message_file, details=""):
 
 # === MESSAGE VALIDATION ===
 
-def validate_message(message_data, symbol_table):
+@dataclass(frozen=True)
+class ValidationIssue:
+    """A single structured validation failure"""
+    field: str
+    code: str
+    message: str
+
+def _schema_range(description, default):
+    """Pull an 'a-b' numeric range out of a generator schema description"""
+    match = re.search(r"(-?\d+)\s*-\s*(-?\d+)", str(description))
+    return (int(match.group(1)), int(match.group(2))) if match else default
+
+def _is_int(value):
+    return isinstance(value, int) and not isinstance(value, bool)
+
+def _is_number(value):
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+class MessageValidator:
+    """Validator compiled once from the generator schema
+    
+    Per-field checks are built up front; check() returns a list of
+    ValidationIssue (empty when valid). Results for raw message bytes are
+    kept in an LRU cache keyed by SHA-256, safe to share between daemon threads.
+    """
+    
+    required_fields = ('message_id', 'from', 'to', 'notes', 'velocity', 'channel')
+    
+    def __init__(self, generator_schema=None, cache_size=1024):
+        schema = generator_schema or default_generator_schema
+        velocity_range = _schema_range(schema.get("velocity"), (0, 127))
+        note_channel_range = _schema_range(schema.get("channel"), (0, 15))
+        self.cache_size = cache_size
+        self._cache = OrderedDict()
+        self._cache_lock = threading.Lock()
+        
+        def in_range(low, high):
+            return lambda v: _is_int(v) and low <= v <= high
+        
+        velocity_ok = in_range(*velocity_range)
+        midi_ok = in_range(0, 127)
+        note_channel_ok = in_range(*note_channel_range)
+        
+        def check_note(index, note):
+            where = f"notes[{index}]"
+            if _is_int(note):
+                return [] if midi_ok(note) else [ValidationIssue(where, "range", f"MIDI note {note} outside 0-127")]
+            if not isinstance(note, dict):
+                return [ValidationIssue(where, "type", "note must be a MIDI number or a note object")]
+            issues = []
+            if not (_is_int(note.get("note")) or isinstance(note.get("note"), str)):
+                issues.append(ValidationIssue(f"{where}.note", "type", "note must be a semantic name or MIDI number"))
+            if "octave" in note and not _is_int(note["octave"]):
+                issues.append(ValidationIssue(f"{where}.octave", "type", "octave must be an integer"))
+            if "velocity" in note and not velocity_ok(note["velocity"]):
+                issues.append(ValidationIssue(f"{where}.velocity", "range", f"velocity must be {velocity_range[0]}-{velocity_range[1]}"))
+            if "duration" in note and not (_is_number(note["duration"]) and note["duration"] > 0):
+                issues.append(ValidationIssue(f"{where}.duration", "range", "duration must be a positive number of beats"))
+            if "channel" in note and not note_channel_ok(note["channel"]):
+                issues.append(ValidationIssue(f"{where}.channel", "range", f"channel must be {note_channel_range[0]}-{note_channel_range[1]}"))
+            return issues
+        
+        def check_notes(notes):
+            if not isinstance(notes, list) or not notes:
+                return [ValidationIssue("notes", "type", "notes must be a non-empty list")]
+            return [issue for i, note in enumerate(notes) for issue in check_note(i, note)]
+        
+        def check_cc(cc):
+            if not isinstance(cc, dict):
+                return [ValidationIssue("cc", "type", "cc must be a mapping of controller -> value")]
+            issues = []
+            for controller, value in cc.items():
+                if not (str(controller).isdigit() and 0 <= int(controller) <= 127):
+                    issues.append(ValidationIssue(f"cc.{controller}", "key", "controller must be 0-127"))
+                elif not midi_ok(value):
+                    issues.append(ValidationIssue(f"cc.{controller}", "range", f"CC value {value!r} outside 0-127"))
+            return issues
+        
+        def simple(field, predicate, code, message):
+            return lambda value: [] if predicate(value) else [ValidationIssue(field, code, message)]
+        
+        # field -> check(value) -> [ValidationIssue]; optional fields only run when present
+        self.field_checks = {
+            'message_id': simple('message_id', lambda v: isinstance(v, str) and v != "", "type", "message_id must be a non-empty string"),
+            'from': simple('from', lambda v: v in agents, "agent", f"from must be one of {agents}"),
+            'to': simple('to', lambda v: (v in agents or v == "all") if isinstance(v, str)
+                         else isinstance(v, list) and all(r in agents for r in v), "agent", f"to must be 'all' or agents from {agents}"),
+            'notes': check_notes,
+            'velocity': simple('velocity', velocity_ok, "range", f"velocity must be {velocity_range[0]}-{velocity_range[1]}"),
+            'channel': simple('channel', in_range(1, 16), "range", "channel must be 1-16"),
+            'octave_consciousness': simple('octave_consciousness', _is_int, "type", "octave_consciousness must be an integer"),
+            'duration': simple('duration', lambda v: _is_number(v) and v > 0, "range", "duration must be a positive number of beats"),
+            'cc': check_cc,
+        }
+    
+    def check(self, message_data):
+        """Return a list of ValidationIssue for message_data"""
+        if not isinstance(message_data, dict):
+            return [ValidationIssue("", "type", "message must be a mapping")]
+        issues = [ValidationIssue(field, "missing", f"missing required field '{field}'")
+                  for field in self.required_fields if field not in message_data]
+        for field, check in self.field_checks.items():
+            if field in message_data:
+                issues.extend(check(message_data[field]))
+        return issues
+    
+    def check_bytes(self, raw):
+        """Parse and check raw YAML bytes; returns (digest, issues), cached by digest"""
+        digest = hashlib.sha256(raw).hexdigest()
+        with self._cache_lock:
+            if digest in self._cache:
+                self._cache.move_to_end(digest)
+                return digest, self._cache[digest]
+        
+        try:
+            issues = self.check(yaml.safe_load(raw))
+        except yaml.YAMLError as e:
+            issues = [ValidationIssue("", "parse", str(e).splitlines()[0])]
+        
+        with self._cache_lock:
+            self._cache[digest] = issues
+            if len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return digest, issues
+
+_compiled_validators = {}
+_compiled_validators_lock = threading.Lock()
+
+def get_message_validator(generator_schema=None):
+    """Compile (once per distinct schema) and return a MessageValidator"""
+    key = json.dumps(generator_schema or default_generator_schema, sort_keys=True)
+    with _compiled_validators_lock:
+        if key not in _compiled_validators:
+            _compiled_validators[key] = MessageValidator(generator_schema)
+        return _compiled_validators[key]
+
+def validate_message(message_data, symbol_table, generator_schema=None):
     """Validate message against symbol table and required fields"""
     if not symbol_table:
         print("⚠️ No symbol table available for validation")
         return False
     
-    # Check required fields
-    required_fields = ['message_id', 'from', 'to', 'notes', 'velocity', 'channel']
-    missing_fields = []
+    issues = get_message_validator(generator_schema).check(message_data)
+    if issues:
+        for issue in issues:
+            print(f"❌ {issue.field or 'message'}: {issue.message}")
+        return False
     
-    for field in required_fields:
-        if field not in message_data:
-            missing_fields.append(field)
+    print(f"✅ Message validation passed for {message_data['message_id']}")
+    return True
+
+# === BULK VALIDATION ===
+
+_worker_validator = None
+
+def _init_validation_worker(generator_schema):
+    global _worker_validator
+    _worker_validator = MessageValidator(generator_schema)
+
+def _validate_file_worker(path):
+    try:
+        with open(path, "rb") as f:
+            raw = f.read()
+    except OSError as e:
+        return {"file": path, "sha256": None, "valid": False,
+                "errors": [asdict(ValidationIssue("", "io", str(e)))]}
+    digest, issues = _worker_validator.check_bytes(raw)
+    return {"file": path, "sha256": digest, "valid": not issues, "errors": [asdict(i) for i in issues]}
+
+def _workers_importable():
+    """Whether pool processes can re-import this module to reach the worker functions
     
-    if missing_fields:
-        print(f"❌ Missing required fields: {missing_fields}")
-        return False
+    Loaded by path under its own name (with the dot in 'v1.5'), the module
+    cannot be re-imported by a spawned or forkserver worker.
+    """
+    if __name__ == "__main__":
+        return True
+    # Look the name up on sys.path, not in sys.modules, as a fresh worker would
+    top, _, submodule = __name__.partition(".")
+    spec = importlib.machinery.PathFinder.find_spec(top)
+    return spec is not None and (not submodule or spec.submodule_search_locations is not None)
+
+def validate_directory(directory, generator_schema=None, workers=None, report_path=None, pattern="*.yaml"):
+    """Validate every message under directory across a process pool
     
-    # Validate velocity range
-    velocity = message_data['velocity']
-    if not (0 <= velocity <= 127):
-        print(f"❌ Invalid velocity: {velocity} (must be 0-127)")
-        return False
+    Falls back to a thread pool when worker processes could not import this
+    module. Returns a machine-readable report dict (also written as JSON to
+    report_path if given).
+    """
+    files = sorted(str(f) for f in Path(directory).rglob(pattern) if not f.name.startswith(".temp_"))
+    started = time.perf_counter()
+    
+    if files:
+        chunksize = max(1, len(files) // ((workers or os.cpu_count() or 1) * 4))
+        if _workers_importable():
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_validation_worker,
+                                     initargs=(generator_schema,)) as pool:
+                results = list(pool.map(_validate_file_worker, files, chunksize=chunksize))
+        else:
+            _init_validation_worker(generator_schema)
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                results = list(pool.map(_validate_file_worker, files))
+    else:
+        results = []
     
-    # Validate semantic notes
-    for note in message_data['notes']:
-        meaning = get_semantic_meaning(note, symbol_table)
-        print(f"📝 Note {note}: {meaning}")
+    invalid = [r for r in results if not r["valid"]]
+    report = {
+        "directory": str(directory),
+        "checked": len(results),
+        "valid": len(results) - len(invalid),
+        "invalid": len(invalid),
+        "elapsed_seconds": round(time.perf_counter() - started, 3),
+        "results": results,
+    }
     
-    print(f"✅ Message validation passed for {message_data['message_id']}")
-    return True
+    if report_path:
+        with open(report_path, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"✅ Validation report written to {report_path}")
+    
+    print(f"📋 Validated {report['checked']} messages: {report['valid']} valid, {report['invalid']} invalid")
+    return report
 
 # === ATOMIC MESSAGE OPERATIONS ===
 
@@ -293,8 +507,21 @@ def atomic_write_message(agent, message_data, message_id):
         print(f"❌ Error writing message: {e}")
         return None
 
-def safe_read_message(message_file):
-    """Safely read a message file with retry logic"""
+def safe_read_message(message_file, settle=True):
+    """Safely read a message file with retry logic
+    
+    settle=False skips the stability wait (see read_message_bytes).
+    """
+    if not settle:
+        raw = read_message_bytes(message_file, settle=False)
+        if raw is None:
+            return None
+        try:
+            return yaml.safe_load(raw)
+        except yaml.YAMLError as e:
+            print(f"❌ Could not parse {message_file.name}: {e}")
+            return None
+    
     max_retries = 3
     retry_delay = 0.5
     
@@ -325,35 +552,266 @@ def safe_read_message(message_file):
     
     return None
 
-# === MOVE FUNCTION (Enhanced) ===
+def load_message_file(message_file):
+    """Load a settled message file under a shared lock, without retry delays"""
+    try:
+        with open(message_file, "r") as f:
+            fcntl.flock(f.fileno(), fcntl.LOCK_SH)
+            data = yaml.safe_load(f)
+    except Exception as e:
+        print(f"⚠️ Skipping {Path(message_file).name}: {e}")
+        return None
+    return data if isinstance(data, dict) else None
 
-def move_message(sender, recipient, message_id="0001", symbol_table=None):
-    """Move message from sender outbox to recipient inbox with validation"""
+# === ZERO-COPY ROUTING LAYER ===
+
+# LRU of validation results keyed by (SHA-256 of the raw message bytes,
+# symbol table fingerprint), so fan-out to several inboxes parses and
+# validates a given message only once per symbol table.
+VALIDATION_CACHE_SIZE = 1024
+_validation_cache = OrderedDict()
+_validation_cache_lock = threading.Lock()  # the daemon serves requests on several threads
+
+def _symbol_table_key(symbol_table):
+    """Fingerprint of the symbol table a message was validated against (None for no table)"""
+    if not symbol_table:
+        return None
+    return hashlib.sha256(json.dumps(symbol_table, sort_keys=True, default=str).encode()).hexdigest()
+
+def read_message_bytes(message_file, settle=True):
+    """Read raw message bytes once the file is stable, under a shared lock
+    
+    With settle=False (daemon and CLI operations) the file is stat'ed once
+    and read straight away, with no sleeps; it is re-read only if its size
+    changed while it was being read.
+    """
+    max_retries = 3
+    retry_delay = 0.5
+    
+    for attempt in range(max_retries):
+        try:
+            file_size = message_file.stat().st_size
+            if settle:
+                time.sleep(0.1)
+                if message_file.stat().st_size != file_size:
+                    print(f"⏳ File {message_file.name} still being written, retrying...")
+                    time.sleep(retry_delay)
+                    continue
+            
+            with open(message_file, "rb") as f:
+                fcntl.flock(f.fileno(), fcntl.LOCK_SH)
+                data = f.read()
+            if settle or len(data) == file_size:
+                return data
+            print(f"⏳ File {message_file.name} changed while reading, retrying...")
+                
+        except Exception as e:
+            if attempt < max_retries - 1:
+                print(f"⚠️ Read attempt {attempt + 1} failed, retrying: {e}")
+                if settle:
+                    time.sleep(retry_delay)
+            else:
+                print(f"❌ Failed to read {message_file.name} after {max_retries} attempts: {e}")
+                return None
+    
+    return None
+
+def check_message_bytes(raw, symbol_table=None):
+    """Parse and validate raw message bytes, cached by content hash
+    
+    Returns (digest, message_data, is_valid). message_data is None when the
+    bytes do not parse to a mapping; otherwise it is the caller's own copy, so
+    mutating it cannot alter later cache hits.
+    """
+    digest = hashlib.sha256(raw).hexdigest()
+    key = (digest, _symbol_table_key(symbol_table))
+    with _validation_cache_lock:
+        cached = _validation_cache.get(key)
+        if cached is not None:
+            _validation_cache.move_to_end(key)
+            return digest, copy.deepcopy(cached[0]), cached[1]
+    
+    try:
+        message_data = yaml.safe_load(raw)
+    except yaml.YAMLError as e:
+        print(f"❌ Could not parse message: {e}")
+        message_data = None
+    
+    if not isinstance(message_data, dict):
+        return digest, None, False
+    
+    is_valid = validate_message(message_data, symbol_table) if symbol_table else True
+    with _validation_cache_lock:
+        _validation_cache[key] = (copy.deepcopy(message_data), is_valid)
+        if len(_validation_cache) > VALIDATION_CACHE_SIZE:
+            _validation_cache.popitem(last=False)
+    return digest, message_data, is_valid
+
+def _kernel_copy(copy_chunk, src_fd, dst_fd, size):
+    """Drive an in-kernel copy primitive until size bytes are transferred"""
+    offset = 0
+    while offset < size:
+        sent = copy_chunk(src_fd, dst_fd, offset, size - offset)
+        if sent == 0:
+            break
+        offset += sent
+    return offset == size
+
+def _copy_file_fast(source_file, target_file):
+    """Copy file contents in-kernel where possible (copy_file_range, then sendfile)"""
+    strategies = []
+    if hasattr(os, "copy_file_range"):
+        strategies.append(lambda s, d, off, n: os.copy_file_range(s, d, n, off, off))
+    if hasattr(os, "sendfile"):
+        strategies.append(lambda s, d, off, n: os.sendfile(d, s, off, n))
+    
+    with open(source_file, "rb") as src, open(target_file, "wb") as dst:
+        size = os.fstat(src.fileno()).st_size
+        copied = False
+        
+        for copy_chunk in strategies:
+            try:
+                copied = _kernel_copy(copy_chunk, src.fileno(), dst.fileno(), size)
+            except OSError:
+                copied = False
+            if copied:
+                break
+            dst.seek(0)
+            dst.truncate()
+        
+        if not copied:
+            src.seek(0)
+            shutil.copyfileobj(src, dst)
+    
+    shutil.copystat(source_file, target_file)
+
+def deliver_file(source_file, target_file):
+    """Place source_file at target_file without copying data where possible
+    
+    Hard links are safe here because atomic_write_message always replaces
+    outbox files by rename, never rewriting an existing inode in place.
+    """
+    temp_file = target_file.with_name(f".temp_{target_file.name}")
+    if temp_file.exists():
+        temp_file.unlink()
+    
+    try:
+        os.link(source_file, temp_file)
+        method = "link"
+    except OSError as e:
+        if e.errno not in (errno.EXDEV, errno.EPERM, errno.EMLINK, errno.ENOTSUP, errno.EOPNOTSUPP):
+            raise
+        _copy_file_fast(source_file, temp_file)
+        method = "copy"
+    
+    os.replace(temp_file, target_file)
+    return method
+
+def _prepare_route(sender, message_id, symbol_table=None, settle=True):
+    """Read and validate an outbox message once; returns (source_file, digest)"""
     source_file = outbox_dir / sender / f"{sender.lower()}_{message_id}.yaml"
+    if not source_file.exists():
+        raise FileNotFoundError(f"Message not found: {source_file}")
+    
+    raw = read_message_bytes(source_file, settle)
+    if raw is None:
+        raise ValueError(f"Could not read message: {source_file}")
+    
+    digest, message_data, is_valid = check_message_bytes(raw, symbol_table)
+    if message_data is None:
+        raise ValueError(f"Could not read message: {source_file}")
+    
+    if symbol_table and not is_valid:
+        print(f"⚠️ Message validation failed, but proceeding with move")
+    
+    return source_file, digest
+
+def _deliver_to_inbox(source_file, recipient):
+    """Deliver a prepared message to one inbox; returns (target_file, method)"""
     target_folder = inbox_dir / recipient
     target_folder.mkdir(parents=True, exist_ok=True)
     target_file = target_folder / source_file.name
+    return target_file, deliver_file(source_file, target_file)
 
-    if not source_file.exists():
-        raise FileNotFoundError(f"Message not found: {source_file}")
+def route_message(sender, recipients, message_id="0001", symbol_table=None, settle=True):
+    """Deliver one outbox message to one or many inboxes
+    
+    The source is read and validated once; each recipient then costs a single
+    link (or in-kernel copy across filesystems) plus a rename. Returns a dict
+    of recipient -> delivered path, or None where delivery failed.
+    """
+    if isinstance(recipients, str):
+        recipients = [recipients]
+    
+    source_file, digest = _prepare_route(sender, message_id, symbol_table, settle)
+    
+    results = {}
+    for recipient in recipients:
+        try:
+            target_file, method = _deliver_to_inbox(source_file, recipient)
+            log_message("moved", sender, source_file, f"to {recipient} ({method}, sha256 {digest[:12]})")
+            print(f"✅ Moved {source_file.name} from {sender} to {recipient}")
+            results[recipient] = target_file
+        except Exception as e:
+            print(f"❌ Error moving message to {recipient}: {e}")
+            results[recipient] = None
+    
+    return results
 
-    # Read and validate message before moving
-    message_data = safe_read_message(source_file)
-    if not message_data:
-        raise ValueError(f"Could not read message: {source_file}")
+# === BROADCAST / MULTICAST DELIVERY ===
+
+def resolve_recipients(sender, recipients="all"):
+    """Expand "all" to every council agent except the sender"""
+    if recipients == "all":
+        return [agent for agent in agents if agent != sender]
+    if isinstance(recipients, str):
+        recipients = [r.strip() for r in recipients.split(",") if r.strip()]
     
-    if symbol_table and not validate_message(message_data, symbol_table):
-        print(f"⚠️ Message validation failed, but proceeding with move")
+    unknown = [r for r in recipients if r not in agents]
+    if unknown:
+        raise ValueError(f"Unknown recipients: {unknown}")
+    return list(dict.fromkeys(recipients))
 
-    # Atomic copy operation
-    try:
-        shutil.copy2(source_file, target_file)  # copy2 preserves metadata
-        log_message("moved", sender, source_file, f"to {recipient}")
-        print(f"✅ Moved {source_file.name} from {sender} to {recipient}")
-        return target_file
-    except Exception as e:
-        print(f"❌ Error moving message: {e}")
-        return None
+def broadcast(sender, recipients="all", message_id="0001", symbol_table=None, max_workers=None, settle=True):
+    """Deliver one outbox message to several inboxes in parallel
+    
+    The message is read and validated once, delivered concurrently, and a
+    single aggregated log record is written. Returns a dict of
+    recipient -> {"ok": bool, "path": Path or None, "method"/"error": str}.
+    """
+    recipients = resolve_recipients(sender, recipients)
+    source_file, digest = _prepare_route(sender, message_id, symbol_table, settle)
+    
+    def deliver(recipient):
+        try:
+            target_file, method = _deliver_to_inbox(source_file, recipient)
+            return recipient, {"ok": True, "path": target_file, "method": method}
+        except Exception as e:
+            return recipient, {"ok": False, "path": None, "error": str(e)}
+    
+    results = {}
+    if recipients:
+        with ThreadPoolExecutor(max_workers=max_workers or len(recipients)) as pool:
+            results = dict(pool.map(deliver, recipients))
+    
+    delivered = [r for r in recipients if results[r]["ok"]]
+    failed = [r for r in recipients if not results[r]["ok"]]
+    details = f"to {','.join(delivered) or '-'} | failed {','.join(failed) or '-'} | sha256 {digest[:12]}"
+    log_message("broadcast", sender, source_file, details)
+    
+    for recipient in recipients:
+        if results[recipient]["ok"]:
+            print(f"✅ Broadcast {source_file.name} from {sender} to {recipient}")
+        else:
+            print(f"❌ Broadcast to {recipient} failed: {results[recipient]['error']}")
+    
+    return results
+
+# === MOVE FUNCTION (Enhanced) ===
+
+def move_message(sender, recipient, message_id="0001", symbol_table=None, settle=True):
+    """Move message from sender outbox to recipient inbox with validation"""
+    return route_message(sender, [recipient], message_id, symbol_table, settle)[recipient]
 
 # === INBOX SCANNING ===
 
@@ -386,69 +844,162 @@ def get_latest_message(agent):
 
 # === JSON CONVERSION FUNCTIONS ===
 
-def message_to_json(message_data):
+def message_to_json(message_data, compact=False):
     """Convert message data to JSON with datetime handling"""
     try:
-        # Apply Kai's datetime conversion fix
-        json_safe_data = convert_datetimes(message_data)
-        return json.dumps(json_safe_data, indent=2)
+        if compact:
+            return compact_json_encoder.encode(message_data)
+        return json.dumps(message_data, indent=2, cls=CouncilJSONEncoder)
     except Exception as e:
         print(f"❌ JSON conversion error: {e}")
         return None
 
-def save_message_as_json(message_file, output_file=None):
+def save_message_as_json(message_file, output_file=None, compact=False, settle=True):
     """Convert YAML message to JSON format"""
+    temp_file = None
     try:
-        message_data = safe_read_message(message_file)
+        message_data = safe_read_message(message_file, settle)
         if not message_data:
             return None
         
         if not output_file:
             output_file = message_file.with_suffix('.json')
         
-        json_content = message_to_json(message_data)
-        if json_content:
-            with open(output_file, 'w') as f:
-                f.write(json_content)
-            print(f"✅ JSON saved to {output_file}")
-            return output_file
+        # json.dump streams encoder chunks straight to a temp file, which
+        # replaces the output only once complete
+        temp_file = Path(output_file).with_name(f".temp_{Path(output_file).name}")
+        with open(temp_file, 'w') as f:
+            if compact:
+                json.dump(message_data, f, cls=CouncilJSONEncoder, separators=(",", ":"))
+            else:
+                json.dump(message_data, f, cls=CouncilJSONEncoder, indent=2)
+        os.replace(temp_file, output_file)
+        print(f"✅ JSON saved to {output_file}")
+        return output_file
         
     except Exception as e:
+        if temp_file is not None and temp_file.exists():
+            temp_file.unlink()
         print(f"❌ Error converting to JSON: {e}")
         return None
 
-# === ENHANCED MIDI EXPORT WITH CC EMOTIONAL MAPPING ===
+def save_messages_as_jsonl(source, output_file=None):
+    """Convert a whole inbox (agent name) or directory of YAML messages to one JSON Lines file
+    
+    Messages are streamed one at a time through the compact encoder, so
+    memory stays at one message regardless of inbox size.
+    """
+    source_dir = inbox_dir / source if source in agents else Path(source)
+    if not output_file:
+        output_file = source_dir.parent / f"{source_dir.name.lower()}_messages.jsonl"
+    
+    written = 0
+    temp_file = Path(output_file).with_name(f".temp_{Path(output_file).name}")
+    try:
+        with open(temp_file, "w") as out:
+            for message_file in sorted(source_dir.glob("*.yaml")):
+                if message_file.name.startswith(".temp_"):
+                    continue
+                message_data = load_message_file(message_file)
+                if message_data is None:
+                    continue
+                for chunk in compact_json_encoder.iterencode(message_data):
+                    out.write(chunk)
+                out.write("\n")
+                written += 1
+        os.replace(temp_file, output_file)
+    except Exception as e:
+        if temp_file.exists():
+            temp_file.unlink()
+        print(f"❌ Error writing JSON Lines: {e}")
+        return None
+    
+    print(f"✅ {written} messages saved to {output_file}")
+    return Path(output_file)
 
-def export_message_to_midi(message_data, output_path, generator_schema=None):
-    """Export symbolic message to MIDI with full emotional CC mapping"""
-    mid = MidiFile()
-    track = MidiTrack()
-    mid.tracks.append(track)
+# === MIDI EVENT BUILDER ===
+
+def _clamp_midi(value):
+    return max(0, min(int(value), 127))
+
+class MidiEventBuilder:
+    """Collect events at absolute ticks and emit them as delta-timed track messages
     
-    # Tempo and time signature
-    tempo_bpm = message_data.get("tempo", 86)
-    tempo = bpm2tempo(tempo_bpm)
-    ts = message_data.get("time_signature", "4/4")
-    num, denom = map(int, ts.split("/"))
+    Events are sorted once on drain. At equal ticks note_offs go first and
+    note_ons last, so a repeated pitch retriggers cleanly after its CCs.
+    """
     
-    track.append(MetaMessage("set_tempo", tempo=tempo, time=0))
-    track.append(MetaMessage("time_signature", numerator=num, denominator=denom, time=0))
+    def __init__(self):
+        self.events = []
     
-    # Channel and patch
-    channel = message_data.get("channel", 1) - 1  # MIDI channels are 0-15
-    program = message_data.get("patch", {}).get("program_change", 0)
-    track.append(Message("program_change", program=program, channel=channel, time=0))
+    def add(self, tick, message):
+        if message.type == "note_off":
+            priority = 0
+        elif message.type == "note_on":
+            priority = 2
+        else:
+            priority = 1
+        self.events.append((int(tick), priority, len(self.events), message))
     
-    # Enhanced CC emotional mapping
-    cc_mapping = {
-        1: "modulation (uncertainty/exploration)",
-        71: "resonance (emotional intensity)", 
-        74: "filter cutoff (urgency/clarity)",
-        91: "reverb (contemplative depth)"
-    }
+    def add_note(self, tick, note, velocity, duration, channel):
+        self.add(tick, Message("note_on", note=note, velocity=velocity, channel=channel))
+        self.add(tick + max(1, int(duration)), Message("note_off", note=note, velocity=64, channel=channel))
     
-    # Apply CC messages from generator schema
-    for cc_num, description in cc_mapping.items():
+    def drain_into(self, track, last_tick=0):
+        """Append pending events to track with delta times; returns the new last tick"""
+        self.events.sort(key=lambda event: event[:3])
+        for tick, _, _, message in self.events:
+            tick = max(tick, last_tick)
+            track.append(message.copy(time=tick - last_tick))
+            last_tick = tick
+        self.events = []
+        return last_tick
+
+def message_note_events(message_data, ticks_per_beat=480, symbol_table=None):
+    """Lay out a mailbox message's notes as (start_tick, note, velocity, duration_ticks)
+    
+    Notes start a quarter beat apart and overlap. Entries in 'notes' may be
+    MIDI numbers or generator-schema dicts (note, octave, velocity, duration).
+    Durations are in beats, taken from the per-note dict or the matching
+    'semantic_notes' dict, then a 'durations' list, then 'duration'.
+    """
+    velocity = message_data.get("velocity", 100)
+    stagger = int(message_data.get("stagger", 0.25) * ticks_per_beat)
+    default_duration = message_data.get("duration", 1.0)
+    durations = message_data.get("durations", [])
+    semantic_notes = message_data.get("semantic_notes", [])
+    base_octave = message_data.get("octave_consciousness", 4)
+    
+    events = []
+    for i, entry in enumerate(message_data["notes"]):
+        spec = semantic_notes[i] if i < len(semantic_notes) and isinstance(semantic_notes[i], dict) else {}
+        if isinstance(entry, dict):
+            # Symbolic entry: resolve name/number at its own octave layer
+            spec = {**spec, **entry}
+            note = resolve_semantic_note(spec.get("note", 60), spec.get("octave", base_octave), symbol_table)
+        else:
+            # Already-resolved MIDI number (octave baked in by create_semantic_message)
+            note = entry
+        
+        duration = spec.get("duration", durations[i] if i < len(durations) else default_duration)
+        events.append((i * stagger, _clamp_midi(note), _clamp_midi(spec.get("velocity", velocity)),
+                       max(1, int(float(duration) * ticks_per_beat))))
+    return events
+
+# === ENHANCED MIDI EXPORT WITH CC EMOTIONAL MAPPING ===
+
+# Enhanced CC emotional mapping
+cc_mapping = {
+    1: "modulation (uncertainty/exploration)",
+    71: "resonance (emotional intensity)", 
+    74: "filter cutoff (urgency/clarity)",
+    91: "reverb (contemplative depth)"
+}
+
+def message_cc_values(message_data):
+    """Derive emotional CC values for a message, honouring explicit 'cc' overrides"""
+    values = {}
+    for cc_num in cc_mapping:
         # Default emotional values based on message context
         cc_value = 64  # neutral
         
@@ -465,23 +1016,243 @@ def export_message_to_midi(message_data, output_path, generator_schema=None):
         if "cc" in message_data and str(cc_num) in message_data["cc"]:
             cc_value = message_data["cc"][str(cc_num)]
         
-        track.append(Message("control_change", control=cc_num, value=int(cc_value), channel=channel, time=0))
-        print(f"🎛️ CC{cc_num}: {description} = {cc_value}")
+        values[cc_num] = int(cc_value)
+    return values
+
+# Bump when the rendering below changes so stale cached .mid bytes are ignored
+midi_render_version = "v1.5-export-1"
+
+def render_message_midi(message_data, symbol_table=None):
+    """Render a symbolic message to a MidiFile with full emotional CC mapping"""
+    mid = MidiFile()
+    track = MidiTrack()
+    mid.tracks.append(track)
     
-    # Notes with enhanced timing
-    velocity = message_data.get("velocity", 100)
-    duration_ticks = 480  # Default: 1 beat
+    # Tempo and time signature
+    tempo_bpm = message_data.get("tempo", 86)
+    tempo = bpm2tempo(tempo_bpm)
+    ts = message_data.get("time_signature", "4/4")
+    num, denom = map(int, ts.split("/"))
+    
+    track.append(MetaMessage("set_tempo", tempo=tempo, time=0))
+    track.append(MetaMessage("time_signature", numerator=num, denominator=denom, time=0))
     
-    for i, note in enumerate(message_data["notes"]):
-        # Stagger notes slightly for more natural feel
-        note_start_time = i * 120  # 0.25 beat offset
-        track.append(Message("note_on", note=note, velocity=velocity, channel=channel, time=note_start_time))
-        track.append(Message("note_off", note=note, velocity=64, channel=channel, time=duration_ticks))
+    # Channel and patch
+    channel = message_data.get("channel", 1) - 1  # MIDI channels are 0-15
+    program = message_data.get("patch", {}).get("program_change", 0)
+    track.append(Message("program_change", program=program, channel=channel, time=0))
     
-    mid.save(output_path)
+    # Apply CC messages from generator schema
+    for cc_num, cc_value in message_cc_values(message_data).items():
+        track.append(Message("control_change", control=cc_num, value=cc_value, channel=channel, time=0))
+        print(f"🎛️ CC{cc_num}: {cc_mapping[cc_num]} = {cc_value}")
+    
+    # Notes staggered a quarter beat apart, scheduled at absolute ticks
+    builder = MidiEventBuilder()
+    for start, note, velocity, duration in message_note_events(message_data, mid.ticks_per_beat, symbol_table):
+        builder.add_note(start, note, velocity, duration, channel)
+    builder.drain_into(track)
+    return mid
+
+def render_message_midi_bytes(message_data, symbol_table=None, use_cache=True):
+    """Standard MIDI File bytes for a message, served from the render cache when unchanged"""
+    def render():
+        buffer = io.BytesIO()
+        render_message_midi(message_data, symbol_table).save(file=buffer)
+        return buffer.getvalue()
+    
+    if not use_cache:
+        return render()
+    # Symbolic note names resolve through the symbol table, so it is part of the key.
+    # A whole SMF render costs far more than reading it back, so it also persists on disk
+    payload = {"message": message_data, "symbol_table": symbol_table}
+    return get_render_cache(render_cache_dir).get_or_render(payload, render, midi_render_version)
+
+def export_message_to_midi(message_data, output_path, generator_schema=None, symbol_table=None, use_cache=True):
+    """Export symbolic message to MIDI with full emotional CC mapping"""
+    data = render_message_midi_bytes(message_data, symbol_table, use_cache)
+    temp_path = Path(f"{output_path}.tmp")
+    temp_path.write_bytes(data)
+    os.replace(temp_path, output_path)
     print(f"✅ Enhanced MIDI exported to {output_path}")
     return output_path
 
+# === CONVERSATION EXPORT (MULTI-TRACK SMF) ===
+
+def message_agent(message_data):
+    """Agent name for v1.5 mailbox messages ('from') or harmonic messages ('identity')"""
+    agent = message_data.get("from") or message_data.get("identity") or "Unknown"
+    return agent.capitalize() if agent.lower() in (a.lower() for a in agents) else agent
+
+def conversation_note_events(message_data, ticks_per_beat=480, tempo_bpm=86, symbol_table=None):
+    """Lay out a message's notes as (start_tick, note, velocity, duration_ticks)"""
+    if "notes" in message_data:
+        return message_note_events(message_data, ticks_per_beat, symbol_table)
+    
+    # Harmonic consciousness_message: oscillators played in turn, 0.4s each
+    hold = int(0.4 * ticks_per_beat * tempo_bpm / 60)
+    oscillators = message_data.get("consciousness_message", {}).get("oscillators", [])
+    return [(i * hold, osc.get("pitch", 60), _clamp_midi(osc.get("amplitude", 100) / 100 * 127), hold)
+            for i, osc in enumerate(oscillators)]
+
+def conversation_cc_values(message_data):
+    """CC values a message implies: emotional CCs or harmonic envelope CCs
+    
+    Envelope CCs come from the harmonic pipeline's own mapping, so an exported
+    conversation carries the values that were played live.
+    """
+    if "notes" in message_data:
+        return message_cc_values(message_data)
+    return envelope_cc_values(message_data.get("consciousness_message", {}).get("envelope", {}))
+
+def _message_sequence(message_data, source_name=""):
+    if "sequence" in message_data:
+        return int(message_data["sequence"])
+    for candidate in (source_name, str(message_data.get("message_id", ""))):
+        match = re.search(r"(\d+)(?:\.\w+)?$", candidate)
+        if match:
+            return int(match.group(1))
+    return 0
+
+def _message_timestamp(message_data, fallback=0.0):
+    stamp = message_data.get("timestamp")
+    if isinstance(stamp, datetime.datetime):
+        return stamp.timestamp()
+    if isinstance(stamp, str):
+        try:
+            return datetime.datetime.fromisoformat(stamp.rstrip("Z")).timestamp()
+        except ValueError:
+            pass
+    return fallback
+
+def order_conversation(message_files, order="sequence"):
+    """Load message files and return [(path, message_data)] in conversation order"""
+    loaded = []
+    for path in message_files:
+        path = Path(path)
+        data = load_message_file(path)
+        if data is not None:
+            loaded.append((path, data))
+    
+    def agent_rank(data):
+        agent = message_agent(data)
+        return agents.index(agent) if agent in agents else len(agents)
+    
+    if order == "timestamp":
+        key = lambda item: (_message_timestamp(item[1], item[0].stat().st_mtime), agent_rank(item[1]))
+    else:
+        key = lambda item: (_message_sequence(item[1], item[0].name), agent_rank(item[1]))
+    return sorted(loaded, key=key)
+
+class ConversationMidiWriter:
+    """Merge a conversation into one type-1 SMF with one track per agent
+    
+    Tempo and time signature are written once to a conductor track. Program
+    changes and CCs are only emitted when an agent's value actually changes.
+    Messages can be added as they arrive; flush() rewrites the whole file
+    atomically so the archive on disk is always a complete SMF.
+    """
+    
+    def __init__(self, output_path, tempo_bpm=86, time_signature="4/4", gap_beats=1.0, symbol_table=None):
+        self.output_path = Path(output_path)
+        self.tempo_bpm = tempo_bpm
+        self.symbol_table = symbol_table  # resolves symbolic note names, as in single-message export
+        self.mid = MidiFile(type=1)
+        self.ticks_per_beat = self.mid.ticks_per_beat
+        self.gap_ticks = int(gap_beats * self.ticks_per_beat)
+        
+        num, denom = map(int, time_signature.split("/"))
+        conductor = MidiTrack()
+        conductor.append(MetaMessage("track_name", name="AI Council", time=0))
+        conductor.append(MetaMessage("set_tempo", tempo=bpm2tempo(tempo_bpm), time=0))
+        conductor.append(MetaMessage("time_signature", numerator=num, denominator=denom, time=0))
+        self.mid.tracks.append(conductor)
+        
+        self.cursor = 0
+        self.message_count = 0
+        self._tracks = {}       # agent -> [track, last_tick]
+        self._cc_state = {}     # agent -> {(channel, control): value}
+        self._programs = {}     # agent -> {channel: program}
+    
+    def _agent_track(self, agent):
+        if agent not in self._tracks:
+            track = MidiTrack()
+            track.append(MetaMessage("track_name", name=agent, time=0))
+            self.mid.tracks.append(track)
+            self._tracks[agent] = [track, 0]
+            self._cc_state[agent] = {}
+            self._programs[agent] = {}
+        return self._tracks[agent]
+    
+    def add_message(self, message_data):
+        """Append one message at the conversation cursor on its agent's track"""
+        agent = message_agent(message_data)
+        track_state = self._agent_track(agent)
+        channel = message_data.get("channel", agent_channels.get(agent, 1))
+        channel = max(0, min(int(channel) - 1, 15)) if isinstance(channel, int) else 0
+        
+        builder = MidiEventBuilder()
+        start = self.cursor
+        
+        program = message_data.get("patch", {}).get("program_change")
+        if program is not None and self._programs[agent].get(channel) != program:
+            builder.add(start, Message("program_change", program=program, channel=channel))
+            self._programs[agent][channel] = program
+        
+        cc_state = self._cc_state[agent]
+        for cc_num, value in conversation_cc_values(message_data).items():
+            if cc_state.get((channel, cc_num)) != value:
+                builder.add(start, Message("control_change", control=cc_num, value=value, channel=channel))
+                cc_state[(channel, cc_num)] = value
+        
+        end = start
+        for offset, note, velocity, duration in conversation_note_events(
+                message_data, self.ticks_per_beat, self.tempo_bpm, self.symbol_table):
+            builder.add_note(start + offset, _clamp_midi(note), _clamp_midi(velocity), duration, channel)
+            end = max(end, start + offset + duration)
+        
+        track_state[1] = builder.drain_into(track_state[0], track_state[1])
+        self.cursor = end + self.gap_ticks
+        self.message_count += 1
+        return start
+    
+    def add_file(self, message_file):
+        """Load a message file and append it; returns False if it could not be read"""
+        ordered = order_conversation([message_file])
+        if not ordered:
+            return False
+        self.add_message(ordered[0][1])
+        return True
+    
+    def flush(self):
+        """Rewrite the whole conversation file atomically
+        
+        Every agent track grows as messages arrive, so a type-1 SMF cannot be
+        appended in place: each flush re-serializes the full conversation.
+        Flush once per batch of messages rather than after each one.
+        """
+        self.output_path.parent.mkdir(parents=True, exist_ok=True)
+        temp_file = self.output_path.with_name(f".temp_{self.output_path.name}")
+        self.mid.save(str(temp_file))
+        os.replace(temp_file, self.output_path)
+        return self.output_path
+
+def export_conversation_to_midi(source, output_path, order="sequence", tempo_bpm=86, time_signature="4/4",
+                                symbol_table=None):
+    """Export a whole conversation (directory or list of files) to one multi-track .mid"""
+    if isinstance(source, (str, Path)) and Path(source).is_dir():
+        message_files = [f for f in Path(source).glob("*.yaml") if not f.name.startswith(".temp_")]
+    else:
+        message_files = source
+    
+    writer = ConversationMidiWriter(output_path, tempo_bpm, time_signature, symbol_table=symbol_table)
+    for _, message_data in order_conversation(message_files, order):
+        writer.add_message(message_data)
+    writer.flush()
+    
+    print(f"✅ Exported {writer.message_count} messages on {len(writer.mid.tracks) - 1} agent tracks to {output_path}")
+    return writer
+
 # === ENHANCED UTILITY FUNCTIONS ===
 
 def create_semantic_message(sender, recipient, message_id, semantic_notes, octave=4, velocity=110, symbol_table=None):
@@ -489,9 +1260,12 @@ def create_semantic_message(sender, recipient, message_id, semantic_notes, octav
     # Resolve semantic notes to MIDI numbers
     midi_notes = []
     for note in semantic_notes:
-        midi_note = resolve_semantic_note(note, octave, symbol_table)
+        # Entries may be plain names or dicts carrying their own octave/duration
+        name = note.get("note") if isinstance(note, dict) else note
+        note_octave = note.get("octave", octave) if isinstance(note, dict) else octave
+        midi_note = resolve_semantic_note(name, note_octave, symbol_table)
         midi_notes.append(midi_note)
-        print(f"🎵 {note} (octave {octave}) → MIDI {midi_note}")
+        print(f"🎵 {name} (octave {note_octave}) → MIDI {midi_note}")
     
     message_data = {
         'message_id': f"{sender.lower()}_{message_id}",
@@ -500,7 +1274,7 @@ def create_semantic_message(sender, recipient, message_id, semantic_notes, octav
         'timestamp': datetime.datetime.now().isoformat() + "Z",
         'notes': midi_notes,
         'velocity': velocity,
-        'channel': {'Kai': 1, 'Claude': 2, 'Perplexity': 3, 'Grok': 4}.get(sender, 1),
+        'channel': agent_channels.get(sender, 1),
         'group_id': 'UMP_GROUP_001',
         'octave_consciousness': octave,
         'semantic_notes': semantic_notes,
@@ -515,7 +1289,7 @@ def create_semantic_message(sender, recipient, message_id, semantic_notes, octav
             '71': velocity,  # intensity
             '1': 40    # slight uncertainty
         },
-        'human_readable': f'Semantic message: {", ".join(semantic_notes)} from {sender} to {recipient}'
+        'human_readable': f'Semantic message: {", ".join(str(n.get("note") if isinstance(n, dict) else n) for n in semantic_notes)} from {sender} to {recipient}'
     }
     return message_data
 
@@ -528,7 +1302,7 @@ def create_sample_message(sender, recipient, message_id, notes, velocity=110):
         'timestamp': datetime.datetime.now().isoformat() + "Z",
         'notes': notes,
         'velocity': velocity,
-        'channel': {'Kai': 1, 'Claude': 2, 'Perplexity': 3, 'Grok': 4}.get(sender, 1),
+        'channel': agent_channels.get(sender, 1),
         'group_id': 'UMP_GROUP_001',
         'context': {
             'intent': 'test_message',
@@ -539,15 +1313,22 @@ def create_sample_message(sender, recipient, message_id, notes, velocity=110):
     }
     return message_data
 
+def collect_system_status():
+    """Inbox/outbox message counts per agent"""
+    status = {}
+    for agent in agents:
+        inbox_count = len(list((inbox_dir / agent).glob("*.yaml"))) if (inbox_dir / agent).exists() else 0
+        outbox_count = len(list((outbox_dir / agent).glob("*.yaml"))) if (outbox_dir / agent).exists() else 0
+        status[agent] = {"inbox": inbox_count, "outbox": outbox_count}
+    return status
+
 def show_system_status():
     """Display system status and statistics"""
     print(f"\n📊 AI COUNCIL SYMBOLIC MIDI SYSTEM v1.5")
     print("=" * 60)
     
-    for agent in agents:
-        inbox_count = len(list((inbox_dir / agent).glob("*.yaml"))) if (inbox_dir / agent).exists() else 0
-        outbox_count = len(list((outbox_dir / agent).glob("*.yaml"))) if (outbox_dir / agent).exists() else 0
-        print(f"{agent}: 📥 {inbox_count} inbox | 📤 {outbox_count} outbox")
+    for agent, counts in collect_system_status().items():
+        print(f"{agent}: 📥 {counts['inbox']} inbox | 📤 {counts['outbox']} outbox")
     
     # Show recent log entries
     log_file = logs_dir / "symbolic_midi_log.txt"
@@ -695,7 +1476,7 @@ def main():
                 if message_data:
                     midi_path = message_file.with_suffix('.mid')
                     try:
-                        export_message_to_midi(message_data, midi_path, generator_schema)
+                        export_message_to_midi(message_data, midi_path, generator_schema, symbol_table)
                         print(f"✅ Enhanced MIDI export successful: {midi_path}")
                     except Exception as e:
                         print(f"❌ MIDI export failed: {e}")
@@ -727,20 +1508,282 @@ def main():
         else:
             print("❌ Invalid choice")
 
+# === NON-INTERACTIVE OPERATIONS ===
+
+daemon_socket_path = root_dir / "council_midi.sock"
+
+def find_message_file(target, agent=None):
+    """Resolve a message path, or an (agent, message ID) pair via inbox then outbox"""
+    path = Path(target)
+    if path.exists():
+        return path
+    if agent:
+        message_file = inbox_dir / agent / f"{agent.lower()}_{target}.yaml"
+        if not message_file.exists():
+            message_file = outbox_dir / agent / f"{agent.lower()}_{target}.yaml"
+        if message_file.exists():
+            return message_file
+        # Delivered messages keep the sender's name in an agent's inbox
+        delivered = sorted((inbox_dir / agent).glob(f"*_{target}.yaml"))
+        if delivered:
+            return delivered[0]
+    raise FileNotFoundError(f"Message file not found: {target}")
+
+def _jsonable(value):
+    if isinstance(value, Path):
+        return str(value)
+    if isinstance(value, dict):
+        return {str(k): _jsonable(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_jsonable(v) for v in value]
+    return value
+
+class CouncilOperations:
+    """Mailbox operations with the symbol table and generator schema kept loaded
+    
+    Each operation takes keyword arguments and returns JSON-friendly data;
+    errors are raised. Shared by the subcommand CLI and the daemon. Message
+    files are read without the settling sleeps of the interactive menu.
+    """
+    
+    def __init__(self, symbol_table, generator_schema):
+        self.symbol_table = symbol_table
+        self.generator_schema = generator_schema
+        self.validator = get_message_validator(generator_schema)
+        self.handlers = {
+            "status": self.status,
+            "scan": self.scan,
+            "move": self.move,
+            "broadcast": self.broadcast,
+            "create": self.create,
+            "validate": self.validate,
+            "to-json": self.to_json,
+            "to-jsonl": self.to_jsonl,
+            "export": self.export,
+        }
+    
+    def status(self):
+        return collect_system_status()
+    
+    def scan(self, agent):
+        return [m.name for m in scan_inbox(agent)]
+    
+    def move(self, sender, recipient, message_id="0001"):
+        return move_message(sender, recipient, message_id, self.symbol_table, settle=False)
+    
+    def broadcast(self, sender, recipients="all", message_id="0001"):
+        return broadcast(sender, recipients, message_id, self.symbol_table, settle=False)
+    
+    def create(self, sender, recipient, message_id, notes, octave=4, velocity=110):
+        if isinstance(notes, str):
+            notes = [note.strip() for note in notes.split(",") if note.strip()]
+        message_data = create_semantic_message(sender, recipient, message_id, notes, octave, velocity, self.symbol_table)
+        issues = self.validator.check(message_data)
+        if issues:
+            return {"written": None, "errors": [asdict(i) for i in issues]}
+        return {"written": atomic_write_message(sender, message_data, message_id), "errors": []}
+    
+    def validate(self, target=None, agent=None, directory=None, workers=None):
+        if directory:
+            return validate_directory(directory, self.generator_schema, workers)
+        with open(find_message_file(target, agent), "rb") as f:
+            digest, issues = self.validator.check_bytes(f.read())
+        return {"sha256": digest, "valid": not issues, "errors": [asdict(i) for i in issues]}
+    
+    def to_json(self, target, agent=None, output=None, compact=False):
+        return save_message_as_json(find_message_file(target, agent), output, compact, settle=False)
+    
+    def to_jsonl(self, source, output=None):
+        return save_messages_as_jsonl(source, output)
+    
+    def export(self, target, agent=None, output=None, output_dir=None, no_cache=False):
+        message_file = find_message_file(target, agent)
+        message_data = safe_read_message(message_file, settle=False)
+        if not message_data:
+            raise ValueError(f"Could not read message: {message_file}")
+        if not output:
+            out_dir = Path(output_dir) if output_dir else message_file.parent
+            out_dir.mkdir(parents=True, exist_ok=True)
+            output = out_dir / message_file.with_suffix('.mid').name
+        return export_message_to_midi(message_data, output, self.generator_schema, self.symbol_table,
+                                      use_cache=not no_cache)
+    
+    def run(self, request):
+        """Execute one {"op": ..., "args": {...}} request; never raises"""
+        handler = self.handlers.get(request.get("op")) if isinstance(request, dict) else None
+        if handler is None:
+            return {"ok": False, "error": f"unknown operation: {request!r}"}
+        try:
+            return {"ok": True, "result": _jsonable(handler(**request.get("args", {})))}
+        except Exception as e:
+            return {"ok": False, "error": str(e)}
+
+# === DAEMON MODE ===
+
+def serve_daemon(operations, socket_path=None):
+    """Serve batched JSON requests on a local Unix socket
+    
+    Each line received is one request object or a JSON array of them; the
+    reply is one line holding the matching response (or array of responses).
+    Connections may stay open for many requests.
+    """
+    socket_path = Path(socket_path or daemon_socket_path)
+    if socket_path.exists():
+        if daemon_running(socket_path):
+            raise RuntimeError(f"A daemon is already listening on {socket_path}")
+        socket_path.unlink()  # stale socket left by a daemon that did not shut down
+    
+    class Handler(socketserver.StreamRequestHandler):
+        def handle(self):
+            for line in self.rfile:
+                if not line.strip():
+                    continue
+                try:
+                    request = json.loads(line)
+                    if isinstance(request, list):
+                        response = [operations.run(r) for r in request]
+                    else:
+                        response = operations.run(request)
+                except json.JSONDecodeError as e:
+                    response = {"ok": False, "error": f"invalid JSON: {e}"}
+                self.wfile.write(compact_json_encoder.encode(response).encode() + b"\n")
+                self.wfile.flush()
+    
+    with socketserver.ThreadingUnixStreamServer(str(socket_path), Handler) as daemon:
+        daemon.daemon_threads = True
+        print(f"🛰️ AI Council MIDI daemon listening on {socket_path}")
+        try:
+            daemon.serve_forever()
+        except KeyboardInterrupt:
+            print("🛑 Daemon stopped.")
+        finally:
+            if socket_path.exists():
+                socket_path.unlink()
+
+def daemon_running(socket_path=None):
+    """True if a daemon accepts connections on the socket"""
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as probe:
+        try:
+            probe.connect(str(socket_path or daemon_socket_path))
+            return True
+        except OSError:
+            return False
+
+def daemon_request(requests, socket_path=None):
+    """Send one request (dict) or a batch (list) to a running daemon"""
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+        client.connect(str(socket_path or daemon_socket_path))
+        client.sendall(json.dumps(requests).encode() + b"\n")
+        with client.makefile("rb") as reply:
+            return json.loads(reply.readline())
+
+# === COMMAND LINE ===
+
+def build_arg_parser():
+    parser = argparse.ArgumentParser(description="AI Council Protocol v1.0 - Enhanced Symbolic MIDI Interface")
+    sub = parser.add_subparsers(dest="command")
+    
+    sub.add_parser("status", help="Show inbox/outbox counts per agent")
+    
+    p = sub.add_parser("scan", help="List messages in an agent's inbox")
+    p.add_argument("agent", choices=agents)
+    
+    p = sub.add_parser("move", help="Move a message from sender outbox to recipient inbox")
+    p.add_argument("sender", choices=agents)
+    p.add_argument("recipient", choices=agents)
+    p.add_argument("message_id", nargs="?", default="0001")
+    
+    p = sub.add_parser("broadcast", help="Deliver a message to several inboxes")
+    p.add_argument("sender", choices=agents)
+    p.add_argument("message_id")
+    p.add_argument("--to", dest="recipients", default="all", help="'all' or comma-separated agents")
+    
+    p = sub.add_parser("create", help="Create a semantic message in the sender's outbox")
+    p.add_argument("sender", choices=agents)
+    p.add_argument("recipient", choices=agents)
+    p.add_argument("message_id")
+    p.add_argument("notes", help="Comma-separated semantic notes, e.g. Origin,Reflection")
+    p.add_argument("--octave", type=int, default=4)
+    p.add_argument("--velocity", type=int, default=110)
+    
+    p = sub.add_parser("validate", help="Validate a message file, agent message ID or directory")
+    p.add_argument("target", nargs="?")
+    p.add_argument("--agent", choices=agents)
+    p.add_argument("--dir", dest="directory")
+    p.add_argument("--workers", type=int)
+    
+    p = sub.add_parser("to-json", help="Convert a message to JSON")
+    p.add_argument("target")
+    p.add_argument("--agent", choices=agents)
+    p.add_argument("-o", "--output")
+    p.add_argument("--compact", action="store_true", help="No indentation, for machine consumers")
+    
+    p = sub.add_parser("to-jsonl", help="Convert an inbox or directory to one JSON Lines file")
+    p.add_argument("source", help="Agent name (their inbox) or a directory")
+    p.add_argument("-o", "--output")
+    
+    for name in ("export", "generate"):
+        p = sub.add_parser(name, help="Export a message to MIDI")
+        p.add_argument("target")
+        p.add_argument("--agent", choices=agents)
+        p.add_argument("-o", "--output")
+        p.add_argument("--output-dir")
+        p.add_argument("--no-cache", action="store_true", help="Re-render even if the message is unchanged")
+    
+    p = sub.add_parser("serve", help="Run the resident daemon on a local socket")
+    p.add_argument("--socket", default=str(daemon_socket_path))
+    
+    sub.add_parser("interactive", help="Interactive menu (default)")
+    return parser
+
+def cli(argv=None):
+    """Entry point for the subcommand CLI; returns a process exit code"""
+    argv = sys.argv[1:] if argv is None else argv
+    
+    # Legacy form: <sender> <recipient> <message_id>
+    if len(argv) >= 3 and argv[0] in agents:
+        argv = ["move"] + argv[:3]
+    
+    args = build_arg_parser().parse_args(argv)
+    if args.command in (None, "interactive"):
+        main()
+        return 0
+    
+    # Keep stdout for the JSON result; progress messages go to stderr (the daemon logs to stdout)
+    progress = contextlib.nullcontext if args.command == "serve" else lambda: contextlib.redirect_stdout(sys.stderr)
+    with progress():
+        ensure_directory_structure()
+        operations = CouncilOperations(load_symbol_table(symbol_table_path),
+                                       load_generator_schema(generator_schema_path))
+    
+    if args.command == "serve":
+        serve_daemon(operations, args.socket)
+        return 0
+    
+    op = "export" if args.command == "generate" else args.command
+    fields = {k: v for k, v in vars(args).items() if k != "command" and v is not None}
+    if op == "validate" and not (fields.get("target") or fields.get("directory")):
+        print("❌ validate needs a message path/ID or --dir")
+        return 2
+    
+    with progress():
+        response = operations.run({"op": op, "args": fields})
+    if not response["ok"]:
+        print(f"❌ {response['error']}", file=sys.stderr)
+        return 1
+    
+    result = response["result"]
+    print(json.dumps(result, indent=2))
+    if op == "validate":
+        passed = result["invalid"] == 0 if "directory" in fields else result["valid"]
+        return 0 if passed else 1
+    if op == "create" and result["errors"]:
+        return 1
+    return 0
+
 if __name__ == "__main__":
-    # Quick test if run directly
     try:
-        ensure_directory_structure()
-        symbol_table = load_symbol_table(symbol_table_path)
-        generator_schema = load_generator_schema(generator_schema_path)
-        
-        # Test move if arguments provided
-        import sys
-        if len(sys.argv) >= 4:
-            sender, recipient, message_id = sys.argv[1], sys.argv[2], sys.argv[3]
-            move_message(sender, recipient, message_id, symbol_table)
-        else:
-            main()
-            
+        sys.exit(cli())
     except Exception as e:
-        print(f"❌ Error: {e}")
\ No newline at end of file
+        print(f"❌ Error: {e}")
+        sys.exit(1)
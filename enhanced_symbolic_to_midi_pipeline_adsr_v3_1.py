@@ -4,7 +4,7 @@ import mido
 import yaml
 import time
 import sys
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 # MIDI CC constants for envelope shaping
 CC_ATTACK = 28
@@ -15,6 +15,9 @@ CC_RELEASE = 31
 # Default MIDI port name
 DEFAULT_MIDI_PORT = "IAC Driver Ai Council MIDI"
 
+# How long each oscillator note is held
+NOTE_HOLD_SECONDS = 0.4
+
 def clamp_midi(val: float) -> int:
     """Clamp a value to the valid MIDI range [0, 127]."""
     return max(0, min(int(val), 127))
@@ -35,21 +38,36 @@ def open_midi_port(name: str = DEFAULT_MIDI_PORT):
             return mido.open_output(port)
     raise Exception(f"MIDI port '{name}' not found. Available: {available}")
 
-def send_signature_pulse(pulse: Dict[str, Any], outport, force: bool = False) -> None:
+def play_events(events: List[Tuple[float, mido.Message]], outport, speed: float = 1.0) -> None:
     """
-    Send a signature pulse as a series of MIDI note and CC events.
+    Send (offset_seconds, message) events, sleeping until each absolute offset.
     Args:
-        pulse: Dictionary containing pattern, cc_signature, confidence_modulation, envelope, and channel.
+        events: Events sorted by offset from the start of the phrase.
         outport: mido output port to send messages to.
+        speed: Playback speed factor; 0 sends everything immediately.
+    """
+    start = time.perf_counter()
+    for offset, message in events:
+        if speed > 0:
+            delay = offset / speed - (time.perf_counter() - start)
+            if delay > 0:
+                time.sleep(delay)
+        outport.send(message)
+
+def signature_pulse_events(pulse: Dict[str, Any], force: bool = False) -> List[Tuple[float, mido.Message]]:
+    """
+    Build the timed MIDI events for a signature pulse (empty if channel 16 is not forced).
+    Args:
+        pulse: Dictionary containing pattern, cc_signature, confidence_modulation, envelope, and channel.
         force: If True, override channel 16 warning.
     """
     channel = pulse.get("channel", 15)
     if not force and channel == 15:  # MIDI channels are 0-based; 15 is channel 16
-        print("⚠️ Channel 16 may be in use. Skipping signature unless forced.")
-        return
+        return []
 
     conf = pulse.get("confidence_modulation", {})
-    env = pulse.get("envelope", {})
+    events = []
+    t = 0.0
 
     for note_event in pulse.get("pattern", []):
         note = note_event["note"]
@@ -57,28 +75,33 @@ def send_signature_pulse(pulse: Dict[str, Any], outport, force: bool = False) ->
         duration = note_event.get("duration", 0.3)
         delay = conf.get("timing_offset", 0.0)
 
-        outport.send(mido.Message("note_on", note=note, velocity=velocity, channel=channel))
-        # This timing is not sample-accurate; for critical timing, consider a scheduling library
-        time.sleep(max(0.01, duration + delay))
-        outport.send(mido.Message("note_off", note=note, velocity=0, channel=channel))
+        events.append((t, mido.Message("note_on", note=note, velocity=velocity, channel=channel)))
+        t += max(0.01, duration + delay)
+        events.append((t, mido.Message("note_off", note=note, velocity=0, channel=channel)))
 
     for cc in pulse.get("cc_signature", []):
-        outport.send(mido.Message("control_change", control=cc["controller"], value=cc["value"], channel=channel))
+        events.append((t, mido.Message("control_change", control=cc["controller"], value=cc["value"], channel=channel)))
+    return events
 
-def send_consciousness_message(msg: Dict[str, Any], outport) -> None:
+def send_signature_pulse(pulse: Dict[str, Any], outport, force: bool = False) -> None:
     """
-    Send a 'consciousness message' as a series of MIDI envelope and note events.
+    Send a signature pulse as a series of MIDI note and CC events.
     Args:
-        msg: Dictionary containing 'identity' and 'consciousness_message' keys.
+        pulse: Dictionary containing pattern, cc_signature, confidence_modulation, envelope, and channel.
         outport: mido output port to send messages to.
+        force: If True, override channel 16 warning.
     """
-    agent = msg.get("identity", "").lower()
-    channel_map = {"kai": 0, "claude": 1, "perplexity": 2, "grok": 3}
-    channel = channel_map.get(agent, 0)
-
-    cmsg = msg.get("consciousness_message", {})
-    env = cmsg.get("envelope", {})
+    if not force and pulse.get("channel", 15) == 15:
+        print("⚠️ Channel 16 may be in use. Skipping signature unless forced.")
+        return
+    play_events(signature_pulse_events(pulse, force), outport)
 
+def envelope_cc_values(env: Dict[str, Any]) -> Dict[int, int]:
+    """
+    Map a consciousness_message envelope to envelope CC values (missing stages get musical defaults).
+    Args:
+        env: Dictionary with optional 'attack', 'decay', 'sustain' and 'release' keys.
+    """
     # Provide more musical defaults
     sustain = env.get("sustain", 0.7)
     attack = env.get("attack", 0.01)
@@ -87,23 +110,63 @@ def send_consciousness_message(msg: Dict[str, Any], outport) -> None:
 
     sustain_val = clamp_midi(sustain * 127) if sustain <= 1.0 else clamp_midi(sustain)
 
-    cc_map = {
+    return {
         CC_ATTACK: clamp_midi(attack * 127),
         CC_DECAY: clamp_midi(decay * 127),
         CC_SUSTAIN: sustain_val,
         CC_RELEASE: clamp_midi(release * 127)
     }
 
-    # Send envelope CCs
-    for cc, value in cc_map.items():
-        outport.send(mido.Message("control_change", control=cc, value=value, channel=channel))
+def consciousness_message_events(msg: Dict[str, Any]) -> List[Tuple[float, mido.Message]]:
+    """
+    Build the timed MIDI events for a 'consciousness message': envelope CCs, then each
+    oscillator held for NOTE_HOLD_SECONDS in turn.
+    Args:
+        msg: Dictionary containing 'identity' and 'consciousness_message' keys.
+    """
+    agent = msg.get("identity", "").lower()
+    channel_map = {"kai": 0, "claude": 1, "perplexity": 2, "grok": 3}
+    channel = channel_map.get(agent, 0)
+
+    cmsg = msg.get("consciousness_message", {})
+    cc_map = envelope_cc_values(cmsg.get("envelope", {}))
+
+    # Envelope CCs first
+    events = [(0.0, mido.Message("control_change", control=cc, value=value, channel=channel))
+              for cc, value in cc_map.items()]
 
+    t = 0.0
     for osc in cmsg.get("oscillators", []):
         note = osc.get("pitch", 60)
         amp = clamp_midi((osc.get("amplitude", 100) / 100) * 127)
-        outport.send(mido.Message("note_on", note=note, velocity=amp, channel=channel))
-        time.sleep(0.4)
-        outport.send(mido.Message("note_off", note=note, velocity=0, channel=channel))
+        events.append((t, mido.Message("note_on", note=note, velocity=amp, channel=channel)))
+        t += NOTE_HOLD_SECONDS
+        events.append((t, mido.Message("note_off", note=note, velocity=0, channel=channel)))
+    return events
+
+def send_consciousness_message(msg: Dict[str, Any], outport) -> None:
+    """
+    Send a 'consciousness message' as a series of MIDI envelope and note events.
+    Args:
+        msg: Dictionary containing 'identity' and 'consciousness_message' keys.
+        outport: mido output port to send messages to.
+    """
+    play_events(consciousness_message_events(msg), outport)
+
+def message_events(message: Dict[str, Any], force_signature: bool = False) -> List[Tuple[float, mido.Message]]:
+    """
+    Build all timed events for one message: the optional signature pulse, then the message.
+    Args:
+        message: Dictionary containing 'identity', 'consciousness_message' and optionally 'signature_pulse'.
+        force_signature: If True, include a signature pulse on channel 16.
+    """
+    events = []
+    offset = 0.0
+    if "signature_pulse" in message:
+        events = signature_pulse_events(message["signature_pulse"], force_signature)
+        offset = events[-1][0] if events else 0.0
+    events += [(offset + t, m) for t, m in consciousness_message_events(message)]
+    return events
 
 def validate_message(message: Dict[str, Any]) -> None:
     """
@@ -133,10 +196,12 @@ def main():
         with open(args.yaml_file) as f:
             message = yaml.safe_load(f)
         validate_message(message)
+        events = message_events(message, args.force_signature)
         outport = open_midi_port(args.midi_port)
-        if "signature_pulse" in message:
-            send_signature_pulse(message["signature_pulse"], outport, force=args.force_signature)
-        send_consciousness_message(message, outport)
+        if "signature_pulse" in message and not args.force_signature \
+                and message["signature_pulse"].get("channel", 15) == 15:
+            print("⚠️ Channel 16 may be in use. Skipping signature unless forced.")
+        play_events(events, outport)
         print("✅ MIDI message sent successfully.")
     except Exception as e:
         print(f"❌ MIDI transmission error: {e}")
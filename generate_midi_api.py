@@ -1,53 +1,609 @@
-from flask import Flask, request, send_file, jsonify
-import yaml
-from mido import MidiFile, MidiTrack, Message, MetaMessage
+#!/usr/bin/env python3
+"""
+MIDI Generation Service
+POST a melody (JSON or YAML) to /api/generate-midi and get a .mid file back
+
+Note 'start' and 'duration' are in beats from the beginning of the piece and
+are scheduled at absolute ticks. Identical payloads are served from a
+memory-bounded cache (with ETag / If-None-Match revalidation and hit/miss
+counters at /api/generate-midi/cache), and /api/generate-midi/batch renders
+many melodies into a zip or a single multi-track file. A single .mid is
+rendered in memory and sent whole; only the batch zip is streamed, one member
+at a time as it renders. Runs on waitress when installed, otherwise on
+Flask's threaded server.
+"""
+
+import hashlib
 import io
+import json
+import math
+import re
+import struct
+import threading
+import zipfile
+from collections import OrderedDict
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import yaml
+from flask import Flask, Response, jsonify, request
+from mido import Message, MetaMessage, MidiFile, MidiTrack, bpm2tempo
+
+from render_cache import canonical_hash
+
+try:
+    from yaml import CSafeLoader as YamlLoader
+except ImportError:  # libyaml is optional
+    from yaml import SafeLoader as YamlLoader
+
+TICKS_PER_BEAT = 480
+CACHE_MAX_BYTES = 64 * 1024 * 1024
+CACHE_ALIASES = 4096
+MAX_BATCH = 500
+RENDER_VERSION = "generate-midi-1"
+PREVIEW_DOCUMENTS = 256
+PREVIEW_TRACKS = 4096
 
 app = Flask(__name__)
 
-@app.route('/api/generate-midi', methods=['POST'])
-def generate_midi():
-    try:
-        yaml_data = request.data.decode('utf-8')
-        data = yaml.safe_load(yaml_data)
+# === PARSING ===
 
-        mid = MidiFile()
-        tempo_bpm = data.get('tempo', 120)
-        tempo_us = int(60_000_000 / tempo_bpm)
+def parse_payload(body: bytes, content_type: str = "") -> Any:
+    """JSON (by content type or a leading brace/bracket) or YAML"""
+    text = body.decode('utf-8')
+    if 'json' in content_type or text.lstrip().startswith(('{', '[')):
+        return json.loads(text)
+    return yaml.load(text, Loader=YamlLoader)
 
+def validate_melody(data: Any) -> Dict:
+    if not isinstance(data, dict):
+        raise ValueError("Melody must be a mapping")
+    tracks = data.get('tracks', [])
+    if not isinstance(tracks, list) or not all(isinstance(t, dict) for t in tracks):
+        raise ValueError("'tracks' must be a list of mappings")
+    for t in tracks:
+        if not isinstance(t.get('notes', []), list) or not all(isinstance(n, dict) for n in t.get('notes', [])):
+            raise ValueError("'notes' must be a list of mappings")
+        for key in ('channel', 'program'):
+            if key in t and not _is_int(t[key]):
+                raise ValueError(f"Track '{key}' must be an integer")
+        for n in t.get('notes', []):
+            for key in ('note', 'velocity'):
+                if key in n and not _is_int(n[key]):
+                    raise ValueError(f"Note '{key}' must be an integer")
+            start, duration = n.get('start', 0), n.get('duration', 1)
+            if not _is_number(start) or start < 0:
+                raise ValueError(f"Note 'start' must be a number >= 0: {start!r}")
+            if not _is_number(duration) or duration <= 0:
+                raise ValueError(f"Note 'duration' must be a number > 0: {duration!r}")
+    return data
+
+def _is_int(value: Any) -> bool:
+    return isinstance(value, int) and not isinstance(value, bool)
+
+def _is_number(value: Any) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool) and math.isfinite(value)
+
+# === RENDERING ===
+
+# (absolute_tick, order, type, channel, data1, data2); at equal ticks note_offs sort before note_ons
+Event = Tuple[int, int, str, int, int, int]
+
+def track_events(spec: Dict, ticks_per_beat: int = TICKS_PER_BEAT) -> List[Event]:
+    """Absolute-time events for one track; 'start' and 'duration' are in beats"""
+    channel = spec.get('channel', 0)
+    events = [(0, 0, 'program_change', channel, spec.get('program', 0), 0)]
+    for note in spec.get('notes', []):
+        note_val = note.get('note', 60)
+        start = int(round(note.get('start', 0) * ticks_per_beat))
+        end = start + max(1, int(round(note.get('duration', 1) * ticks_per_beat)))
+        events.append((start, 2, 'note_on', channel, note_val, note.get('velocity', 64)))
+        events.append((end, 1, 'note_off', channel, note_val, 0))
+    return events
+
+def append_events(track: MidiTrack, events: List[Event]) -> None:
+    """Append absolute-time events to a track as delta times"""
+    last_tick = 0
+    for tick, _, kind, channel, data1, data2 in sorted(events):
+        if kind == 'program_change':
+            track.append(Message(kind, program=data1, channel=channel, time=tick - last_tick))
+        else:
+            track.append(Message(kind, note=data1, velocity=data2, channel=channel, time=tick - last_tick))
+        last_tick = tick
+
+def conductor_messages(data: Dict) -> List[MetaMessage]:
+    messages = [MetaMessage('set_tempo', tempo=bpm2tempo(data.get('tempo', 120)), time=0)]
+    if 'time_signature' in data:
+        ts = data['time_signature']
+        num, denom = map(int, ts.split('/')) if isinstance(ts, str) else ts
+        messages.append(MetaMessage('time_signature', numerator=num, denominator=denom, time=0))
+    return messages
+
+def build_midi(data: Dict) -> MidiFile:
+    """One-track file: tempo/time signature, then every track's notes merged in time order"""
+    mid = MidiFile(ticks_per_beat=TICKS_PER_BEAT)
+    track = MidiTrack()
+    mid.tracks.append(track)
+    track.extend(conductor_messages(data))
+    events = []
+    for spec in data.get('tracks', []):
+        events.extend(track_events(spec, mid.ticks_per_beat))
+    append_events(track, events)
+    return mid
+
+def build_multitrack(melodies: List[Dict]) -> MidiFile:
+    """Type 1 file with one track per melody; tempo and meter come from the first melody"""
+    mid = MidiFile(type=1, ticks_per_beat=TICKS_PER_BEAT)
+    conductor = MidiTrack()
+    conductor.extend(conductor_messages(melodies[0]))
+    mid.tracks.append(conductor)
+    for i, data in enumerate(melodies):
         track = MidiTrack()
+        track.append(MetaMessage('track_name', name=str(data.get('name', f'Melody {i + 1}')), time=0))
+        events = []
+        for spec in data.get('tracks', []):
+            events.extend(track_events(spec, mid.ticks_per_beat))
+        append_events(track, events)
         mid.tracks.append(track)
+    return mid
+
+def midi_bytes(mid: MidiFile) -> bytes:
+    output = io.BytesIO()
+    mid.save(file=output)
+    return output.getvalue()
+
+# === CACHE ===
+
+class ResponseCache:
+    """Thread-safe, memory-bounded LRU of rendered files keyed by the canonical payload hash
+
+    Raw request bodies are also remembered as aliases of their canonical key,
+    so a byte-identical re-POST skips parsing entirely.
+    """
+
+    def __init__(self, max_bytes: int = CACHE_MAX_BYTES, max_aliases: int = CACHE_ALIASES):
+        self.max_bytes = max_bytes
+        self.max_aliases = max_aliases
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.not_modified = 0
+        self._entries: "OrderedDict[str, bytes]" = OrderedDict()
+        self._aliases: "OrderedDict[str, str]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            data = self._entries.get(key)
+            if data is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+                self._entries.move_to_end(key)
+            return data
+
+    def put(self, key: str, data: bytes) -> None:
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self.size -= len(previous)
+            self._entries[key] = data
+            self.size += len(data)
+            while self.size > self.max_bytes and len(self._entries) > 1:
+                _, evicted = self._entries.popitem(last=False)
+                self.size -= len(evicted)
+                self.evictions += 1
+
+    def record_not_modified(self) -> None:
+        with self._lock:
+            self.not_modified += 1
+
+    def alias(self, raw_key: str) -> Optional[str]:
+        with self._lock:
+            key = self._aliases.get(raw_key)
+            if key is not None:
+                self._aliases.move_to_end(raw_key)
+            return key
+
+    def add_alias(self, raw_key: str, key: str) -> None:
+        with self._lock:
+            self._aliases[raw_key] = key
+            self._aliases.move_to_end(raw_key)
+            while len(self._aliases) > self.max_aliases:
+                self._aliases.popitem(last=False)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self.size,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "evictions": self.evictions,
+                "not_modified": self.not_modified,
+            }
+
+response_cache = ResponseCache()
+
+def render_cached(data: Dict, key: Optional[str] = None, lookup: bool = True) -> Tuple[str, bytes]:
+    """(canonical key, .mid bytes); JSON and YAML spellings of the same melody share an entry
+
+    lookup=False renders straight away, for callers that already counted the miss.
+    """
+    key = key or canonical_hash(data, RENDER_VERSION)
+    midi = response_cache.get(key) if lookup else None
+    if midi is None:
+        midi = midi_bytes(build_midi(data))
+        response_cache.put(key, midi)
+    return key, midi
+
+def render_melody(data: Dict) -> bytes:
+    return render_cached(data)[1]
+
+# === STREAMING ===
+
+def midi_response(data: bytes, filename: str, etag: Optional[str] = None) -> Response:
+    response = Response(data, mimetype='audio/midi', headers={
+        'Content-Disposition': f'attachment; filename={filename}',
+    })
+    if etag:
+        response.set_etag(etag)
+        response.headers['Cache-Control'] = 'no-cache'  # always revalidate with If-None-Match
+    return response
+
+def not_modified(etag: str) -> Response:
+    response_cache.record_not_modified()
+    response = Response(status=304)
+    response.set_etag(etag)
+    return response
+
+class _ChunkSink(io.RawIOBase):
+    """Unseekable file object that collects zip output for the response generator"""
+
+    def __init__(self):
+        self.chunks: List[bytes] = []
+
+    def writable(self) -> bool:
+        return True
 
-        # Tempo and time signature
-        track.append(MetaMessage('set_tempo', tempo=tempo_us))
-        if 'time_signature' in data:
-            num, denom = data['time_signature']
-            track.append(MetaMessage('time_signature', numerator=num, denominator=denom))
+    def write(self, b) -> int:
+        self.chunks.append(bytes(b))
+        return len(b)
 
-        # Tracks
-        for t in data.get('tracks', []):
-            channel = t.get('channel', 0)
-            program = t.get('program', 0)
-            track.append(Message('program_change', program=program, channel=channel, time=0))
+    def drain(self) -> bytes:
+        data, self.chunks = b''.join(self.chunks), []
+        return data
 
-            for note in t.get('notes', []):
-                note_val = note.get('note', 60)
-                velocity = note.get('velocity', 64)
-                start = int(note.get('start', 0) * 480)
-                duration = int(note.get('duration', 1) * 480)
+def melody_filenames(melodies: List[Dict]) -> List[str]:
+    names, seen = [], set()
+    for i, data in enumerate(melodies):
+        base = re.sub(r'[^\w.-]+', '_', str(data.get('name', ''))).strip('._') or f'melody_{i + 1:03d}'
+        name, n = f'{base}.mid', 1
+        while name in seen:
+            n += 1
+            name = f'{base}_{n}.mid'
+        seen.add(name)
+        names.append(name)
+    return names
 
-                track.append(Message('note_on', note=note_val, velocity=velocity, time=start, channel=channel))
-                track.append(Message('note_off', note=note_val, velocity=0, time=duration, channel=channel))
+def stream_zip(melodies: List[Dict]) -> Iterator[bytes]:
+    """Render and send one archive member at a time"""
+    sink = _ChunkSink()
+    with zipfile.ZipFile(sink, 'w', zipfile.ZIP_STORED) as archive:
+        for name, data in zip(melody_filenames(melodies), melodies):
+            archive.writestr(name, render_melody(data))
+            yield sink.drain()
+    yield sink.drain()
 
-        # Save to memory
-        output = io.BytesIO()
-        mid.save(file=output)
-        output.seek(0)
+# === INCREMENTAL PREVIEW ===
 
-        return send_file(output, as_attachment=True, download_name='melody_scribe.mid', mimetype='audio/midi')
+def _pointer(path: str) -> List[str]:
+    if path == '':
+        return []
+    if not path.startswith('/'):
+        raise ValueError(f"Invalid JSON pointer: {path}")
+    return [token.replace('~1', '/').replace('~0', '~') for token in path[1:].split('/')]
 
+def _child_key(container: Any, token: str, adding: bool = False):
+    if isinstance(container, list):
+        if adding and token == '-':
+            return len(container)
+        if not token.isdigit() or int(token) > len(container) - (0 if adding else 1):
+            raise ValueError(f"List index out of range: {token}")
+        return int(token)
+    if isinstance(container, dict):
+        if not adding and token not in container:
+            raise ValueError(f"Missing key: {token}")
+        return token
+    raise ValueError(f"Cannot index into {type(container).__name__}")
+
+def _pointer_get(doc: Any, tokens: List[str]) -> Any:
+    for token in tokens:
+        doc = doc[_child_key(doc, token)]
+    return doc
+
+def _copy_along(doc: Any, tokens: List[str], change) -> Any:
+    """Shallow-copy only the containers on the path and apply change(parent, last_token)
+
+    Untouched subtrees (e.g. every other track) stay shared with the base document.
+    """
+    parent = list(doc) if isinstance(doc, list) else dict(doc) if isinstance(doc, dict) else doc
+    if len(tokens) == 1:
+        change(parent, tokens[0])
+        return parent
+    key = _child_key(doc, tokens[0])
+    parent[key] = _copy_along(doc[key], tokens[1:], change)
+    return parent
+
+def _patch_add(doc: Any, tokens: List[str], value: Any) -> Any:
+    if not tokens:
+        return value
+    def add(parent, token):
+        key = _child_key(parent, token, adding=True)
+        if isinstance(parent, list):
+            parent.insert(key, value)
+        else:
+            parent[key] = value
+    return _copy_along(doc, tokens, add)
+
+def _patch_remove(doc: Any, tokens: List[str]) -> Any:
+    if not tokens:
+        raise ValueError("Cannot remove the whole document")
+    def remove(parent, token):
+        del parent[_child_key(parent, token)]
+    return _copy_along(doc, tokens, remove)
+
+def apply_json_patch(doc: Any, patch: List[Dict]) -> Any:
+    """Apply an RFC 6902 JSON Patch without mutating doc"""
+    if not isinstance(patch, list):
+        raise ValueError("'patch' must be a list of operations")
+    for op in patch:
+        kind, tokens = op.get('op'), _pointer(op.get('path', ''))
+        if kind == 'test':
+            if _pointer_get(doc, tokens) != op.get('value'):
+                raise ValueError(f"Test failed at {op['path']}")
+        elif kind == 'add':
+            doc = _patch_add(doc, tokens, op['value'])
+        elif kind == 'remove':
+            doc = _patch_remove(doc, tokens)
+        elif kind == 'replace':
+            doc = _patch_add(_patch_remove(doc, tokens), tokens, op['value']) if tokens else op['value']
+        elif kind in ('move', 'copy'):
+            source = _pointer(op['from'])
+            value = _pointer_get(doc, source)
+            if kind == 'move':
+                doc = _patch_remove(doc, source)
+            doc = _patch_add(doc, tokens, value)
+        else:
+            raise ValueError(f"Unsupported patch op: {kind}")
+    return doc
+
+def _varlen(value: int) -> bytes:
+    if not 0 <= value < 1 << 28:
+        raise ValueError(f"Delta time out of range: {value}")
+    out = [value & 0x7F]
+    value >>= 7
+    while value:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    return bytes(reversed(out))
+
+def _chunk(body: bytes) -> bytes:
+    return b'MTrk' + struct.pack('>I', len(body)) + body
+
+def encode_track_chunk(events: List[Event]) -> bytes:
+    """MTrk chunk for sorted absolute-time events, encoded directly (no mido objects)"""
+    body = bytearray()
+    last_tick = 0
+    for tick, _, kind, channel, data1, data2 in events:
+        if not (0 <= channel <= 15 and 0 <= data1 <= 127 and 0 <= data2 <= 127):
+            raise ValueError(f"MIDI value out of range in {kind}: channel={channel} data={data1},{data2}")
+        if tick < last_tick:
+            raise ValueError(f"Events out of order: tick {tick} after {last_tick}")
+        body += _varlen(tick - last_tick)
+        if kind == 'program_change':
+            body += bytes((0xC0 | channel, data1))
+        else:
+            body += bytes(((0x90 if kind == 'note_on' else 0x80) | channel, data1, data2))
+        last_tick = tick
+    body += b'\x00\xff\x2f\x00'
+    return _chunk(bytes(body))
+
+def encode_conductor_chunk(data: Dict) -> bytes:
+    body = bytearray(b'\x00\xff\x51\x03' + bpm2tempo(data.get('tempo', 120)).to_bytes(3, 'big'))
+    if 'time_signature' in data:
+        ts = data['time_signature']
+        num, denom = map(int, ts.split('/')) if isinstance(ts, str) else ts
+        if denom <= 0 or denom & (denom - 1):
+            raise ValueError(f"Time signature denominator must be a power of two: {denom}")
+        body += bytes((0x00, 0xFF, 0x58, 0x04, num, denom.bit_length() - 1, 24, 8))
+    body += b'\x00\xff\x2f\x00'
+    return _chunk(bytes(body))
+
+class PreviewStore:
+    """Recent documents (by ID) and per-track renders (by track content hash)"""
+
+    def __init__(self, max_documents: int = PREVIEW_DOCUMENTS, max_tracks: int = PREVIEW_TRACKS):
+        self.max_documents = max_documents
+        self.max_tracks = max_tracks
+        self.track_hits = 0
+        self.track_misses = 0
+        self._documents: "OrderedDict[str, Tuple[Dict, List[str]]]" = OrderedDict()
+        self._tracks: "OrderedDict[str, Tuple[List[Event], bytes]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def document(self, doc_id: str) -> Optional[Tuple[Dict, List[str]]]:
+        with self._lock:
+            entry = self._documents.get(doc_id)
+            if entry is not None:
+                self._documents.move_to_end(doc_id)
+            return entry
+
+    def add_document(self, data: Dict) -> Tuple[str, List[str]]:
+        """Register a document; returns (document ID, per-track keys)"""
+        track_keys = [canonical_hash(spec, RENDER_VERSION) for spec in data.get('tracks', [])]
+        header = {k: v for k, v in data.items() if k != 'tracks'}
+        doc_id = canonical_hash({'header': header, 'tracks': track_keys}, RENDER_VERSION)
+        with self._lock:
+            self._documents[doc_id] = (data, track_keys)
+            self._documents.move_to_end(doc_id)
+            while len(self._documents) > self.max_documents:
+                self._documents.popitem(last=False)
+        return doc_id, track_keys
+
+    def track(self, key: str, spec: Dict) -> Tuple[List[Event], bytes]:
+        """(sorted events, encoded MTrk chunk) for one track, rendered at most once"""
+        with self._lock:
+            entry = self._tracks.get(key)
+            if entry is not None:
+                self._tracks.move_to_end(key)
+                self.track_hits += 1
+                return entry
+            self.track_misses += 1
+        events = sorted(track_events(spec))
+        entry = (events, encode_track_chunk(events))
+        with self._lock:
+            self._tracks[key] = entry
+            while len(self._tracks) > self.max_tracks:
+                self._tracks.popitem(last=False)
+        return entry
+
+preview_store = PreviewStore()
+
+def preview_midi(data: Dict, track_keys: List[str]) -> bytes:
+    """Type 1 file: conductor track plus one cached chunk per melody track"""
+    chunks = [preview_store.track(key, spec)[1] for key, spec in zip(track_keys, data.get('tracks', []))]
+    header = b'MThd' + struct.pack('>IHHH', 6, 1, len(chunks) + 1, TICKS_PER_BEAT)
+    return header + encode_conductor_chunk(data) + b''.join(chunks)
+
+# === ROUTES ===
+
+@app.route('/api/generate-midi', methods=['POST'])
+def generate_midi():
+    body = request.get_data()
+    content_type = request.content_type or ''
+    raw_key = hashlib.sha256(content_type.encode() + b'\n' + body).hexdigest()
+
+    # Byte-identical re-POST: answer from the alias without parsing
+    key = response_cache.alias(raw_key)
+    missed = False
+    if key is not None:
+        if request.if_none_match.contains(key):
+            return not_modified(key)
+        midi = response_cache.get(key)
+        if midi is not None:
+            return midi_response(midi, 'melody_scribe.mid', key)
+        missed = True  # render evicted; the miss is already counted
+
+    try:
+        data = validate_melody(parse_payload(body, content_type))
+        key = canonical_hash(data, RENDER_VERSION)
+        response_cache.add_alias(raw_key, key)
+        if request.if_none_match.contains(key):
+            return not_modified(key)
+        _, midi = render_cached(data, key, lookup=not missed)
+    except Exception as e:
+        return jsonify({'error': str(e)}), 400
+    return midi_response(midi, 'melody_scribe.mid', key)
+
+@app.route('/api/generate-midi/cache', methods=['GET'])
+def generate_midi_cache_stats():
+    return jsonify(response_cache.stats())
+
+@app.route('/api/generate-midi/batch', methods=['POST'])
+def generate_midi_batch():
+    """Body: a list of melodies or {"melodies": [...], "format": "zip" | "multitrack"}"""
+    try:
+        payload = parse_payload(request.get_data(), request.content_type or '')
+        melodies = payload.get('melodies') if isinstance(payload, dict) else payload
+        if not isinstance(melodies, list) or not melodies:
+            raise ValueError("Expected a non-empty list of melodies")
+        if len(melodies) > MAX_BATCH:
+            raise ValueError(f"At most {MAX_BATCH} melodies per batch")
+        for data in melodies:
+            validate_melody(data)
+        fmt = request.args.get('format') or (payload.get('format') if isinstance(payload, dict) else None) or 'zip'
+        if fmt == 'multitrack':
+            return midi_response(midi_bytes(build_multitrack(melodies)), 'melodies.mid')
+        if fmt != 'zip':
+            raise ValueError(f"Unknown format: {fmt}")
+    except Exception as e:
+        return jsonify({'error': str(e)}), 400
+    return Response(stream_zip(melodies), mimetype='application/zip',
+                    headers={'Content-Disposition': 'attachment; filename=melodies.zip'})
+
+@app.route('/api/generate-midi/preview', methods=['POST'])
+def generate_midi_preview():
+    """Incremental preview for editors
+
+    Body: {"document": {...}} to register a melody, or {"base": "<id>", "patch": [RFC 6902 ops]}
+    to edit one. format=events (default) returns the new document ID and the absolute-time
+    events of tracks whose content changed; format=midi returns the whole file, assembled from
+    cached per-track renders.
+    """
+    try:
+        payload = parse_payload(request.get_data(), request.content_type or '')
+        if not isinstance(payload, dict):
+            raise ValueError("Expected a mapping with 'document' or 'base' and 'patch'")
+        base_id, base_keys = payload.get('base'), []
+        if base_id is not None:
+            base = preview_store.document(base_id)
+            if base is None:
+                return jsonify({'error': 'Unknown base document; send it in full', 'base': base_id}), 404
+            base_data, base_keys = base
+            data = apply_json_patch(base_data, payload.get('patch', []))
+        else:
+            data = payload.get('document')
+        validate_melody(data)
+        doc_id, track_keys = preview_store.add_document(data)
+
+        fmt = request.args.get('format') or payload.get('format') or 'events'
+        if fmt == 'midi':
+            if request.if_none_match.contains(doc_id):
+                return not_modified(doc_id)
+            return midi_response(preview_midi(data, track_keys), 'melody_preview.mid', doc_id)
+        if fmt != 'events':
+            raise ValueError(f"Unknown format: {fmt}")
+
+        changed = {}
+        for i, (key, spec) in enumerate(zip(track_keys, data.get('tracks', []))):
+            if i >= len(base_keys) or base_keys[i] != key:
+                events = preview_store.track(key, spec)[0]
+                changed[str(i)] = [[tick, kind, channel, data1, data2]
+                                   for tick, _, kind, channel, data1, data2 in events]
+        base_header = {k: v for k, v in base_data.items() if k != 'tracks'} if base_id else None
+        header = {k: v for k, v in data.items() if k != 'tracks'}
     except Exception as e:
         return jsonify({'error': str(e)}), 400
+    return jsonify({
+        'id': doc_id,
+        'base': base_id,
+        'ticks_per_beat': TICKS_PER_BEAT,
+        'track_count': len(track_keys),
+        'header': header if header != base_header else None,
+        'changed_tracks': changed,
+    })
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Serve the MIDI generation API.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=5000)
+    parser.add_argument("--threads", type=int, default=8, help="Worker threads (waitress)")
+    args = parser.parse_args()
+
+    try:
+        from waitress import serve
+    except ImportError:
+        print(f"🎹 Serving on http://{args.host}:{args.port} (Flask threaded; install waitress for production)")
+        app.run(host=args.host, port=args.port, threaded=True)
+    else:
+        print(f"🎹 Serving on http://{args.host}:{args.port} with {args.threads} waitress threads")
+        serve(app, host=args.host, port=args.port, threads=args.threads)
 
 if __name__ == '__main__':
-    app.run(port=5000)
+    main()
@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+"""
+Harmonic Log Aggregator
+Single writer for the harmonic logs, fed by producers over a Unix datagram socket
+
+Producers (the watcher and every responder subprocess) send one JSON
+datagram per record and never touch the log files. The aggregator stamps
+each record with a per-log sequence number and a monotonic timestamp and
+writes them in arrival order through HarmonicLogSink; on startup each log's
+sequence resumes after the last number already written. If no aggregator is
+listening, producers fall back to writing through their own locked sink,
+stamped "seq -" since they are outside that order. Records are passed through
+JSON on both paths, so they are logged with the same types either way.
+"""
+
+import gzip
+import json
+import os
+import re
+import socket
+import sys
+import threading
+import time
+from typing import Dict, Iterable, Optional
+
+from harmonic_log_sink import get_log_sink, zstandard
+
+AGGREGATOR_SOCKET = "harmonic_log_aggregator.sock"
+ALLOWED_LOGS = ("harmonic_analysis_log.yaml", "harmonic_consciousness_log.yaml")
+MAX_DATAGRAM = 256 * 1024
+SEQUENCE_PATTERN = re.compile(rb"^# .*\[seq (\d+) ", re.MULTILINE)
+
+def record_stamp(seq: Optional[int], pid) -> str:
+    """Header suffix for a record; seq None marks one written without the aggregator"""
+    return f"[seq {'-' if seq is None else seq} t={time.monotonic():.6f} pid={pid}]"
+
+def _read_log_bytes(path: str) -> bytes:
+    if path.endswith(".gz"):
+        with gzip.open(path, "rb") as f:
+            return f.read()
+    if path.endswith(".zst"):
+        if zstandard is None:
+            return b""
+        with open(path, "rb") as f, zstandard.ZstdDecompressor().stream_reader(f) as reader:
+            return reader.read()
+    with open(path, "rb") as f:
+        return f.read()
+
+def last_sequence(log_path: str) -> int:
+    """Highest sequence stamped in the live log, else in its newest rotated segment"""
+    for path in [log_path] + get_log_sink(log_path).rotated_segments()[-1:]:
+        try:
+            matches = SEQUENCE_PATTERN.findall(_read_log_bytes(path))
+        except OSError:
+            continue
+        if matches:
+            return int(matches[-1])
+    return 0
+
+class LogAggregator:
+    """Receive log records on a datagram socket and serialize them in order"""
+
+    def __init__(self, socket_path: str = AGGREGATOR_SOCKET,
+                 allowed_logs: Iterable[str] = ALLOWED_LOGS, log_dir: str = "."):
+        self.socket_path = socket_path
+        self.allowed_logs = set(allowed_logs)
+        self.log_dir = log_dir
+        self.sequence: Dict[str, int] = {}
+        self.received = 0
+        self.rejected = 0
+        self._sock: Optional[socket.socket] = None
+        self._thread: Optional[threading.Thread] = None
+        self._stopping = False
+
+    def bind(self) -> None:
+        if os.path.exists(self.socket_path):
+            if aggregator_running(self.socket_path):
+                raise RuntimeError(f"An aggregator is already listening on {self.socket_path}")
+            os.unlink(self.socket_path)  # stale socket left by an aggregator that did not shut down
+        self._sock = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+        self._sock.bind(self.socket_path)
+        self._sock.settimeout(0.5)
+
+    def handle(self, payload: bytes) -> bool:
+        """Stamp and queue one datagram; returns False if it was rejected"""
+        try:
+            message = json.loads(payload)
+            log_name = os.path.basename(message["log"])
+            header = str(message["header"])
+            record = message["record"]
+        except (ValueError, KeyError, TypeError):
+            self.rejected += 1
+            return False
+        if log_name not in self.allowed_logs:
+            self.rejected += 1
+            return False
+
+        log_path = os.path.join(self.log_dir, log_name)
+        if log_name not in self.sequence:
+            self.sequence[log_name] = last_sequence(log_path)
+        seq = self.sequence[log_name] + 1
+        self.sequence[log_name] = seq
+        get_log_sink(log_path).write(f"{header} {record_stamp(seq, message.get('pid', '?'))}", record)
+        self.received += 1
+        return True
+
+    def serve_forever(self) -> None:
+        if self._sock is None:
+            self.bind()
+        while not self._stopping:
+            try:
+                payload = self._sock.recv(MAX_DATAGRAM)
+            except socket.timeout:
+                continue
+            except OSError:
+                break
+            self.handle(payload)
+
+    def start(self) -> "LogAggregator":
+        """Run the aggregator on a background thread"""
+        self.bind()
+        self._thread = threading.Thread(target=self.serve_forever, name="harmonic-log-aggregator", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._stopping = True
+        if self._thread is not None:
+            self._thread.join(timeout=2)
+        if self._sock is not None:
+            self._sock.close()
+            self._sock = None
+        if os.path.exists(self.socket_path):
+            os.unlink(self.socket_path)
+        for log_name in self.allowed_logs:
+            get_log_sink(os.path.join(self.log_dir, log_name)).flush()
+
+class LogClient:
+    """Producer side: fire-and-forget datagrams with a local-sink fallback"""
+
+    def __init__(self, socket_path: str = AGGREGATOR_SOCKET):
+        self.socket_path = socket_path
+        self._sock = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+        self._sock.setblocking(False)
+
+    def send(self, log_path: str, header: str, record: Dict) -> bool:
+        """Send a record; returns True if the aggregator took it"""
+        record = json.loads(json.dumps(record, default=str))  # the types the aggregator would log
+        payload = json.dumps({"log": log_path, "header": header, "record": record,
+                              "pid": os.getpid()}).encode()
+        if len(payload) <= MAX_DATAGRAM:
+            try:
+                self._sock.sendto(payload, self.socket_path)
+                return True
+            except OSError:
+                pass
+        # No aggregator (or a full socket buffer): write directly under the sink's lock
+        get_log_sink(log_path).write(f"{header} {record_stamp(None, os.getpid())}", record)
+        return False
+
+def aggregator_running(socket_path: str = AGGREGATOR_SOCKET) -> bool:
+    """True if something is bound to the aggregator socket (connect sends nothing)"""
+    probe = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+    try:
+        probe.connect(socket_path)
+        return True
+    except OSError:
+        return False
+    finally:
+        probe.close()
+
+_client: Optional[LogClient] = None
+
+def send_log_record(log_path: str, header: str, record: Dict) -> bool:
+    global _client
+    if _client is None:
+        _client = LogClient(os.environ.get("HARMONIC_LOG_SOCKET", AGGREGATOR_SOCKET))
+    return _client.send(log_path, header, record)
+
+def main():
+    aggregator = LogAggregator(sys.argv[1] if len(sys.argv) > 1 else AGGREGATOR_SOCKET)
+    aggregator.bind()
+    print(f"🗂️ Harmonic log aggregator listening on {aggregator.socket_path}")
+    try:
+        aggregator.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        aggregator.stop()
+        print(f"🛑 Aggregator stopped after {aggregator.received} records ({aggregator.rejected} rejected).")
+
+if __name__ == "__main__":
+    main()
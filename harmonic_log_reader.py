@@ -0,0 +1,223 @@
+#!/usr/bin/env python3
+"""
+Harmonic Log Reader
+Memory-mapped, indexed access to the append-only harmonic YAML logs
+(harmonic_analysis_log.yaml, harmonic_consciousness_log.yaml)
+
+A sidecar index (<log>.idx.json) records the byte offset, length, identity
+and style of every '---' document. The index is extended incrementally when
+the log grows and only the documents a query asks for are parsed.
+"""
+
+import json
+import mmap
+import os
+import re
+import sys
+import hashlib
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import yaml
+
+INDEX_VERSION = 1
+SIGNATURE_BYTES = 4096
+
+DOC_SEPARATOR = re.compile(rb"^---[ \t]*\r?$", re.MULTILINE)
+IDENTITY_LINE = re.compile(rb"^identity:[ \t]*['\"]?([^'\"\r\n]+)", re.MULTILINE)
+STATE_LINE = re.compile(rb"^[ \t]+state:[ \t]*['\"]?([^'\"\r\n]+)", re.MULTILINE)
+HEADER_STYLE = re.compile(rb"^#[^\r\n]*style '([^']+)'", re.MULTILINE)
+HEADER_SENDER = re.compile(rb"^# (?:Exchange from )?(\S+)", re.MULTILINE)
+
+# (offset, length, identity, style, sender)
+IndexEntry = Tuple[int, int, str, str, str]
+
+def index_path_for(log_path: str) -> str:
+    return f"{log_path}.idx.json"
+
+def _signature(mm) -> str:
+    return hashlib.sha1(mm[:SIGNATURE_BYTES]).hexdigest()
+
+def _describe(doc: bytes) -> Tuple[str, str, str]:
+    """Pull identity, style and sender from a raw document without parsing YAML"""
+    identity = IDENTITY_LINE.search(doc)
+    style = HEADER_STYLE.search(doc) or STATE_LINE.search(doc)
+    sender = HEADER_SENDER.search(doc)
+    return (
+        identity.group(1).decode().strip() if identity else "Unknown",
+        style.group(1).decode().strip() if style else "unknown",
+        sender.group(1).decode().strip() if sender else "",
+    )
+
+def _scan(mm, start: int, end: int) -> List[IndexEntry]:
+    """Index the documents between start and end (start is a document boundary)"""
+    starts = [m.end() + 1 for m in DOC_SEPARATOR.finditer(mm, start, end)]
+    if start > 0 or DOC_SEPARATOR.match(mm, 0) is None:
+        # start itself opens a document (resumed scan, or a log without a leading '---')
+        starts.insert(0, start)
+    entries = []
+    for i, doc_start in enumerate(starts):
+        doc_end = end
+        if i + 1 < len(starts):
+            # Stop at the separator line that precedes the next document
+            doc_end = mm.rfind(b"---", doc_start, starts[i + 1])
+        doc_start = min(doc_start, end)
+        doc = mm[doc_start:doc_end]
+        if doc.strip():
+            entries.append((doc_start, doc_end - doc_start) + _describe(doc))
+    return entries
+
+class HarmonicLogReader:
+    """Indexed reader over one multi-document harmonic YAML log"""
+
+    def __init__(self, log_path: str, index_path: Optional[str] = None):
+        self.log_path = log_path
+        self.index_path = index_path or index_path_for(log_path)
+        self.entries: List[IndexEntry] = []
+        self._size = 0
+        self._signature = ""
+        self._file = None
+        self._mm = None
+        self._load_index()
+        self.refresh()
+
+    # --- index maintenance ---
+
+    def _load_index(self) -> None:
+        try:
+            with open(self.index_path, "r") as f:
+                index = json.load(f)
+            if index.get("version") == INDEX_VERSION:
+                self.entries = [tuple(e) for e in index["entries"]]
+                self._size = index["size"]
+                self._signature = index["signature"]
+        except (OSError, ValueError, KeyError):
+            self.entries, self._size, self._signature = [], 0, ""
+
+    def _save_index(self) -> None:
+        temp_path = f"{self.index_path}.tmp"
+        with open(temp_path, "w") as f:
+            json.dump({
+                "version": INDEX_VERSION,
+                "log": os.path.basename(self.log_path),
+                "size": self._size,
+                "signature": self._signature,
+                "entries": self.entries,
+            }, f, separators=(",", ":"))
+        os.replace(temp_path, self.index_path)
+
+    def _remap(self) -> None:
+        self.close()
+        size = os.path.getsize(self.log_path) if os.path.exists(self.log_path) else 0
+        if size:
+            self._file = open(self.log_path, "rb")
+            self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def refresh(self) -> int:
+        """Bring the index up to date with the log; returns documents added"""
+        self._remap()
+        if self._mm is None:
+            changed = bool(self.entries)
+            self.entries, self._size, self._signature = [], 0, ""
+            if changed:
+                self._save_index()
+            return 0
+
+        size = len(self._mm)
+        signature = _signature(self._mm)
+        if size == self._size and signature == self._signature:
+            return 0
+
+        before = len(self.entries)
+        if size > self._size and self.entries and signature == self._signature:
+            # Appended: re-scan from the last known document, which may have been partial
+            resume = self.entries[-1][0]
+            self.entries = self.entries[:-1] + _scan(self._mm, resume, size)
+        else:
+            # New, truncated or rewritten log
+            self.entries = _scan(self._mm, 0, size)
+            before = 0
+
+        self._size = size
+        self._signature = signature
+        self._save_index()
+        return len(self.entries) - before
+
+    def close(self) -> None:
+        if self._mm is not None:
+            self._mm.close()
+            self._mm = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    # --- lazy document access ---
+
+    def raw(self, i: int) -> bytes:
+        offset, length = self.entries[i][:2]
+        return self._mm[offset:offset + length]
+
+    def document(self, i: int) -> Dict:
+        """Parse a single document by index position"""
+        return yaml.safe_load(self.raw(i))
+
+    def select(self, identity: Optional[str] = None, style: Optional[str] = None,
+               sender: Optional[str] = None) -> List[int]:
+        """Positions of documents matching the given identity/style/sender"""
+        return [i for i, (_, _, ident, sty, snd) in enumerate(self.entries)
+                if (identity is None or ident.lower() == identity.lower())
+                and (style is None or sty == style)
+                and (sender is None or snd.lower() == sender.lower())]
+
+    def iter_documents(self, identity: Optional[str] = None, style: Optional[str] = None,
+                       sender: Optional[str] = None) -> Iterator[Dict]:
+        for i in self.select(identity, style, sender):
+            yield self.document(i)
+
+    def last(self, n: int, identity: Optional[str] = None, style: Optional[str] = None,
+             sender: Optional[str] = None) -> List[Dict]:
+        """The last n matching documents, oldest first"""
+        return [self.document(i) for i in self.select(identity, style, sender)[-n:]] if n > 0 else []
+
+    def counts(self, field: str = "identity") -> Dict[str, int]:
+        """Document counts per identity, style or sender, straight from the index"""
+        column = {"identity": 2, "style": 3, "sender": 4}[field]
+        totals: Dict[str, int] = {}
+        for entry in self.entries:
+            totals[entry[column]] = totals.get(entry[column], 0) + 1
+        return totals
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Query a harmonic YAML log through its offset index.")
+    parser.add_argument("log_file", help="harmonic_analysis_log.yaml or harmonic_consciousness_log.yaml")
+    parser.add_argument("--identity", help="Only documents whose identity matches")
+    parser.add_argument("--style", help="Only documents with this style/state")
+    parser.add_argument("--sender", help="Only documents triggered by this sender")
+    parser.add_argument("--last", type=int, default=10, help="How many matching documents to print")
+    parser.add_argument("--counts", choices=["identity", "style", "sender"], help="Print counts instead")
+    args = parser.parse_args()
+
+    if not os.path.exists(args.log_file):
+        print(f"❌ File not found: {args.log_file}", file=sys.stderr)
+        sys.exit(1)
+
+    with HarmonicLogReader(args.log_file) as reader:
+        if args.counts:
+            print(yaml.dump(reader.counts(args.counts), default_flow_style=False))
+            return
+        for doc in reader.last(args.last, args.identity, args.style, args.sender):
+            print("---")
+            print(yaml.dump(doc, default_flow_style=False), end="")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+"""
+Harmonic Log Sink
+Shared writer for the harmonic YAML logs with batching, cross-process
+locking, size/time-based rotation and compressed rotated segments
+
+Records keep the existing on-disk format ("---", a "# header" comment, then
+the YAML document), so the logs stay readable by yaml.safe_load_all and
+harmonic_log_reader.
+"""
+
+import atexit
+import fcntl
+import glob
+import gzip
+import os
+import shutil
+import threading
+import time
+from typing import Dict, List, Optional
+
+import yaml
+
+try:
+    import zstandard
+except ImportError:  # zstd is optional; gzip is always available
+    zstandard = None
+
+DEFAULT_MAX_BYTES = 5 * 1024 * 1024
+DEFAULT_BACKUP_COUNT = 10
+
+def format_record(header: str, record: Dict) -> str:
+    """Render one log document in the harmonic log format"""
+    return f"---\n# {header}\n" + yaml.dump(record, default_flow_style=False)
+
+class HarmonicLogSink:
+    """Batched, rotating appender for one harmonic YAML log
+
+    write() only queues the rendered record; a background thread (and
+    close()/interpreter exit) flushes batches under an exclusive lock on
+    <log>.lock, so several processes can share one log safely. The lock file
+    also records when the current segment started, for time-based rotation.
+    """
+
+    def __init__(self, path: str, max_bytes: int = DEFAULT_MAX_BYTES,
+                 max_age_seconds: Optional[float] = None,
+                 backup_count: int = DEFAULT_BACKUP_COUNT,
+                 compression: Optional[str] = "gzip",
+                 flush_interval: float = 1.0, batch_size: int = 64):
+        if compression == "zstd" and zstandard is None:
+            compression = "gzip"
+        self.path = path
+        self.lock_path = f"{path}.lock"
+        self.max_bytes = max_bytes
+        self.max_age_seconds = max_age_seconds
+        self.backup_count = backup_count
+        self.compression = compression
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+
+        self._pending: List[str] = []
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._closed = False
+        self._thread = threading.Thread(target=self._flush_loop, name="harmonic-log-sink", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    # --- producer side ---
+
+    def write(self, header: str, record: Dict) -> None:
+        self.write_raw(format_record(header, record))
+
+    def write_raw(self, text: str) -> None:
+        with self._lock:
+            self._pending.append(text)
+            full = len(self._pending) >= self.batch_size
+        if full:
+            self._wake.set()
+
+    # --- flushing ---
+
+    def _flush_loop(self) -> None:
+        while not self._closed:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            try:
+                self.flush()
+            except Exception as e:
+                print(f"⚠️ Harmonic log flush failed: {e}")
+
+    def flush(self) -> int:
+        """Write all queued records; returns how many were written"""
+        with self._lock:
+            batch, self._pending = self._pending, []
+        if not batch:
+            return 0
+        data = "".join(batch).encode()
+
+        try:
+            directory = os.path.dirname(os.path.abspath(self.path))
+            os.makedirs(directory, exist_ok=True)
+            with open(self.lock_path, "a+") as lock_file:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+                try:
+                    if self._should_rotate(lock_file, len(data)):
+                        self._rotate()
+                        self._mark_segment_start(lock_file)
+                    elif not os.path.exists(self.path):
+                        self._mark_segment_start(lock_file)
+                    with open(self.path, "ab") as log_file:
+                        log_file.write(data)
+                finally:
+                    fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+        except Exception:
+            # Keep the batch, ahead of anything queued since, for the next flush
+            with self._lock:
+                self._pending[:0] = batch
+            raise
+        return len(batch)
+
+    def close(self) -> None:
+        if self._closed:
+            return
+        self._closed = True
+        self._wake.set()
+        if self._thread.is_alive() and threading.current_thread() is not self._thread:
+            self._thread.join(timeout=self.flush_interval + 1)
+        self.flush()
+
+    # --- rotation ---
+
+    def _segment_start(self, lock_file) -> float:
+        lock_file.seek(0)
+        try:
+            return float(lock_file.read().strip() or 0)
+        except ValueError:
+            return 0.0
+
+    def _mark_segment_start(self, lock_file, started: Optional[float] = None) -> None:
+        lock_file.seek(0)
+        lock_file.truncate()
+        lock_file.write(f"{time.time() if started is None else started:.3f}\n")
+        lock_file.flush()
+
+    def _should_rotate(self, lock_file, incoming: int) -> bool:
+        try:
+            size = os.path.getsize(self.path)
+        except OSError:
+            return False
+        if size == 0:
+            return False
+        if self.max_bytes and size + incoming > self.max_bytes:
+            return True
+        if self.max_age_seconds:
+            started = self._segment_start(lock_file)
+            if not started:
+                # A log that predates its marker: it started no later than its
+                # creation time where the platform reports it, else its last write
+                stat = os.stat(self.path)
+                started = getattr(stat, "st_birthtime", stat.st_mtime)
+                self._mark_segment_start(lock_file, started)
+            return time.time() - started >= self.max_age_seconds
+        return False
+
+    def _rotate(self) -> None:
+        """Move the live log aside as a timestamped, compressed segment"""
+        stamp = time.strftime("%Y%m%d-%H%M%S")
+        segment = f"{self.path}.{stamp}"
+        suffix = 1
+        while glob.glob(f"{segment}*"):
+            segment = f"{self.path}.{stamp}-{suffix}"
+            suffix += 1
+        os.replace(self.path, segment)
+
+        if self.compression == "zstd":
+            with open(segment, "rb") as src, open(f"{segment}.zst", "wb") as dst:
+                zstandard.ZstdCompressor().copy_stream(src, dst)
+            os.remove(segment)
+        elif self.compression == "gzip":
+            with open(segment, "rb") as src, gzip.open(f"{segment}.gz", "wb") as dst:
+                shutil.copyfileobj(src, dst)
+            os.remove(segment)
+
+        self._prune()
+
+    def rotated_segments(self) -> List[str]:
+        """Rotated segments, oldest first"""
+        segments = [p for p in glob.glob(f"{glob.escape(self.path)}.*")
+                    if p != self.lock_path and not p.endswith((".idx.json", ".tmp"))]
+        return sorted(segments, key=lambda p: (os.path.getmtime(p), p))
+
+    def _prune(self) -> None:
+        segments = self.rotated_segments()
+        for old in segments[:max(0, len(segments) - self.backup_count)]:
+            os.remove(old)
+
+_sinks: Dict[str, HarmonicLogSink] = {}
+
+def get_log_sink(path: str, **options) -> HarmonicLogSink:
+    """Shared sink per log path within this process"""
+    key = os.path.abspath(path)
+    if key not in _sinks:
+        _sinks[key] = HarmonicLogSink(path, **options)
+    return _sinks[key]
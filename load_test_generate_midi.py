@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Load test for generate_midi_api.py
+Fire concurrent requests at a running service and report throughput and latency percentiles
+"""
+
+import json
+import math
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Tuple
+
+import yaml
+
+def sample_melody(tracks: int = 4, notes: int = 64, tempo: int = 120) -> Dict:
+    return {
+        "tempo": tempo,
+        "time_signature": [4, 4],
+        "tracks": [{
+            "channel": t,
+            "program": t * 8,
+            "notes": [{"note": 48 + (t * 7 + i * 5) % 36, "velocity": 64 + i % 48,
+                       "start": i * 0.5, "duration": 0.5 + (i % 3) * 0.25} for i in range(notes)],
+        } for t in range(tracks)],
+    }
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = max(0, math.ceil(pct / 100 * len(sorted_values)) - 1)
+    return sorted_values[index]
+
+def send(url: str, body: bytes, content_type: str) -> Tuple[float, int]:
+    req = urllib.request.Request(url, data=body, headers={"Content-Type": content_type}, method="POST")
+    started = time.perf_counter()
+    try:
+        with urllib.request.urlopen(req, timeout=30) as response:
+            response.read()
+            status = response.status
+    except urllib.error.HTTPError as e:
+        status = e.code
+    except OSError:
+        status = 0
+    return time.perf_counter() - started, status
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Load-test the MIDI generation API.")
+    parser.add_argument("--url", default="http://127.0.0.1:5000/api/generate-midi")
+    parser.add_argument("-n", "--requests", type=int, default=500)
+    parser.add_argument("-c", "--concurrency", type=int, default=16)
+    parser.add_argument("--tracks", type=int, default=4)
+    parser.add_argument("--notes", type=int, default=64, help="Notes per track")
+    parser.add_argument("--unique", action="store_true", help="Vary every payload so the cache never hits")
+    parser.add_argument("--yaml", action="store_true", help="Send YAML instead of JSON")
+    args = parser.parse_args()
+
+    def body_for(i: int) -> bytes:
+        melody = sample_melody(args.tracks, args.notes, 60 + i % 120 if args.unique else 120)
+        if args.unique:
+            melody["tracks"][0]["notes"][0]["velocity"] = i % 128
+        return (yaml.safe_dump(melody) if args.yaml else json.dumps(melody)).encode()
+
+    content_type = "application/x-yaml" if args.yaml else "application/json"
+    bodies = [body_for(i) for i in range(args.requests)]
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+        results = list(pool.map(lambda body: send(args.url, body, content_type), bodies))
+    elapsed = time.perf_counter() - started
+
+    latencies = sorted(latency for latency, status in results if status == 200)
+    errors = sum(1 for _, status in results if status != 200)
+    print(yaml.dump({
+        "requests": args.requests,
+        "concurrency": args.concurrency,
+        "errors": errors,
+        "elapsed_s": round(elapsed, 3),
+        "requests_per_second": round(len(latencies) / elapsed, 1) if elapsed else 0.0,
+        "latency_ms": {name: round(percentile(latencies, pct) * 1000, 2)
+                       for name, pct in (("p50", 50), ("p95", 95), ("p99", 99), ("max", 100))},
+    }, default_flow_style=False, sort_keys=False))
+
+if __name__ == "__main__":
+    main()
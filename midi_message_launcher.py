@@ -30,7 +30,7 @@ def generate_file():
         return
     try:
         subprocess.run(
-            ["python3", SCRIPT_PATH, "generate", file_path],
+            ["python3", SCRIPT_PATH, "generate", file_path, "--output-dir", "generated_midis"],
             check=True
         )
         messagebox.showinfo("MIDI Generated", "🎼 MIDI file successfully generated.")
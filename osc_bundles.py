@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+"""
+OSC Bundles
+Minimal OSC 1.0 encoding shared by the Surge XT senders
+
+Messages are built from a pre-encoded address + type-tag template and packed
+into '#bundle' datagrams no larger than the MTU, so a batch of parameter
+changes costs one UDP send per datagram instead of one per parameter.
+"""
+
+import struct
+from typing import Iterable, Iterator, Optional
+
+NTP_EPOCH_OFFSET = 2208988800  # seconds from 1900-01-01 (OSC time tags) to the Unix epoch
+OSC_IMMEDIATELY = struct.pack('>Q', 1)
+BUNDLE_TAG = b'#bundle\x00'
+DEFAULT_MTU = 1472  # largest UDP payload in one Ethernet frame
+
+def osc_string(text: str) -> bytes:
+    """NUL-terminated string padded to a multiple of 4 bytes"""
+    data = text.encode() + b'\x00'
+    return data + b'\x00' * (-len(data) % 4)
+
+def osc_template(osc_path: str, tag: str) -> bytes:
+    """Address and type-tag bytes for a single-argument message"""
+    return osc_string(osc_path) + osc_string(',' + tag)
+
+def osc_timetag(seconds: Optional[float] = None) -> bytes:
+    """64-bit NTP time tag for a Unix time (None = immediately)"""
+    if seconds is None:
+        return OSC_IMMEDIATELY
+    seconds += NTP_EPOCH_OFFSET
+    whole = int(seconds)
+    return struct.pack('>II', whole, int((seconds - whole) * (1 << 32)) & 0xFFFFFFFF)
+
+def pack_bundles(messages: Iterable[bytes], mtu: int = DEFAULT_MTU,
+                 timetag: bytes = OSC_IMMEDIATELY) -> Iterator[bytes]:
+    """Pack encoded messages into bundles of at most mtu bytes (a lone oversized message gets its own)"""
+    header = BUNDLE_TAG + timetag
+    bundle = bytearray(header)
+    for message in messages:
+        element = struct.pack('>i', len(message)) + message
+        if len(bundle) + len(element) > mtu and len(bundle) > len(header):
+            yield bytes(bundle)
+            bundle = bytearray(header)
+        bundle += element
+    if len(bundle) > len(header):
+        yield bytes(bundle)
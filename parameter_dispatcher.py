@@ -0,0 +1,368 @@
+#!/usr/bin/env python3
+"""
+Parameter Dispatcher
+Route semantic consciousness parameter updates over MIDI CC, NRPN or OSC
+
+Updates are coalesced per frame (the last value written to a parameter in a
+frame wins), then each one is assigned to whichever of its transports will
+finish soonest, judged by measured per-message cost and the work already
+queued on that transport's lane in this frame. Lanes (one per MIDI port or
+OSC socket) are flushed in parallel, so a large profile change is spread
+over every available transport instead of being serialized on one MIDI stream.
+"""
+
+import socket
+import struct
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+from osc_bundles import DEFAULT_MTU, osc_template, pack_bundles
+from parameter_registry import (CC_MAX, NRPN_MAX, TRANSPORT_MIDI_CC, TRANSPORT_NRPN,
+                                TRANSPORT_OSC, TRANSPORT_PREFERENCE, ParameterRegistry,
+                                ParameterSpec, load_registry)
+
+try:
+    import mido
+except ImportError:  # Only needed for the MIDI transports
+    mido = None
+
+DEFAULT_FRAME_RATE = 100.0  # frames per second
+OSC_HOST = "127.0.0.1"
+OSC_PORT = 53280  # Default Surge XT OSC input port
+OSC_MTU = DEFAULT_MTU
+
+# Starting per-message cost estimates (seconds); replaced by measurements
+# as soon as a transport has sent a frame
+DEFAULT_COSTS = {
+    TRANSPORT_MIDI_CC: 100e-6,
+    TRANSPORT_NRPN: 400e-6,
+    TRANSPORT_OSC: 200e-6,
+}
+COST_SMOOTHING = 0.2
+
+Update = Tuple[ParameterSpec, float]
+
+# === TRANSPORTS ===
+
+class Transport:
+    """One way of delivering parameter updates; subclasses implement send()"""
+    kind = ""
+
+    def __init__(self, name: str, lane: Optional[str] = None, cost: Optional[float] = None):
+        self.name = name
+        self.lane = lane or name
+        self.cost = DEFAULT_COSTS.get(self.kind, 1e-4) if cost is None else cost
+        self.messages = 0
+        self.frames = 0
+        self.bytes = 0
+        self.busy = 0.0
+
+    def send(self, updates: Sequence[Update]) -> int:
+        """Deliver updates (values in CC units); returns bytes written"""
+        raise NotImplementedError
+
+    def deliver(self, updates: Sequence[Update]) -> None:
+        started = time.perf_counter()
+        sent = self.send(updates)
+        elapsed = time.perf_counter() - started
+        self.messages += len(updates)
+        self.frames += 1
+        self.bytes += sent
+        self.busy += elapsed
+        per_message = elapsed / len(updates)
+        self.cost += COST_SMOOTHING * (per_message - self.cost)
+
+    def metrics(self, elapsed: float) -> Dict:
+        return {
+            "kind": self.kind,
+            "lane": self.lane,
+            "messages": self.messages,
+            "frames": self.frames,
+            "bytes": self.bytes,
+            "busy_s": round(self.busy, 4),
+            "cost_us": round(self.cost * 1e6, 1),
+            "messages_per_s": round(self.messages / elapsed, 1) if elapsed else 0.0,
+            "capacity_messages_per_s": round(self.messages / self.busy, 1) if self.busy else 0.0,
+        }
+
+    def close(self) -> None:
+        pass
+
+def _cc_value(value: float) -> int:
+    return max(0, min(CC_MAX, int(round(value))))
+
+class MidiCCTransport(Transport):
+    kind = TRANSPORT_MIDI_CC
+
+    def __init__(self, outport, name: str = "midi", lane: Optional[str] = None):
+        super().__init__(name, lane)
+        self.outport = outport
+
+    def send(self, updates: Sequence[Update]) -> int:
+        for spec, value in updates:
+            self.outport.send(mido.Message('control_change', channel=spec.midi_channel,
+                                           control=spec.cc, value=_cc_value(value)))
+        return 3 * len(updates)
+
+class NrpnTransport(Transport):
+    """14-bit NRPN (CC 99/98 select, CC 6/38 data); reselects only when the parameter changes"""
+    kind = TRANSPORT_NRPN
+
+    def __init__(self, outport, name: str = "nrpn", lane: Optional[str] = None):
+        super().__init__(name, lane)
+        self.outport = outport
+        self.selected: Dict[int, int] = {}  # channel -> selected NRPN
+
+    def send(self, updates: Sequence[Update]) -> int:
+        sent = 0
+        for spec, value in updates:
+            channel = spec.midi_channel
+            data = round(max(0.0, min(1.0, value / CC_MAX)) * NRPN_MAX)
+            controls = [(6, data >> 7), (38, data & 0x7F)]
+            if self.selected.get(channel) != spec.nrpn:
+                controls[:0] = [(99, spec.nrpn >> 7), (98, spec.nrpn & 0x7F)]
+                self.selected[channel] = spec.nrpn
+            for control, byte in controls:
+                self.outport.send(mido.Message('control_change', channel=channel,
+                                               control=control, value=byte))
+            sent += 3 * len(controls)
+        return sent
+
+class OSCTransport(Transport):
+    """Float OSC messages packed into immediate bundles no larger than the MTU"""
+    kind = TRANSPORT_OSC
+
+    def __init__(self, host: str = OSC_HOST, port: int = OSC_PORT, mtu: int = OSC_MTU,
+                 name: Optional[str] = None, lane: Optional[str] = None):
+        super().__init__(name or f"osc://{host}:{port}", lane)
+        self.mtu = mtu
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.sock.connect((host, port))
+        self.templates: Dict[str, bytes] = {}
+        self.datagrams = 0
+
+    def encode(self, spec: ParameterSpec, value: float) -> bytes:
+        template = self.templates.get(spec.osc_path)
+        if template is None:
+            template = self.templates[spec.osc_path] = osc_template(spec.osc_path, 'f')
+        return template + struct.pack('>f', spec.to_osc(value))
+
+    def send(self, updates: Sequence[Update]) -> int:
+        messages = (self.encode(spec, value) for spec, value in updates)
+        return sum(self._send(datagram) for datagram in pack_bundles(messages, self.mtu))
+
+    def _send(self, datagram: bytes) -> int:
+        try:
+            self.sock.send(datagram)
+        except ConnectionRefusedError:
+            pass  # Nothing listening yet (ICMP from an earlier datagram); UDP stays fire-and-forget
+        self.datagrams += 1
+        return len(datagram)
+
+    def metrics(self, elapsed: float) -> Dict:
+        return dict(super().metrics(elapsed), datagrams=self.datagrams)
+
+    def close(self) -> None:
+        self.sock.close()
+
+# === DISPATCHER ===
+
+class ParameterDispatcher:
+    """Coalesce semantic updates per frame and spread them across transports"""
+
+    def __init__(self, transports: Iterable[Transport], registry: Optional[ParameterRegistry] = None,
+                 frame_rate: float = DEFAULT_FRAME_RATE):
+        self.transports: List[Transport] = list(transports)
+        self.registry = registry or load_registry()
+        self.frame_rate = frame_rate
+        self.lanes = sorted({t.lane for t in self.transports})
+        self._candidates: Dict[str, Tuple[Transport, ...]] = {}
+        self._pending: Dict[str, Update] = {}
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=len(self.lanes),
+                                            thread_name_prefix="dispatch") if len(self.lanes) > 1 else None
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self.started_at = time.perf_counter()
+        self.updates = 0
+        self.coalesced = 0
+        self.unknown = 0
+        self.unroutable = 0
+        self.frames = 0
+        self.last_frame_ms = 0.0
+
+    def candidates(self, spec: ParameterSpec) -> Tuple[Transport, ...]:
+        """Attached transports able to carry this parameter, in preference order"""
+        found = self._candidates.get(spec.key)
+        if found is None:
+            found = self._candidates[spec.key] = tuple(sorted(
+                (t for t in self.transports if t.kind in spec.transports),
+                key=lambda t: TRANSPORT_PREFERENCE.index(t.kind)))
+        return found
+
+    def update(self, parameter, value: float) -> bool:
+        """Queue a value (CC units, 0-127) for the next frame; parameter is anything the registry resolves"""
+        spec = self.registry.resolve(parameter)
+        if spec is None:
+            self.unknown += 1
+            return False
+        with self._lock:
+            if spec.key in self._pending:
+                self.coalesced += 1
+            self._pending[spec.key] = (spec, float(value))
+            self.updates += 1
+        return True
+
+    def update_many(self, values: Mapping) -> int:
+        return sum(self.update(parameter, value) for parameter, value in values.items())
+
+    def plan(self, updates: Iterable[Update]) -> Dict[Transport, List[Update]]:
+        """Assign each update to the transport that would finish it soonest
+
+        Parameters with a single transport are placed first so the flexible
+        ones can fill in around them; ties go to the preferred transport.
+        """
+        load = {lane: 0.0 for lane in self.lanes}
+        assignment: Dict[Transport, List[Update]] = {}
+        routable = []
+        for update in updates:
+            options = self.candidates(update[0])
+            if options:
+                routable.append((options, update))
+            else:
+                self.unroutable += 1
+        routable.sort(key=lambda item: len(item[0]))
+        for options, update in routable:
+            transport = min(options, key=lambda t: load[t.lane] + t.cost)
+            load[transport.lane] += transport.cost
+            assignment.setdefault(transport, []).append(update)
+        return assignment
+
+    def flush(self) -> int:
+        """Send everything queued since the last frame; returns updates sent"""
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        if not pending:
+            return 0
+        with self._flush_lock:
+            started = time.perf_counter()
+            by_lane: Dict[str, List[Tuple[Transport, List[Update]]]] = {}
+            for transport, updates in self.plan(pending.values()).items():
+                by_lane.setdefault(transport.lane, []).append((transport, updates))
+
+            def send_lane(work):
+                for transport, updates in work:
+                    transport.deliver(updates)
+
+            if self._executor is None or len(by_lane) == 1:
+                for work in by_lane.values():
+                    send_lane(work)
+            else:
+                list(self._executor.map(send_lane, by_lane.values()))
+            self.frames += 1
+            self.last_frame_ms = (time.perf_counter() - started) * 1000
+        return sum(len(updates) for work in by_lane.values() for _, updates in work)
+
+    # --- frame clock ---
+
+    def _run(self):
+        interval = 1.0 / self.frame_rate
+        next_frame = time.perf_counter() + interval
+        while not self._stop.wait(max(0.0, next_frame - time.perf_counter())):
+            try:
+                self.flush()
+            except Exception as e:
+                print(f"❌ Dispatch error: {e}")
+            next_frame = max(next_frame + interval, time.perf_counter())
+
+    def start(self):
+        if self._thread is None:
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="parameter-dispatcher", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join()
+            self._thread = None
+        self.flush()
+
+    def close(self):
+        self.stop()
+        if self._executor is not None:
+            self._executor.shutdown()
+        for transport in self.transports:
+            transport.close()
+
+    def metrics(self) -> Dict:
+        elapsed = time.perf_counter() - self.started_at
+        return {
+            "elapsed_s": round(elapsed, 3),
+            "frames": self.frames,
+            "updates": self.updates,
+            "coalesced": self.coalesced,
+            "unknown": self.unknown,
+            "unroutable": self.unroutable,
+            "last_frame_ms": round(self.last_frame_ms, 3),
+            "transports": {t.name: t.metrics(elapsed) for t in self.transports},
+        }
+
+def open_transports(midi_ports: Sequence[str] = (), nrpn: bool = False,
+                    osc: Sequence[Tuple[str, int]] = ()) -> List[Transport]:
+    """CC (and optionally NRPN) transports sharing each MIDI port's lane, plus OSC sockets"""
+    transports: List[Transport] = []
+    for port_name in midi_ports:
+        if mido is None:
+            raise RuntimeError("mido is not installed")
+        outport = mido.open_output(port_name)
+        transports.append(MidiCCTransport(outport, name=f"cc:{port_name}", lane=port_name))
+        if nrpn:
+            transports.append(NrpnTransport(outport, name=f"nrpn:{port_name}", lane=port_name))
+    for host, port in osc:
+        transports.append(OSCTransport(host, port))
+    return transports
+
+# === CLI ===
+
+def main():
+    import argparse
+    import random
+
+    import yaml
+
+    parser = argparse.ArgumentParser(description="Send consciousness parameters over every available transport.")
+    parser.add_argument("values", nargs="*", metavar="KEY=VALUE", help="Parameter values in CC units")
+    parser.add_argument("--midi-port", action="append", default=[], help="MIDI output port (repeatable)")
+    parser.add_argument("--nrpn", action="store_true", help="Also send NRPN-mapped parameters")
+    parser.add_argument("--osc", action="append", default=[], metavar="HOST:PORT",
+                        help=f"OSC destination (repeatable, default {OSC_HOST}:{OSC_PORT} when no MIDI port)")
+    parser.add_argument("--frame-rate", type=float, default=DEFAULT_FRAME_RATE)
+    parser.add_argument("--bench", type=int, default=0, metavar="N",
+                        help="Send N random full-profile changes and report throughput")
+    args = parser.parse_args()
+
+    osc = [(host, int(port)) for host, port in (target.rsplit(":", 1) for target in args.osc)]
+    if not args.midi_port and not osc:
+        osc = [(OSC_HOST, OSC_PORT)]
+    dispatcher = ParameterDispatcher(open_transports(args.midi_port, args.nrpn, osc),
+                                     frame_rate=args.frame_rate)
+    try:
+        dispatcher.start()
+        for item in args.values:
+            key, _, value = item.partition("=")
+            if not dispatcher.update(key, float(value)):
+                print(f"⚠️ Unknown parameter: {key}")
+        for _ in range(args.bench):
+            dispatcher.update_many({spec.key: random.randint(*spec.safe_range)
+                                    for spec in dispatcher.registry})
+            time.sleep(1.0 / args.frame_rate)
+    finally:
+        dispatcher.close()
+    print(yaml.dump(dispatcher.metrics(), default_flow_style=False, sort_keys=False))
+
+if __name__ == "__main__":
+    main()
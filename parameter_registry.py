@@ -0,0 +1,368 @@
+#!/usr/bin/env python3
+"""
+Parameter Registry
+One table of AI Council consciousness parameters: semantic name, MIDI CC and
+channel, Surge XT parameter, OSC path, safe range and neutral value
+
+The rows live in consciousness_parameters.yaml. Values are expressed in CC
+units (0-127) everywhere and scaled to an OSC parameter's native range on
+the way out, so every sender can pick whichever transport a parameter has.
+"""
+
+import csv
+import json
+import os
+from dataclasses import asdict, dataclass, replace
+from pathlib import Path
+from types import MappingProxyType
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+import yaml
+
+REGISTRY_FILE = Path(__file__).with_name("consciousness_parameters.yaml")
+SURGE_MAPPING_FILE = Path(__file__).with_name("Surge XT MIDI Mapping v3.txt")
+
+DEFAULT_SAFE_RANGE = (20, 107)
+CC_MAX = 127
+
+# Transport names, cheapest first: a CC is 3 bytes on a local MIDI port, an
+# NRPN is four CCs carrying a 14-bit value, an OSC message is a UDP datagram
+# with a padded address string
+TRANSPORT_MIDI_CC = "midi_cc"
+TRANSPORT_NRPN = "nrpn"
+TRANSPORT_OSC = "osc"
+TRANSPORT_PREFERENCE = (TRANSPORT_MIDI_CC, TRANSPORT_NRPN, TRANSPORT_OSC)
+NRPN_MAX = 16383
+
+# === DATA TYPES ===
+
+@dataclass(frozen=True)
+class ParameterSpec:
+    """One semantic parameter and every way of addressing it"""
+    key: str
+    name: str
+    category: str = ""
+    cc: Optional[int] = None
+    channel: Optional[int] = None          # 1-16, None = omni
+    nrpn: Optional[int] = None             # 14-bit parameter number, sent on `channel`
+    surge_parameter: Optional[str] = None
+    osc_path: Optional[str] = None
+    osc_range: Optional[Tuple[float, float]] = None
+    safe_range: Tuple[int, int] = DEFAULT_SAFE_RANGE
+    neutral: Optional[int] = None
+    aliases: Tuple[str, ...] = ()
+    label: Optional[str] = None            # display name of the Surge parameter, if not its short name
+
+    @property
+    def transports(self) -> Tuple[str, ...]:
+        available = []
+        if self.cc is not None:
+            available.append(TRANSPORT_MIDI_CC)
+        if self.nrpn is not None:
+            available.append(TRANSPORT_NRPN)
+        if self.osc_path is not None:
+            available.append(TRANSPORT_OSC)
+        return tuple(available)
+
+    @property
+    def midi_channel(self) -> int:
+        """0-based channel for mido (omni parameters go out on channel 1)"""
+        return (self.channel or 1) - 1
+
+    @property
+    def short_surge_name(self) -> str:
+        name = self.surge_parameter or ""
+        return name[len("Scene A "):] if name.startswith("Scene A ") else name
+
+    @property
+    def description(self) -> str:
+        """'Name (Surge parameter)' label used by the MIDI tools"""
+        surge_name = self.label or self.short_surge_name
+        return f"{self.name} ({surge_name})" if surge_name else self.name
+
+    def clamp(self, value: float) -> int:
+        """Round and clamp a CC value into this parameter's safe range"""
+        low, high = self.safe_range
+        return max(low, min(high, int(round(value))))
+
+    def to_osc(self, cc_value: float) -> float:
+        """Scale a 0-127 value to the OSC parameter's native range"""
+        if self.osc_range is None:
+            raise ValueError(f"{self.key} has no OSC path")
+        low, high = self.osc_range
+        return low + (high - low) * max(0.0, min(1.0, cc_value / CC_MAX))
+
+    def from_osc(self, native_value: float) -> int:
+        """Scale a native OSC value back to 0-127"""
+        if self.osc_range is None:
+            raise ValueError(f"{self.key} has no OSC path")
+        low, high = self.osc_range
+        if high == low:
+            return 0
+        return max(0, min(CC_MAX, int(round((native_value - low) / (high - low) * CC_MAX))))
+
+class SurgeMapping(NamedTuple):
+    """One row of a Surge XT MIDI mapping export"""
+    cc: Optional[int]            # None for macro assignments (N/A)
+    channel: Optional[int]       # None = omni
+    parameter: str
+
+# === REGISTRY ===
+
+def _lower(name: str) -> str:
+    return " ".join(name.lower().split())
+
+class ParameterRegistry:
+    """Immutable, indexed view over the parameter table"""
+
+    def __init__(self, specs: Iterable[ParameterSpec]):
+        self.specs: Tuple[ParameterSpec, ...] = tuple(specs)
+        by_key: Dict[str, ParameterSpec] = {}
+        by_cc: Dict[Tuple[int, Optional[int]], ParameterSpec] = {}
+        by_osc: Dict[str, ParameterSpec] = {}
+        by_surge: Dict[str, ParameterSpec] = {}
+        by_name: Dict[str, ParameterSpec] = {}
+
+        for spec in self.specs:
+            for key in (spec.key,) + spec.aliases:
+                if key in by_key:
+                    raise ValueError(f"Duplicate parameter key: {key}")
+                by_key[key] = spec
+            if spec.cc is not None:
+                if (spec.cc, spec.channel) in by_cc:
+                    raise ValueError(f"CC{spec.cc} is assigned to both "
+                                     f"{by_cc[spec.cc, spec.channel].key} and {spec.key}")
+                by_cc[spec.cc, spec.channel] = spec
+            if spec.osc_path is not None:
+                if spec.osc_path in by_osc:
+                    raise ValueError(f"OSC path {spec.osc_path} is assigned to both "
+                                     f"{by_osc[spec.osc_path].key} and {spec.key}")
+                by_osc[spec.osc_path] = spec
+            if spec.surge_parameter is not None:
+                surge = _lower(spec.surge_parameter)
+                if surge in by_surge:
+                    raise ValueError(f"Surge parameter '{spec.surge_parameter}' is assigned to both "
+                                     f"{by_surge[surge].key} and {spec.key}")
+                by_surge[surge] = spec
+            by_name[_lower(spec.name)] = spec
+
+        self._by_key = MappingProxyType(by_key)
+        self._by_cc = MappingProxyType(by_cc)
+        self._by_osc = MappingProxyType(by_osc)
+        self._by_surge = MappingProxyType(by_surge)
+        self._by_name = MappingProxyType(by_name)
+        # The compiled routing table: key -> cheapest transport
+        self.routes = MappingProxyType({
+            spec.key: next((t for t in TRANSPORT_PREFERENCE if t in spec.transports), None)
+            for spec in self.specs
+        })
+
+    def __len__(self) -> int:
+        return len(self.specs)
+
+    def __iter__(self) -> Iterator[ParameterSpec]:
+        return iter(self.specs)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._by_key
+
+    def __getitem__(self, key: str) -> ParameterSpec:
+        return self._by_key[key]
+
+    # --- lookups ---
+
+    def get(self, key: str) -> Optional[ParameterSpec]:
+        """Look up by key or alias"""
+        return self._by_key.get(key)
+
+    def by_cc(self, cc: int, channel: Optional[int] = None) -> Optional[ParameterSpec]:
+        """Look up by CC number; channel is 1-16 and omni rows match any channel"""
+        if channel is not None:
+            return self._by_cc.get((cc, channel)) or self._by_cc.get((cc, None))
+        return self._by_cc.get((cc, None)) or self._by_cc.get((cc, 1)) or next(
+            (spec for (number, _), spec in self._by_cc.items() if number == cc), None)
+
+    def by_osc_path(self, path: str) -> Optional[ParameterSpec]:
+        return self._by_osc.get(path)
+
+    def by_surge_parameter(self, name: str) -> Optional[ParameterSpec]:
+        """Look up by Surge parameter name, with or without the 'Scene A' prefix"""
+        return self._by_surge.get(_lower(name)) or self._by_surge.get(_lower(f"Scene A {name}"))
+
+    def by_name(self, name: str) -> Optional[ParameterSpec]:
+        return self._by_name.get(_lower(name))
+
+    def resolve(self, identifier) -> Optional[ParameterSpec]:
+        """Resolve a key, alias, CC number, OSC path, display name or Surge name"""
+        if isinstance(identifier, ParameterSpec):
+            return identifier
+        if isinstance(identifier, int):
+            return self.by_cc(identifier)
+        identifier = str(identifier)
+        if identifier.startswith("/"):
+            return self.by_osc_path(identifier)
+        return (self.get(identifier) or self.by_name(identifier)
+                or self.by_surge_parameter(identifier))
+
+    def preferred_transport(self, key: str) -> Optional[str]:
+        return self.routes.get(self[key].key)
+
+    def in_category(self, category: str) -> List[ParameterSpec]:
+        return [spec for spec in self.specs if spec.category == category]
+
+    # --- views used by the MIDI tools ---
+
+    def cc_descriptions(self, ccs: Optional[Iterable[int]] = None) -> Dict[int, str]:
+        """CC -> description for every mapped CC, or only ccs (in that order)"""
+        descriptions = {spec.cc: spec.description for spec in self.specs if spec.cc is not None}
+        if ccs is None:
+            return descriptions
+        return {cc: descriptions[cc] for cc in ccs if cc in descriptions}
+
+    def safe_ranges(self) -> Dict[int, Tuple[int, int]]:
+        return {spec.cc: spec.safe_range for spec in self.specs if spec.cc is not None}
+
+    def neutral_values(self) -> Dict[int, int]:
+        return {spec.cc: spec.neutral for spec in self.specs
+                if spec.cc is not None and spec.neutral is not None}
+
+    # --- Surge mapping export ---
+
+    def diff_surge_mapping(self, mappings: Iterable[SurgeMapping]):
+        """Compare a Surge export with the registry
+
+        Returns (changed, unknown): changed holds (spec, mapping) pairs whose CC or
+        channel differ, unknown holds CC mappings that match no registry parameter.
+        """
+        changed, unknown = [], []
+        for mapping in mappings:
+            if mapping.cc is None:
+                continue
+            spec = self.by_surge_parameter(mapping.parameter)
+            if spec is None:
+                unknown.append(mapping)
+            elif (spec.cc, spec.channel) != (mapping.cc, mapping.channel):
+                changed.append((spec, mapping))
+        return changed, unknown
+
+    def with_surge_mapping(self, mappings: Iterable[SurgeMapping]) -> "ParameterRegistry":
+        """New registry with CC assignments taken from a Surge export"""
+        changed, _ = self.diff_surge_mapping(mappings)
+        updates = {spec.key: mapping for spec, mapping in changed}
+        return ParameterRegistry(
+            replace(spec, cc=updates[spec.key].cc, channel=updates[spec.key].channel)
+            if spec.key in updates else spec
+            for spec in self.specs)
+
+# === LOADERS ===
+
+def _parse_channel(value) -> Optional[int]:
+    if value is None or str(value).strip().lower() in ("omni", "any", "all", ""):
+        return None
+    channel = int(value)
+    if not 1 <= channel <= 16:
+        raise ValueError(f"MIDI channel out of range: {channel}")
+    return channel
+
+def _pair(value) -> Optional[Tuple]:
+    return tuple(value) if value is not None else None
+
+def spec_from_row(row: Dict) -> ParameterSpec:
+    cc = row.get("cc")
+    if cc is not None and not 0 <= int(cc) <= CC_MAX:
+        raise ValueError(f"{row['key']}: CC out of range: {cc}")
+    nrpn = row.get("nrpn")
+    if nrpn is not None and not 0 <= int(nrpn) <= NRPN_MAX:
+        raise ValueError(f"{row['key']}: NRPN out of range: {nrpn}")
+    return ParameterSpec(
+        key=row["key"],
+        name=row.get("name") or row["key"].replace("_", " ").title(),
+        category=row.get("category", ""),
+        cc=int(cc) if cc is not None else None,
+        channel=_parse_channel(row.get("channel")),
+        nrpn=int(nrpn) if nrpn is not None else None,
+        surge_parameter=row.get("surge_parameter"),
+        osc_path=row.get("osc_path"),
+        osc_range=_pair(row.get("osc_range")),
+        safe_range=_pair(row.get("safe_range")) or DEFAULT_SAFE_RANGE,
+        neutral=row.get("neutral"),
+        aliases=tuple(row.get("aliases") or ()),
+        label=row.get("label"),
+    )
+
+def parse_surge_mapping(path=SURGE_MAPPING_FILE) -> List[SurgeMapping]:
+    """Parse a Surge XT MIDI mapping export (tab-separated 'CC# Channel Parameter')
+
+    Header lines, section titles and blank lines are skipped; 'Omni' becomes
+    channel None and macro assignments ('N/A') get cc None.
+    """
+    mappings = []
+    with open(path, newline="", encoding="utf-8") as f:
+        for fields in csv.reader(f, delimiter="\t"):
+            fields = [field.strip() for field in fields if field.strip()]
+            if len(fields) < 3:
+                continue
+            cc_field, channel_field, parameter = fields[0], fields[1], " ".join(fields[2:])
+            if cc_field.upper() == "N/A":
+                cc = None
+            elif cc_field.isdigit():
+                cc = int(cc_field)
+            else:
+                continue  # column header
+            try:
+                channel = _parse_channel(None if channel_field.upper() == "N/A" else channel_field)
+            except ValueError:
+                continue
+            mappings.append(SurgeMapping(cc, channel, parameter))
+    return mappings
+
+_registries: Dict[Tuple[str, int], ParameterRegistry] = {}
+
+def load_registry(path=REGISTRY_FILE) -> ParameterRegistry:
+    """Load and index the registry file (memoized until the file changes)"""
+    path = os.path.abspath(str(path))
+    key = (path, os.stat(path).st_mtime_ns)
+    if key not in _registries:
+        with open(path, encoding="utf-8") as f:
+            data = yaml.load(f, Loader=getattr(yaml, "CSafeLoader", yaml.SafeLoader)) or {}
+        _registries.clear()
+        _registries[key] = ParameterRegistry(spec_from_row(row) for row in data.get("parameters", []))
+    return _registries[key]
+
+# === CLI ===
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Inspect the consciousness parameter registry.")
+    parser.add_argument("--registry", default=str(REGISTRY_FILE))
+    parser.add_argument("--surge", nargs="?", const=str(SURGE_MAPPING_FILE), metavar="EXPORT",
+                        help="Compare a Surge XT MIDI mapping export against the registry")
+    parser.add_argument("--json", action="store_true", help="Dump the registry as JSON")
+    args = parser.parse_args()
+
+    registry = load_registry(args.registry)
+
+    if args.json:
+        print(json.dumps([asdict(spec) for spec in registry], indent=2))
+        return
+
+    if args.surge:
+        changed, unknown = registry.diff_surge_mapping(parse_surge_mapping(args.surge))
+        for spec, mapping in changed:
+            print(f"⚠️ {spec.key}: registry CC{spec.cc}/{spec.channel or 'omni'}, "
+                  f"export CC{mapping.cc}/{mapping.channel or 'omni'}")
+        for mapping in unknown:
+            print(f"❌ CC{mapping.cc} -> {mapping.parameter} is not in the registry")
+        if not changed and not unknown:
+            print(f"✅ {args.surge} matches the registry")
+        return
+
+    print(f"📦 {len(registry)} parameters")
+    for spec in registry:
+        cc = f"CC{spec.cc:<3d}" if spec.cc is not None else "  -  "
+        print(f"  {cc} {spec.key:28s} {registry.routes[spec.key] or '-':8s} "
+              f"{spec.osc_path or '-'}")
+
+if __name__ == "__main__":
+    main()
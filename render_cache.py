@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+Render Cache
+Content-addressed cache for rendered MIDI (.mid bytes)
+
+Keys are SHA-256 hashes of the canonicalized message plus a namespace naming
+the renderer and its version, so unchanged messages re-render for free and a
+renderer change invalidates its own entries. Entries live in a size-capped
+in-memory LRU. Callers whose renders cost more than reading a file back
+(whole .mid files) can add a persistent on-disk tier by passing a
+directory; relative directories are anchored to this script's folder, not
+the working directory.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+CACHE_ROOT = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+DEFAULT_DISK_MAX_BYTES = 64 * 1024 * 1024
+
+def canonical_hash(payload: Any, namespace: str = "") -> str:
+    """Stable hash of a YAML/JSON-like payload (key order and whitespace do not matter)"""
+    canonical = json.dumps(payload, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(f"{namespace}\n{canonical}".encode()).hexdigest()
+
+class DiskTier:
+    """Size-capped LRU of bytes on disk, one file per key
+
+    Recency is the file mtime, refreshed on every hit, so the LRU order is
+    shared by every process using the same directory.
+    """
+
+    def __init__(self, directory: str, max_bytes: int = DEFAULT_DISK_MAX_BYTES):
+        self.directory = os.path.join(CACHE_ROOT, str(directory))
+        self.max_bytes = max_bytes
+        self._size: Optional[int] = None
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key[:2], f"{key}.bin")
+
+    def _entries(self) -> List[Tuple[float, int, str]]:
+        entries = []
+        for root, _, files in os.walk(self.directory):
+            for name in files:
+                if name.endswith(".bin"):
+                    path = os.path.join(root, name)
+                    try:
+                        stat = os.stat(path)
+                    except OSError:
+                        continue
+                    entries.append((stat.st_mtime, stat.st_size, path))
+        return entries
+
+    def size(self) -> int:
+        if self._size is None:
+            self._size = sum(size for _, size, _ in self._entries())
+        return self._size
+
+    def get(self, key: str) -> Optional[bytes]:
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+            os.utime(path)
+        except OSError:
+            return None
+        return data
+
+    def put(self, key: str, data: bytes) -> None:
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        previous = os.path.getsize(path) if os.path.exists(path) else 0
+        os.replace(temp_path, path)
+        self._size = self.size() + len(data) - previous
+        if self._size > self.max_bytes:
+            self.evict()
+
+    def evict(self, target: Optional[int] = None) -> int:
+        """Delete least recently used entries until at most target bytes remain"""
+        target = self.max_bytes * 3 // 4 if target is None else target
+        entries = sorted(self._entries())
+        total = sum(size for _, size, _ in entries)
+        removed = 0
+        for _, size, path in entries:
+            if total <= target:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total -= size
+            removed += 1
+        self._size = total
+        return removed
+
+class RenderCache:
+    """Size-capped in-memory LRU of bytes, optionally backed by a DiskTier
+
+    Safe to share between threads; renders run outside the lock.
+    """
+
+    def __init__(self, directory: Optional[str] = None, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self.disk = DiskTier(directory) if directory is not None else None
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[str, bytes]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def _remember(self, key: str, data: bytes) -> None:
+        previous = self._entries.pop(key, None)
+        if previous is not None:
+            self._bytes -= len(previous)
+        self._entries[key] = data
+        self._bytes += len(data)
+        while self._bytes > self.max_bytes and len(self._entries) > 1:
+            _, evicted = self._entries.popitem(last=False)
+            self._bytes -= len(evicted)
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            data = self._entries.get(key)
+            if data is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return data
+            data = self.disk.get(key) if self.disk is not None else None
+            if data is None:
+                self.misses += 1
+                return None
+            self.disk_hits += 1
+            self._remember(key, data)
+            return data
+
+    def put(self, key: str, data: bytes) -> None:
+        with self._lock:
+            self._remember(key, data)
+            if self.disk is not None:
+                self.disk.put(key, data)
+
+    def get_or_render(self, payload: Any, render: Callable[[], bytes], namespace: str = "") -> bytes:
+        key = canonical_hash(payload, namespace)
+        data = self.get(key)
+        if data is None:
+            data = render()
+            self.put(key, data)
+        return data
+
+_caches: Dict[Tuple[Optional[str], int], RenderCache] = {}
+_caches_lock = threading.Lock()
+
+def get_render_cache(directory: Optional[str] = None, max_bytes: int = DEFAULT_MAX_BYTES) -> RenderCache:
+    """Shared cache per (disk directory, size); directory None keeps entries in memory only"""
+    key = (os.path.join(CACHE_ROOT, str(directory)) if directory is not None else None, max_bytes)
+    with _caches_lock:
+        if key not in _caches:
+            _caches[key] = RenderCache(directory, max_bytes)
+        return _caches[key]
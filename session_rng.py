@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Session RNG
+Reproducible per-identity random streams derived from one session seed
+
+Every random draw in a session comes from a stream keyed by
+(session seed, identity, turn), so a run can be replayed bit-exactly by
+reusing its seed, and changing one agent's behaviour does not shift the
+numbers another agent sees. The responder runs as one subprocess per turn,
+so each turn gets its own substream rather than continuing a shared one.
+"""
+
+import hashlib
+import os
+import random
+import secrets
+from typing import Dict, Optional, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional; random.Random streams always work
+    np = None
+
+SEED_ENV = "HARMONIC_SESSION_SEED"
+
+def new_session_seed() -> int:
+    """Seed from $HARMONIC_SESSION_SEED if set, otherwise a fresh random one"""
+    value = os.environ.get(SEED_ENV)
+    return int(value) if value else secrets.randbits(63)
+
+def derive_seed(session_seed: int, identity: str, turn: int = 0) -> int:
+    """Stable 64-bit seed for one identity's turn (independent of PYTHONHASHSEED)"""
+    digest = hashlib.sha256(f"{session_seed}:{identity}:{turn}".encode()).digest()
+    return int.from_bytes(digest[:8], "big")
+
+def stream_label(session_seed: int, identity: str, turn: int = 0) -> str:
+    """How a stream is recorded in log headers"""
+    return f"seed={session_seed} stream={identity}/{turn}"
+
+class SessionRandom:
+    """Per-identity random.Random (and NumPy Generator) streams for one session"""
+
+    def __init__(self, session_seed: Optional[int] = None):
+        self.session_seed = new_session_seed() if session_seed is None else int(session_seed)
+        self.turns: Dict[str, int] = {}
+        self._streams: Dict[Tuple[str, int], random.Random] = {}
+
+    def next_turn(self, identity: str) -> int:
+        """Advance and return the identity's turn counter"""
+        turn = self.turns.get(identity, 0)
+        self.turns[identity] = turn + 1
+        return turn
+
+    def stream(self, identity: str, turn: int = 0) -> random.Random:
+        key = (identity, turn)
+        if key not in self._streams:
+            self._streams[key] = random.Random(derive_seed(self.session_seed, identity, turn))
+        return self._streams[key]
+
+    def numpy_stream(self, identity: str, turn: int = 0):
+        if np is None:
+            raise RuntimeError("NumPy is not installed")
+        return np.random.default_rng(derive_seed(self.session_seed, identity, turn))
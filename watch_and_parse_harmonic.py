@@ -7,6 +7,9 @@ import fcntl
 import sys
 import uuid
 
+from harmonic_log_aggregator import LogAggregator, aggregator_running, send_log_record
+from session_rng import SessionRandom, stream_label
+
 MESSAGE_DIR = "symbolic_messages"
 PIPELINE_SCRIPT = "enhanced_symbolic_to_midi_pipeline_adsr_v3_1.py"
 AI_RESPONDER = "ai_responder_harmonic.py"
@@ -58,10 +61,9 @@ def get_next_filename(identity):
     except Exception:
         return f"{identity.lower()}_{uuid.uuid4().hex[:8]}.yaml"
 
-def log_harmonic_consciousness_exchange(identity, message):
-    with open(LOG_FILE, "a") as f:
-        f.write(f"---\n# Exchange from {identity}\n")
-        yaml.dump(message, f, default_flow_style=False)
+def log_harmonic_consciousness_exchange(identity, message, stream=""):
+    header = f"Exchange from {identity}" + (f" [{stream}]" if stream else "")
+    send_log_record(LOG_FILE, header, message)
 
 def main():
     global PIPELINE_SCRIPT, AI_RESPONDER
@@ -72,7 +74,14 @@ def main():
 
     seen_files = load_seen_files()
 
+    # One seed per session; export HARMONIC_SESSION_SEED to replay a run exactly
+    session = SessionRandom()
+
+    # Single log writer for this process and every responder it spawns
+    aggregator = None if aggregator_running() else LogAggregator().start()
+
     print("🔁 Watching for new harmonic messages in:", MESSAGE_DIR)
+    print(f"🎲 Session seed: {session.session_seed}")
     try:
         while True:
             files = sorted(os.listdir(MESSAGE_DIR))
@@ -97,15 +106,18 @@ def main():
 
                 # Call AI responder
                 try:
-                    output = subprocess.check_output(["python3", AI_RESPONDER, path])
+                    reply_identity = get_next_identity(identity)
+                    turn = session.next_turn(reply_identity)
+                    output = subprocess.check_output(["python3", AI_RESPONDER, path,
+                                                      str(session.session_seed), str(turn)])
                     reply = yaml.safe_load(output)
                     if validate_harmonic_message(reply):
-                        reply_identity = get_next_identity(identity)
                         reply["identity"] = reply_identity
                         reply_filename = get_next_filename(reply_identity)
                         with open(os.path.join(MESSAGE_DIR, reply_filename), "w") as f:
                             yaml.dump(reply, f, default_flow_style=False)
-                        log_harmonic_consciousness_exchange(reply_identity, reply)
+                        log_harmonic_consciousness_exchange(
+                            reply_identity, reply, stream_label(session.session_seed, reply_identity, turn))
                         print(f"🤖 Response saved to {reply_filename}")
                     else:
                         print("⚠️ Invalid response from responder")
@@ -117,6 +129,9 @@ def main():
             time.sleep(2)
     except KeyboardInterrupt:
         print("🛑 Watcher stopped.")
+    finally:
+        if aggregator is not None:
+            aggregator.stop()
 
 if __name__ == "__main__":
     main()